@@ -20,6 +20,9 @@ from .providers import auth_provider_from_config, AuthProvider, LoginFlow
 EVENT_USER_ADDED = "user_added"
 EVENT_USER_REMOVED = "user_removed"
 
+# Number of validated access tokens remembered until they expire
+ACCESS_TOKEN_CACHE_SIZE = 1024
+
 _LOGGER = logging.getLogger(__name__)
 _MfaModuleDict = Dict[str, MultiFactorAuthModule]
 _ProviderKey = Tuple[str, Optional[str]]
@@ -82,6 +85,10 @@ class AuthManager:
         self._store = store
         self._providers = providers
         self._mfa_modules = mfa_modules
+        # Validated access tokens with their refresh token and expiration
+        self._access_token_cache: Dict[
+            str, Tuple[models.RefreshToken, float]
+        ] = OrderedDict()
         self.login_flow = data_entry_flow.FlowManager(
             hass, self._async_create_login_flow, self._async_finish_login_flow
         )
@@ -390,7 +397,23 @@ class AuthManager:
     async def async_validate_access_token(
         self, token: str
     ) -> Optional[models.RefreshToken]:
-        """Return refresh token if an access token is valid."""
+        """Return refresh token if an access token is valid.
+
+        Validated tokens are cached until they expire, as long as their
+        refresh token exists and its user is active.
+        """
+        cached = self._access_token_cache.get(token)
+        if cached is not None:
+            cached_token, expiration = cached
+            if (
+                dt_util.utcnow().timestamp() < expiration
+                and await self.async_get_refresh_token(cached_token.id)
+                is cached_token
+                and cached_token.user.is_active
+            ):
+                return cached_token
+            self._access_token_cache.pop(token, None)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -408,15 +431,36 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        if "exp" in claims:
+            self._async_cache_access_token(token, refresh_token, claims["exp"])
+
         return refresh_token
 
+    @callback
+    def _async_cache_access_token(
+        self, token: str, refresh_token: models.RefreshToken, expiration: float
+    ) -> None:
+        """Remember a validated access token until it expires."""
+        cache = self._access_token_cache
+        if len(cache) >= ACCESS_TOKEN_CACHE_SIZE:
+            now = dt_util.utcnow().timestamp()
+            for cached_token, (_, cached_expiration) in list(cache.items()):
+                if cached_expiration <= now:
+                    del cache[cached_token]
+            while len(cache) >= ACCESS_TOKEN_CACHE_SIZE:
+                del cache[next(iter(cache))]
+
+        cache[token] = (refresh_token, expiration)
+
     async def _async_create_login_flow(
         self, handler: _ProviderKey, *, context: Optional[Dict], data: Optional[Any]
     ) -> data_entry_flow.FlowHandler:
@@ -2,6 +2,7 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import hmac
 from logging import getLogger
 from typing import Any, Dict, List, Optional
@@ -37,6 +38,9 @@ class AuthStore:
         self._users: Optional[Dict[str, models.User]] = None
         self._groups: Optional[Dict[str, models.Group]] = None
         self._perm_lookup: Optional[PermissionLookup] = None
+        # Refresh tokens of all users by id and by hash of the token
+        self._token_id_index: Dict[str, models.RefreshToken] = {}
+        self._token_hash_index: Dict[str, models.RefreshToken] = {}
         self._store = hass.helpers.storage.Store(
             STORAGE_VERSION, STORAGE_KEY, private=True
         )
@@ -141,6 +145,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -221,8 +227,13 @@ class AuthStore:
         if client_icon:
             kwargs["client_icon"] = client_icon
 
+        if self._users is None:
+            await self._async_load()
+            assert self._users is not None
+
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -235,10 +246,13 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
-                break
+        found = self._token_id_index.get(refresh_token.id)
+        if found is None:
+            return
+
+        found.user.refresh_tokens.pop(found.id, None)
+        self._async_unindex_refresh_token(found)
+        self._async_schedule_save()
 
     async def async_get_refresh_token(
         self, token_id: str
@@ -248,12 +262,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._token_id_index.get(token_id)
 
     async def async_get_refresh_token_by_token(
         self, token: str
@@ -263,15 +272,27 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        found = self._token_hash_index.get(_token_hash(token))
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        if found is None or not hmac.compare_digest(found.token, token):
+            return None
 
         return found
 
+    @callback
+    def _async_index_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the lookup indexes."""
+        self._token_id_index[refresh_token.id] = refresh_token
+        self._token_hash_index[_token_hash(refresh_token.token)] = refresh_token
+
+    @callback
+    def _async_unindex_refresh_token(
+        self, refresh_token: models.RefreshToken
+    ) -> None:
+        """Remove a refresh token from the lookup indexes."""
+        self._token_id_index.pop(refresh_token.id, None)
+        self._token_hash_index.pop(_token_hash(refresh_token.token), None)
+
     @callback
     def async_log_refresh_token_usage(
         self, refresh_token: models.RefreshToken, remote_ip: Optional[str] = None
@@ -474,6 +495,11 @@ class AuthStore:
 
         self._groups = groups
         self._users = users
+        self._token_id_index = {}
+        self._token_hash_index = {}
+        for user in users.values():
+            for refresh_token in user.refresh_tokens.values():
+                self._async_index_refresh_token(refresh_token)
 
     @callback
     def _async_schedule_save(self) -> None:
@@ -557,6 +583,8 @@ class AuthStore:
     def _set_defaults(self) -> None:
         """Set default values for auth store."""
         self._users = OrderedDict()
+        self._token_id_index = {}
+        self._token_hash_index = {}
 
         groups: Dict[str, models.Group] = OrderedDict()
         admin_group = _system_admin_group()
@@ -568,6 +596,11 @@ class AuthStore:
         self._groups = groups
 
 
+def _token_hash(token: str) -> str:
+    """Return the hash a refresh token is indexed by."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def _system_admin_group() -> models.Group:
     """Create system admin group."""
     return models.Group(
@@ -36,7 +36,7 @@ from homeassistant.exceptions import TemplateError, Unauthorized, ServiceNotFoun
 from homeassistant.helpers import template
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.state import AsyncTrackStates
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, cached_state_json
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -204,7 +204,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = "[%s]" % ", ".join(cached_state_json(state) for state in states)
+        except (ValueError, TypeError):
+            # Let the JSON response report the state that can't be serialized
+            return self.json(states)
+        return self.json_encoded(body)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -222,7 +227,10 @@ class APIEntityStateView(HomeAssistantView):
 
         state = request.app["hass"].states.get(entity_id)
         if state:
-            return self.json(state)
+            try:
+                return self.json_encoded(cached_state_json(state))
+            except (ValueError, TypeError):
+                return self.json(state)
         return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
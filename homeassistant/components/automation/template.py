@@ -6,8 +6,7 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_FOR
 from homeassistant import exceptions
-from homeassistant.helpers import condition
-from homeassistant.helpers.event import async_track_same_state, async_track_template
+from homeassistant.helpers.event import async_call_later, async_track_template_result
 from homeassistant.helpers import config_validation as cv, template
 
 
@@ -36,16 +35,47 @@ async def async_attach_trigger(
     value_template.hass = hass
     time_delta = config.get(CONF_FOR)
     template.attach(hass, time_delta)
-    unsub_track_same = None
+    already_triggered = False
+    unsub_delay = None
 
     @callback
-    def template_listener(entity_id, from_s, to_s):
-        """Listen for state changes and calls action."""
-        nonlocal unsub_track_same
+    def cancel_delay():
+        """Cancel a pending delayed action."""
+        nonlocal unsub_delay
+        if unsub_delay:
+            # pylint: disable=not-callable
+            unsub_delay()
+            unsub_delay = None
+
+    @callback
+    def template_listener(event, last_result, result):
+        """Listen for template result changes and calls action."""
+        nonlocal already_triggered, unsub_delay
+
+        if isinstance(result, exceptions.TemplateError):
+            _LOGGER.error("Error during template condition: %s", result)
+            template_result = False
+        else:
+            template_result = result.lower() == "true"
+
+        if not template_result:
+            already_triggered = False
+            cancel_delay()
+            return
+
+        if already_triggered:
+            return
+        already_triggered = True
+
+        entity_id = event.data.get("entity_id")
+        from_s = event.data.get("old_state")
+        to_s = event.data.get("new_state")
 
         @callback
-        def call_action():
+        def call_action(*_):
             """Call action with right context."""
+            nonlocal unsub_delay
+            unsub_delay = None
             hass.async_run_job(
                 action(
                     {
@@ -91,22 +121,15 @@ async def async_attach_trigger(
             )
             return
 
-        unsub_track_same = async_track_same_state(
-            hass,
-            period,
-            call_action,
-            lambda _, _2, _3: condition.async_template(hass, value_template),
-            value_template.extract_entities(),
-        )
+        # The delay is cancelled as soon as the template is no longer true
+        unsub_delay = async_call_later(hass, period.total_seconds(), call_action)
 
-    unsub = async_track_template(hass, value_template, template_listener)
+    info = async_track_template_result(hass, value_template, template_listener)
 
     @callback
     def async_remove():
         """Remove state listeners async."""
-        unsub()
-        if unsub_track_same:
-            # pylint: disable=not-callable
-            unsub_track_same()
+        info.async_remove()
+        cancel_delay()
 
     return async_remove
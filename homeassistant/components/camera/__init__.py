@@ -4,6 +4,7 @@ import base64
 import collections
 from contextlib import suppress
 from datetime import timedelta
+from functools import partial
 import logging
 import hashlib
 from random import SystemRandom
@@ -49,6 +50,7 @@ from homeassistant.components import websocket_api
 import homeassistant.helpers.config_validation as cv
 from homeassistant.setup import async_when_setup
 
+from .broker import FrameBroker
 from .const import DOMAIN, DATA_CAMERA_PREFS
 from .prefs import CameraPreferences
 
@@ -147,7 +149,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return Image(camera.content_type, image)
@@ -174,6 +176,7 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
 
     async def write_to_mjpeg_stream(img_bytes):
         """Write image to stream."""
+        # Written in parts to not copy images shared by several viewers
         await response.write(
             bytes(
                 "--frameboundary\r\n"
@@ -181,14 +184,18 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
                 "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
                 "utf-8",
             )
-            + img_bytes
-            + b"\r\n"
         )
+        await response.write(img_bytes)
+        await response.write(b"\r\n")
 
     last_image = None
 
     while True:
-        img_bytes = await image_cb()
+        try:
+            img_bytes = await image_cb()
+        except asyncio.TimeoutError:
+            # The camera stopped answering, end the stream
+            break
         if not img_bytes:
             break
 
@@ -310,6 +317,8 @@ async def async_unload_entry(hass, entry):
 class Camera(Entity):
     """The base class for camera entities."""
 
+    _frame_broker = None
+
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
@@ -357,6 +366,13 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def frame_broker(self):
+        """Return the broker sharing the frames of the camera."""
+        if self._frame_broker is None:
+            self._frame_broker = FrameBroker(self.hass, self)
+        return self._frame_broker
+
     async def stream_source(self):
         """Return the source of the stream."""
         return None
@@ -379,7 +395,10 @@ class Camera(Entity):
         This method must be run in the event loop.
         """
         return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
+            request,
+            partial(self.frame_broker.async_get_frame, interval),
+            self.content_type,
+            interval,
         )
 
     async def handle_async_mjpeg_stream(self, request):
@@ -510,7 +529,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
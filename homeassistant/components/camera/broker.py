@@ -0,0 +1,66 @@
+"""Share the frames fetched from a camera between its viewers."""
+import asyncio
+
+import async_timeout
+
+from homeassistant.core import callback
+
+# Seconds a frame is served to snapshot requests before fetching a new one
+SNAPSHOT_MAX_AGE = 2
+# Seconds after which an upstream fetch is given up
+FRAME_FETCH_TIMEOUT = 10
+
+
+class FrameBroker:
+    """Fetch frames from a camera once for all of its viewers.
+
+    Viewers ask for a frame not older than they can accept. The last frame
+    is returned while it is young enough, otherwise a single upstream fetch
+    is shared by every viewer waiting for a newer frame.
+    """
+
+    def __init__(self, hass, camera):
+        """Initialize the frame broker."""
+        self.hass = hass
+        self.camera = camera
+        self._frame = None
+        self._frame_time = None
+        self._fetch = None
+
+    async def async_get_frame(self, max_age=None):
+        """Return the bytes of a frame fetched at most max_age seconds ago.
+
+        Without max_age the frame is as recent as snapshots need to be.
+        """
+        if max_age is None:
+            max_age = SNAPSHOT_MAX_AGE
+
+        if (
+            self._frame is not None
+            and self.hass.loop.time() - self._frame_time < max_age
+        ):
+            return self._frame
+
+        if self._fetch is None:
+            self._fetch = self.hass.async_create_task(self._async_fetch())
+            self._fetch.add_done_callback(self._async_fetch_done)
+
+        # A viewer going away must not cancel the fetch of the others
+        return await asyncio.shield(self._fetch)
+
+    async def _async_fetch(self):
+        """Fetch a frame from the camera and keep it for the next viewers."""
+        async with async_timeout.timeout(FRAME_FETCH_TIMEOUT):
+            frame = await self.camera.async_camera_image()
+
+        if frame:
+            self._frame = frame
+            self._frame_time = self.hass.loop.time()
+        return frame
+
+    @callback
+    def _async_fetch_done(self, fetch):
+        """Allow the next fetch and retrieve errors nobody waited for."""
+        self._fetch = None
+        if not fetch.cancelled():
+            fetch.exception()
@@ -1,9 +1,9 @@
 """Allows the creation of a sensor that filters state property."""
+import asyncio
 import logging
 import statistics
 from collections import deque, Counter
 from numbers import Number
-from functools import partial
 from copy import copy
 from datetime import timedelta
 from typing import Optional
@@ -25,8 +25,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.util.decorator import Registry
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
-from homeassistant.components import history
-import homeassistant.util.dt as dt_util
+from homeassistant.components.recorder import preload
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -232,39 +231,30 @@ class SensorFilter(Entity):
                 ):
                     largest_window_time = filt.window_size
 
-            # Retrieve the largest window_size of each type
+            # Retrieve the largest window_size of each type, both are the
+            # newest states so the longest result holds the other one
+            requests = []
             if largest_window_items > 0:
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.get_last_state_changes,
+                requests.append(
+                    preload.async_preload_history(
                         self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
+                        self._entity,
+                        max_rows=largest_window_items,
+                        state_changes_only=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
             if largest_window_time > timedelta(seconds=0):
-                start = dt_util.utcnow() - largest_window_time
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.state_changes_during_period,
+                requests.append(
+                    preload.async_preload_history(
                         self.hass,
-                        start,
-                        entity_id=self._entity,
+                        self._entity,
+                        max_age=largest_window_time,
+                        state_changes_only=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
-                    )
+            if requests:
+                history_list = max(await asyncio.gather(*requests), key=len)
 
-            # Sort the window states
-            history_list = sorted(history_list, key=lambda s: s.last_updated)
             _LOGGER.debug(
                 "Loading from history: %s",
                 [(s.state, s.last_updated) for s in history_list],
@@ -2,15 +2,22 @@
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
+import math
 import time
 
+from aiohttp import web
 from sqlalchemy import and_, func
 import voluptuous as vol
 
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import (
+    StateAttributes,
+    States,
+    process_timestamp,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     ATTR_HIDDEN,
@@ -18,9 +25,12 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
+from homeassistant.core import split_entity_id
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -42,6 +52,10 @@ CONFIG_SCHEMA = vol.Schema(
 SIGNIFICANT_DOMAINS = ("thermostat", "climate", "water_heater")
 IGNORE_DOMAINS = ("zone", "scene")
 
+SERIES_AGGREGATES = ("min", "max", "mean", "last")
+# Number of rows fetched from the database at once for a series
+SERIES_BATCH_SIZE = 1000
+
 
 def get_significant_states(
     hass,
@@ -254,6 +268,206 @@ def states_to_json(
     return {key: val for key, val in result.items() if val}
 
 
+def get_series_entities(
+    hass,
+    start_time,
+    end_time,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+):
+    """Return the entity ids of a series request and their state at start_time."""
+    start_states = {}
+
+    if entity_ids is not None:
+        if include_start_time_state:
+            for entity_id in entity_ids:
+                state = get_state(hass, start_time, entity_id)
+                if state is not None:
+                    start_states[entity_id] = state
+        return entity_ids, start_states
+
+    if include_start_time_state:
+        for state in get_states(hass, start_time, filters=filters):
+            start_states[state.entity_id] = state
+
+    with session_scope(hass=hass) as session:
+        query = session.query(States.entity_id).filter(
+            States.last_updated > start_time
+        )
+
+        if end_time is not None:
+            query = query.filter(States.last_updated < end_time)
+
+        if filters:
+            query = filters.apply(query)
+
+        changed_entity_ids = {row.entity_id for row in query.distinct()}
+
+    return sorted(changed_entity_ids | set(start_states)), start_states
+
+
+def get_state_series(
+    hass,
+    start_time,
+    end_time,
+    entity_id,
+    start_state=None,
+    include_attributes=False,
+    bucket=None,
+):
+    """Return the significant states of an entity during a period as columns.
+
+    Without a bucket the result holds a timestamps list and a states list,
+    plus an attributes list if include_attributes is set. With a bucket size
+    in seconds, states are downsampled to the min, max, mean and last state
+    of each bucket that has states. Timestamps are UTC epoch seconds.
+
+    Rows are read in batches and never converted to State objects.
+    """
+    if bucket:
+        series = _BucketSeries(entity_id, start_time, bucket, include_attributes)
+    else:
+        series = _StateSeries(entity_id, include_attributes)
+
+    if start_state is not None:
+        series.add(
+            start_time.timestamp(),
+            start_state.state,
+            start_state.attributes if include_attributes else None,
+        )
+
+    columns = [States.state, States.last_updated]
+    if include_attributes:
+        columns.extend((States.attributes, StateAttributes.shared_attrs))
+
+    with session_scope(hass=hass) as session:
+        query = session.query(*columns)
+
+        if include_attributes:
+            query = query.outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+
+        query = query.filter(
+            (States.entity_id == entity_id) & (States.last_updated > start_time)
+        )
+
+        if split_entity_id(entity_id)[0] not in SIGNIFICANT_DOMAINS:
+            query = query.filter(States.last_changed == States.last_updated)
+
+        if end_time is not None:
+            query = query.filter(States.last_updated < end_time)
+
+        for row in query.order_by(States.last_updated).yield_per(SERIES_BATCH_SIZE):
+            attributes = None
+            if include_attributes:
+                attributes = json.loads(row.shared_attrs or row.attributes or "{}")
+            series.add(
+                process_timestamp(row.last_updated).timestamp(), row.state, attributes
+            )
+
+    return series.as_dict()
+
+
+class _StateSeries:
+    """Collect the states of an entity as columns."""
+
+    def __init__(self, entity_id, include_attributes):
+        """Initialize the series."""
+        self.entity_id = entity_id
+        self.timestamps = []
+        self.states = []
+        self.attributes = [] if include_attributes else None
+
+    def add(self, timestamp, state, attributes):
+        """Add a state."""
+        self.timestamps.append(timestamp)
+        self.states.append(state)
+        if self.attributes is not None:
+            self.attributes.append(attributes)
+
+    def as_dict(self):
+        """Return the columns, None if there are no states."""
+        if not self.timestamps:
+            return None
+        result = {
+            "entity_id": self.entity_id,
+            "timestamps": self.timestamps,
+            "states": self.states,
+        }
+        if self.attributes is not None:
+            result["attributes"] = self.attributes
+        return result
+
+
+class _BucketSeries:
+    """Downsample the states of an entity into fixed size buckets.
+
+    States that are not numbers only count for the last state of a bucket.
+    """
+
+    def __init__(self, entity_id, start_time, bucket, include_attributes):
+        """Initialize the series."""
+        self.entity_id = entity_id
+        self.start = start_time.timestamp()
+        self.bucket = bucket
+        self.include_attributes = include_attributes
+        self.columns = {key: [] for key in ("timestamps",) + SERIES_AGGREGATES}
+        if include_attributes:
+            self.columns["attributes"] = []
+        self._index = None
+        self._total = 0.0
+        self._count = 0
+
+    def add(self, timestamp, state, attributes):
+        """Add a state to its bucket."""
+        index = int((timestamp - self.start) // self.bucket)
+        if index != self._index:
+            self._close_bucket()
+            self._index = index
+            self.columns["timestamps"].append(self.start + index * self.bucket)
+            self.columns["min"].append(None)
+            self.columns["max"].append(None)
+            self.columns["last"].append(None)
+            if self.include_attributes:
+                self.columns["attributes"].append(None)
+
+        self.columns["last"][-1] = state
+        if self.include_attributes:
+            self.columns["attributes"][-1] = attributes
+
+        try:
+            value = float(state)
+        except (TypeError, ValueError):
+            return
+        if value != value or value in (float("inf"), float("-inf")):
+            return
+
+        minimum = self.columns["min"][-1]
+        maximum = self.columns["max"][-1]
+        self.columns["min"][-1] = value if minimum is None else min(minimum, value)
+        self.columns["max"][-1] = value if maximum is None else max(maximum, value)
+        self._total += value
+        self._count += 1
+
+    def _close_bucket(self):
+        """Calculate the mean of the current bucket."""
+        if self._index is None:
+            return
+        self.columns["mean"].append(self._total / self._count if self._count else None)
+        self._total = 0.0
+        self._count = 0
+
+    def as_dict(self):
+        """Return the buckets, None if there are no states."""
+        if self._index is None:
+            return None
+        self._close_bucket()
+        self._index = None
+        return {"entity_id": self.entity_id, "bucket": self.bucket, **self.columns}
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -275,6 +489,7 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.http.register_view(HistorySeriesView(filters))
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -360,6 +575,116 @@ class HistoryPeriodView(HomeAssistantView):
         return await hass.async_add_job(self.json, result)
 
 
+class HistorySeriesView(HomeAssistantView):
+    """Stream history of a period as columns, optionally downsampled."""
+
+    url = "/api/history/series"
+    name = "api:history:view-series"
+    extra_urls = ["/api/history/series/{datetime}"]
+
+    def __init__(self, filters):
+        """Initialize the history series view."""
+        self.filters = filters
+
+    async def get(self, request, datetime=None):
+        """Stream history over a period of time, one entity at a time."""
+        timer_start = time.perf_counter()
+        if datetime:
+            datetime = dt_util.parse_datetime(datetime)
+
+            if datetime is None:
+                return self.json_message("Invalid datetime", HTTP_BAD_REQUEST)
+
+        now = dt_util.utcnow()
+
+        one_day = timedelta(days=1)
+        if datetime:
+            start_time = dt_util.as_utc(datetime)
+        else:
+            start_time = now - one_day
+
+        if start_time > now:
+            return self.json([])
+
+        end_time = request.query.get("end_time")
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time:
+                end_time = dt_util.as_utc(end_time)
+            else:
+                return self.json_message("Invalid end_time", HTTP_BAD_REQUEST)
+        else:
+            end_time = start_time + one_day
+
+        bucket = request.query.get("bucket")
+        if bucket:
+            try:
+                bucket = float(bucket)
+            except ValueError:
+                bucket = 0
+            if not math.isfinite(bucket) or bucket <= 0:
+                return self.json_message("Invalid bucket", HTTP_BAD_REQUEST)
+
+        entity_ids = request.query.get("filter_entity_id")
+        if entity_ids:
+            entity_ids = entity_ids.lower().split(",")
+        include_start_time_state = "skip_initial_state" not in request.query
+        include_attributes = "attributes" in request.query
+
+        hass = request.app["hass"]
+
+        entity_ids, start_states = await hass.async_add_executor_job(
+            get_series_entities,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            self.filters,
+            include_start_time_state,
+        )
+
+        response = web.StreamResponse(headers={"Content-Type": CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+        await response.write(b"[")
+
+        separator = b""
+        for entity_id in entity_ids:
+            chunk = await hass.async_add_executor_job(
+                _encoded_state_series,
+                hass,
+                start_time,
+                end_time,
+                entity_id,
+                start_states.get(entity_id),
+                include_attributes,
+                bucket,
+            )
+            if chunk is None:
+                continue
+            await response.write(separator + chunk)
+            separator = b","
+
+        await response.write(b"]")
+        await response.write_eof()
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug(
+                "Streamed series of %d entities in %fs", len(entity_ids), elapsed
+            )
+
+        return response
+
+
+def _encoded_state_series(*args):
+    """Return the JSON of a state series, None if it has no states."""
+    series = get_state_series(*args)
+    if series is None:
+        return None
+    return json.dumps(series, cls=JSONEncoder).encode("UTF-8")
+
+
 class Filters:
     """Container for the configured include and exclude filters."""
 
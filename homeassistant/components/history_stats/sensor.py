@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -6,7 +7,7 @@ import math
 import voluptuous as vol
 
 from homeassistant.core import callback
-from homeassistant.components import history
+from homeassistant.components.recorder import preload
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 from homeassistant.components.sensor import PLATFORM_SCHEMA
@@ -112,6 +113,15 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # Running totals of the current period, seeded from the database
+        # and then kept up to date from the state changes of the entity
+        self._seeded_start = None
+        self._last_state = False
+        self._last_time = None
+        self._elapsed = 0
+        self._count = 0
+        self._changes = deque()
+
         @callback
         def start_refresh(*args):
             """Register state tracking."""
@@ -121,8 +131,20 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def state_changed(entity_id, old_state, new_state):
+                """Queue the state change and refresh."""
+                if new_state is not None:
+                    self._changes.append(
+                        (
+                            new_state.state == self._entity_state,
+                            new_state.last_changed.timestamp(),
+                        )
+                    )
+                force_refresh()
+
             force_refresh()
-            async_track_state_change(self.hass, self._entity_id, force_refresh)
+            async_track_state_change(self.hass, self._entity_id, state_changed)
 
         # Delay first refresh to keep startup fast
         hass.bus.listen_once(EVENT_HOMEASSISTANT_START, start_refresh)
@@ -171,7 +193,7 @@ class HistoryStatsSensor(Entity):
         """Return the icon to use in the frontend, if any."""
         return ICON
 
-    def update(self):
+    async def async_update(self):
         """Get the latest data and updates the states."""
         # Get previous values of start and end
         p_start, p_end = self._period
@@ -199,49 +221,89 @@ class HistoryStatsSensor(Entity):
             start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
             and end_timestamp <= now_timestamp
+            and not (self._changes and self._changes[0][1] <= end_timestamp)
         ):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
-
-        if self._entity_id not in history_list.keys():
-            return
-
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
-
-        # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
-
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
-
-            last_state = current_state
-            last_time = current_time
+        # Query the database only when the period moved, otherwise fold in
+        # the state changes received since the last update
+        if self._seeded_start != start_timestamp or end_timestamp < p_end_timestamp:
+            if not await self._async_seed(start, end, start_timestamp):
+                return
+        self._fold_changes(end_timestamp)
 
         # Count time elapsed between last history state and end of measure
-        if last_state:
+        elapsed = self._elapsed
+        if self._last_state:
             measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
+            elapsed += max(measure_end - self._last_time, 0)
 
         # Save value in hours
         self.value = elapsed / 3600
 
         # Save counter
-        self.count = count
+        self.count = self._count
+
+    async def _async_seed(self, start, end, start_timestamp):
+        """Compute the running totals of the period from the database."""
+        self._seeded_start = None
+        # The database holds the changes queued so far, changes received
+        # while it is queried are folded in afterwards
+        self._changes.clear()
+
+        # Get the state at the start and the history up to now
+        states = await preload.async_preload_history(
+            self.hass, self._entity_id, start_time=start, include_start_state=True
+        )
+
+        if not states or states[0].last_updated >= end:
+            return False
+
+        self._last_state = False
+        self._last_time = start_timestamp
+        self._elapsed = 0
+        self._count = 0
+
+        # Make calculations
+        for item in states:
+            if item.last_updated >= end:
+                break
+            if item.last_updated <= start:
+                # The state at the start of the period is not a change
+                self._last_state = item.state == self._entity_state
+            elif item.last_changed == item.last_updated:
+                self._add_change(
+                    item.state == self._entity_state, item.last_changed.timestamp()
+                )
+
+        self._seeded_start = start_timestamp
+        return True
 
+    def _fold_changes(self, end_timestamp):
+        """Add the queued state changes up to the end of the period.
+
+        Changes the database already returned are skipped. Changes after the
+        end of the period are kept in case the period end moves forward,
+        until the next period is seeded.
+        """
+        changes = self._changes
+        while changes and changes[0][1] <= end_timestamp:
+            current_state, current_time = changes.popleft()
+            if current_time > self._last_time:
+                self._add_change(current_state, current_time)
+
+    def _add_change(self, current_state, current_time):
+        """Add a state change to the running totals."""
+        if self._last_state:
+            self._elapsed += current_time - self._last_time
+        if current_state and not self._last_state:
+            self._count += 1
+
+        self._last_state = current_state
+        self._last_time = current_time
+
+    @callback
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
@@ -250,7 +312,7 @@ class HistoryStatsSensor(Entity):
         # Parse start
         if self._start is not None:
             try:
-                start_rendered = self._start.render()
+                start_rendered = self._start.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "start")
                 return
@@ -269,7 +331,7 @@ class HistoryStatsSensor(Entity):
         # Parse end
         if self._end is not None:
             try:
-                end_rendered = self._end.render()
+                end_rendered = self._end.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "end")
                 return
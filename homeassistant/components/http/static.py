@@ -1,49 +1,292 @@
 """Static file handling for HTTP component."""
+from collections import OrderedDict
+from datetime import datetime, timezone
+import gzip
+import math
+import mimetypes
+import os
 from pathlib import Path
+from time import monotonic
+from typing import Dict, List, Optional
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.web import FileResponse, Request, Response
 from aiohttp.web_exceptions import HTTPNotFound, HTTPForbidden
 from aiohttp.web_urldispatcher import StaticResource
+from multidict import CIMultiDict
 
+from .const import KEY_HASS
 
 # mypy: allow-untyped-defs
 
 CACHE_TIME = 31 * 86400  # = 1 month
 CACHE_HEADERS = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
 
+# Files larger than this are streamed from disk instead of kept in memory
+MAX_CACHED_FILE_SIZE = 2 * 1024 * 1024
+# Bytes of file contents kept in memory per static resource
+STATIC_CACHE_SIZE = 16 * 1024 * 1024
+# Seconds after which a cached file is checked for changes on disk
+STATIC_CACHE_REVALIDATE = 60
+
+# Content types that are worth compressing
+COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CachedFile:
+    """Contents of a static file kept in memory."""
+
+    def __init__(
+        self,
+        filepath: Path,
+        stat: os.stat_result,
+        content_type: str,
+        bodies: Dict[Optional[str], bytes],
+    ) -> None:
+        """Initialize the cached file.
+
+        Bodies maps each content encoding to the encoded contents, None
+        is the encoding of the file itself.
+        """
+        self.filepath = filepath
+        self.mtime_ns = stat.st_mtime_ns
+        self.mtime = stat.st_mtime
+        self.size = stat.st_size
+        self.content_type = content_type
+        self.bodies = bodies
+        self.checked = monotonic()
+
+    @property
+    def cache_size(self) -> int:
+        """Return the number of bytes the cached file holds."""
+        return sum(len(body) for body in self.bodies.values())
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """Return the entity tag of the body with a content encoding."""
+        tag = f"{self.mtime_ns:x}-{self.size:x}"
+        if encoding is not None:
+            tag = f"{tag}-{encoding}"
+        return f'"{tag}"'
+
+    def is_modified(self, stat: os.stat_result) -> bool:
+        """Return if the file on disk is not the cached file."""
+        return stat.st_mtime_ns != self.mtime_ns or stat.st_size != self.size
+
 
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Files are looked up in the executor. Small files are kept in memory,
+    together with their gzip and brotli encodings, in an LRU cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the static resource."""
+        super().__init__(*args, **kwargs)
+        self._cache: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._cache_size = 0
 
     async def _handle(self, request):
+        """Serve a static file."""
         rel_url = request.match_info["filename"]
-        try:
-            filename = Path(rel_url)
-            if filename.anchor:
-                # rel_url is an absolute name like
-                # /static/\\machine_name\c$ or /static/D:\path
-                # where the static dir is totally different
-                raise HTTPForbidden()
-            filepath = self._directory.joinpath(filename).resolve()
-            if not self._follow_symlinks:
-                filepath.relative_to(self._directory)
-        except (ValueError, FileNotFoundError) as error:
-            # relatively safe
-            raise HTTPNotFound() from error
-        except Exception as error:
-            # perm error or other kind!
-            request.app.logger.exception(error)
-            raise HTTPNotFound() from error
-
-        # on opening a dir, load its contents if allowed
+        hass = request.app[KEY_HASS]
+
+        # Ranges are served from disk, like files that are not cached
+        use_cache = hdrs.RANGE not in request.headers
+
+        cached = self._cache.get(rel_url) if use_cache else None
+        if cached is not None:
+            self._cache.move_to_end(rel_url)
+            if monotonic() - cached.checked > STATIC_CACHE_REVALIDATE:
+                if await hass.async_add_executor_job(_is_modified, cached):
+                    self._async_cache_remove(rel_url)
+                    cached = None
+                else:
+                    cached.checked = monotonic()
+
+        if cached is None:
+            try:
+                filepath = await hass.async_add_executor_job(self._resolve, rel_url)
+            except (ValueError, FileNotFoundError) as error:
+                # relatively safe
+                raise HTTPNotFound() from error
+            except HTTPForbidden:
+                raise
+            except Exception as error:
+                # perm error or other kind!
+                request.app.logger.exception(error)
+                raise HTTPNotFound() from error
+
+            # on opening a dir, load its contents if allowed
+            if filepath is None:
+                return await super()._handle(request)
+
+            if use_cache:
+                cached = await hass.async_add_executor_job(_load, filepath)
+                if cached is not None:
+                    self._async_cache_add(rel_url, cached)
+
+            if cached is None:
+                return FileResponse(
+                    filepath,
+                    chunk_size=self._chunk_size,
+                    # type ignore: https://github.com/aio-libs/aiohttp/pull/3976
+                    headers=CACHE_HEADERS,  # type: ignore
+                )
+
+        return _cached_response(request, cached)
+
+    def _resolve(self, rel_url):
+        """Return the path of a file, None for a directory."""
+        filename = Path(rel_url)
+        if filename.anchor:
+            # rel_url is an absolute name like
+            # /static/\\machine_name\c$ or /static/D:\path
+            # where the static dir is totally different
+            raise HTTPForbidden()
+        filepath = self._directory.joinpath(filename).resolve()
+        if not self._follow_symlinks:
+            filepath.relative_to(self._directory)
+
         if filepath.is_dir():
-            return await super()._handle(request)
+            return None
         if filepath.is_file():
-            return FileResponse(
-                filepath,
-                chunk_size=self._chunk_size,
-                # type ignore: https://github.com/aio-libs/aiohttp/pull/3976
-                headers=CACHE_HEADERS,  # type: ignore
-            )
-        raise HTTPNotFound
+            return filepath
+        raise FileNotFoundError(rel_url)
+
+    def _async_cache_add(self, rel_url: str, cached: CachedFile) -> None:
+        """Add a file to the cache, dropping the least recently used files."""
+        self._async_cache_remove(rel_url)
+        self._cache[rel_url] = cached
+        self._cache_size += cached.cache_size
+
+        while self._cache_size > STATIC_CACHE_SIZE and len(self._cache) > 1:
+            self._async_cache_remove(next(iter(self._cache)))
+
+    def _async_cache_remove(self, rel_url: str) -> None:
+        """Remove a file from the cache."""
+        cached = self._cache.pop(rel_url, None)
+        if cached is not None:
+            self._cache_size -= cached.cache_size
+
+
+def _load(filepath: Path) -> Optional[CachedFile]:
+    """Read a file and its encodings, None if it is too large to cache."""
+    stat = filepath.stat()
+    if stat.st_size > MAX_CACHED_FILE_SIZE:
+        return None
+
+    content_type = mimetypes.guess_type(str(filepath))[0]
+    content_type = content_type or "application/octet-stream"
+    bodies: Dict[Optional[str], bytes] = {None: filepath.read_bytes()}
+
+    for encoding, suffix in ENCODING_SUFFIXES:
+        encoded_path = filepath.with_name(filepath.name + suffix)
+        if encoded_path.is_file():
+            bodies[encoding] = encoded_path.read_bytes()
+
+    if "gzip" not in bodies and (
+        content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+    ):
+        compressed = gzip.compress(bodies[None])
+        if len(compressed) < stat.st_size:
+            bodies["gzip"] = compressed
+
+    return CachedFile(filepath, stat, content_type, bodies)
+
+
+def _is_modified(cached: CachedFile) -> bool:
+    """Return if a cached file changed or was removed on disk."""
+    try:
+        return cached.is_modified(cached.filepath.stat())
+    except OSError:
+        return True
+
+
+def _accepted_encodings(request: Request) -> List[str]:
+    """Return the content encodings a request accepts, by preference."""
+    qualities = {}
+    for token in request.headers.get(hdrs.ACCEPT_ENCODING, "").split(","):
+        encoding, _, params = token.partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[encoding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    accepted = []
+    for encoding, _ in ENCODING_SUFFIXES:
+        quality = qualities.get(encoding, wildcard)
+        if quality > 0:
+            accepted.append((quality, encoding))
+    # Sorting is stable, so equal qualities keep the order of the suffixes
+    accepted.sort(key=lambda item: item[0], reverse=True)
+    return [encoding for _, encoding in accepted]
+
+
+def _cached_response(request: Request, cached: CachedFile) -> Response:
+    """Return the response for a cached file."""
+    encoding: Optional[str] = None
+    if len(cached.bodies) > 1:
+        for accepted in _accepted_encodings(request):
+            if accepted in cached.bodies:
+                encoding = accepted
+                break
+
+    etag = cached.etag(encoding)
+    headers: CIMultiDict[str] = CIMultiDict(CACHE_HEADERS.items())
+    headers[hdrs.ETAG] = etag
+    if len(cached.bodies) > 1:
+        headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if if_none_match is not None:
+        # Weak comparison, W/ only marks a tag as weak
+        not_modified = if_none_match.strip() == "*" or etag in (
+            _strip_weak(tag) for tag in if_none_match.split(",")
+        )
+    else:
+        if_modified_since = request.if_modified_since
+        not_modified = (
+            if_modified_since is not None
+            and cached.mtime <= if_modified_since.timestamp()
+        )
+
+    if not_modified:
+        response = Response(status=304, headers=headers)
+    else:
+        if encoding is not None:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+        response = Response(
+            body=cached.bodies[encoding],
+            content_type=cached.content_type,
+            headers=headers,
+        )
+    # Rounded up like aiohttp does, dates only have a precision of seconds
+    response.last_modified = datetime.fromtimestamp(
+        math.ceil(cached.mtime), timezone.utc
+    )
+    return response
+
+
+def _strip_weak(tag: str) -> str:
+    """Return an entity tag without its weakness indicator."""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        return tag[2:]
+    return tag
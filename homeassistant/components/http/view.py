@@ -62,6 +62,18 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    def json_encoded(body, status_code=200, headers=None):
+        """Return a response with data that is already encoded as JSON."""
+        response = web.Response(
+            body=body.encode("UTF-8"),
+            content_type=CONTENT_TYPE_JSON,
+            status=status_code,
+            headers=headers,
+        )
+        response.enable_compression()
+        return response
+
     def json_message(self, message, status_code=200, message_code=None, headers=None):
         """Return a JSON message response."""
         data = {"message": message}
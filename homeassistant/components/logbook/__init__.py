@@ -1,10 +1,13 @@
 """Event parser and human readable log generator."""
+from collections import OrderedDict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
-import time
+import re
 
-from sqlalchemy.exc import SQLAlchemyError
+from aiohttp import web
+from sqlalchemy import false, true
 import voluptuous as vol
 
 from homeassistant.components import sun
@@ -16,12 +19,13 @@ from homeassistant.components.homekit.const import (
     EVENT_HOMEKIT_CHANGED,
 )
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import Events, States
-from homeassistant.components.recorder.util import (
-    QUERY_RETRY_WAIT,
-    RETRIES,
-    session_scope,
+from homeassistant.components.recorder.models import (
+    Events,
+    StateAttributes,
+    States,
+    process_timestamp,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     ATTR_DOMAIN,
     ATTR_ENTITY_ID,
@@ -30,6 +34,7 @@ from homeassistant.const import (
     ATTR_SERVICE,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     EVENT_AUTOMATION_TRIGGERED,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -41,9 +46,16 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, State, callback, split_entity_id
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    Context,
+    State,
+    callback,
+    split_entity_id,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
@@ -59,6 +71,16 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# Event data of an added or removed entity, whatever separators encoded it
+RE_STATE_NULL = re.compile(r'"(?:old|new)_state"\s*:\s*null')
+
+# Number of finished days kept encoded by the logbook view
+DAY_CACHE_SIZE = 32
+
+# Days are cached once they ended this long ago, so the recorder has
+# committed all of their events
+DAY_CACHE_DELAY = timedelta(minutes=5)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -159,9 +181,10 @@ class LogbookView(HomeAssistantView):
     def __init__(self, config):
         """Initialize the logbook view."""
         self.config = config
+        self._day_cache = OrderedDict()
 
     async def get(self, request, datetime=None):
-        """Retrieve logbook entries."""
+        """Stream logbook entries, one day at a time."""
         if datetime:
             datetime = dt_util.parse_datetime(datetime)
 
@@ -181,13 +204,49 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=period)
         hass = request.app["hass"]
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(hass, self.config, start_day, end_day, entity_id)
-            )
+        response = web.StreamResponse(headers={"Content-Type": CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+        await response.write(b"[")
+
+        separator = b""
+        day_start = start_day
+        while day_start < end_day:
+            day_end = day_start + timedelta(days=1)
+            group_start = _group_start(day_end)
+            if group_start != day_end:
+                # Events of a group are humanified together, so the group
+                # around the end of the day is kept whole in this day
+                day_end = group_start + timedelta(minutes=GROUP_BY_MINUTES)
+            day_end = min(day_end, end_day)
+            chunk = await self._async_get_day(hass, day_start, day_end, entity_id)
+            if chunk:
+                await response.write(separator + chunk)
+                separator = b","
+            day_start = day_end
+
+        await response.write(b"]")
+        await response.write_eof()
+        return response
+
+    async def _async_get_day(self, hass, start_day, end_day, entity_id):
+        """Return the encoded entries of a day, cached once it is over."""
+        key = (entity_id, start_day, end_day)
+        chunk = self._day_cache.get(key)
+        if chunk is not None:
+            self._day_cache.move_to_end(key)
+            return chunk
+
+        chunk = await hass.async_add_executor_job(
+            _encoded_events, hass, self.config, start_day, end_day, entity_id
+        )
+
+        if end_day <= dt_util.utcnow() - DAY_CACHE_DELAY:
+            self._day_cache[key] = chunk
+            if len(self._day_cache) > DAY_CACHE_SIZE:
+                self._day_cache.popitem(last=False)
 
-        return await hass.async_add_job(json_events)
+        return chunk
 
 
 def humanify(hass, events):
@@ -200,9 +259,7 @@ def humanify(hass, events):
     domain_prefixes = tuple(f"{dom}." for dom in CONTINUOUS_DOMAINS)
 
     # Group events in batches of GROUP_BY_MINUTES
-    for _, g_events in groupby(
-        events, lambda event: event.time_fired.minute // GROUP_BY_MINUTES
-    ):
+    for _, g_events in groupby(events, lambda event: _group_start(event.time_fired)):
 
         events_batch = list(g_events)
 
@@ -237,7 +294,7 @@ def humanify(hass, events):
         for event in events_batch:
             if event.event_type == EVENT_STATE_CHANGED:
 
-                to_state = State.from_dict(event.data.get("new_state"))
+                to_state = _new_state_of_event(event)
 
                 domain = to_state.domain
 
@@ -379,30 +436,13 @@ def humanify(hass, events):
                 }
 
 
-def _get_related_entity_ids(session, entity_filter):
-    timer_start = time.perf_counter()
-
-    query = session.query(States).with_entities(States.entity_id).distinct()
-
-    for tryno in range(0, RETRIES):
-        try:
-            result = [row.entity_id for row in query if entity_filter(row.entity_id)]
-
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                elapsed = time.perf_counter() - timer_start
-                _LOGGER.debug(
-                    "fetching %d distinct domain/entity_id pairs took %fs",
-                    len(result),
-                    elapsed,
-                )
-
-            return result
-        except SQLAlchemyError as err:
-            _LOGGER.error("Error executing query: %s", err)
-
-            if tryno == RETRIES - 1:
-                raise
-            time.sleep(QUERY_RETRY_WAIT)
+def _group_start(time_fired):
+    """Return the start of the GROUP_BY_MINUTES batch of a time."""
+    return time_fired.replace(
+        minute=time_fired.minute - time_fired.minute % GROUP_BY_MINUTES,
+        second=0,
+        microsecond=0,
+    )
 
 
 def _generate_filter_from_config(config):
@@ -425,33 +465,188 @@ def _generate_filter_from_config(config):
     )
 
 
+def _generate_sql_filter_from_config(config):
+    """Return the condition on States matching the entity filter of config.
+
+    The condition mirrors generate_filter, so the entities are filtered by
+    the database instead of listing all matching entity ids.
+    """
+    exclude = config.get(CONF_EXCLUDE) or {}
+    include = config.get(CONF_INCLUDE) or {}
+    include_d = include.get(CONF_DOMAINS, [])
+    include_e = include.get(CONF_ENTITIES, [])
+    exclude_d = exclude.get(CONF_DOMAINS, [])
+    exclude_e = exclude.get(CONF_ENTITIES, [])
+
+    def entity_in(entity_ids):
+        """Return the condition matching entity_ids."""
+        return States.entity_id.in_(entity_ids) if entity_ids else false()
+
+    def domain_in(domains):
+        """Return the condition matching domains."""
+        return States.domain.in_(domains) if domains else false()
+
+    have_exclude = bool(exclude_e or exclude_d)
+    have_include = bool(include_e or include_d)
+
+    if not have_include and not have_exclude:
+        return true()
+
+    if have_include and not have_exclude:
+        return entity_in(include_e) | domain_in(include_d)
+
+    if not have_include and have_exclude:
+        return ~entity_in(exclude_e) & ~domain_in(exclude_d)
+
+    if include_d:
+        return (domain_in(include_d) & ~entity_in(exclude_e)) | (
+            ~domain_in(include_d) & entity_in(include_e)
+        )
+
+    if exclude_d:
+        return (domain_in(exclude_d) & entity_in(include_e)) | (
+            ~domain_in(exclude_d) & ~entity_in(exclude_e)
+        )
+
+    return entity_in(include_e)
+
+
+class LazyEventPartialState:
+    """Event of a logbook query row that only decodes what is used.
+
+    The data of state_changed events is never decoded, their new state is
+    built from the columns of the state row and its attributes.
+    """
+
+    __slots__ = ["_row", "_data", "_attributes", "event_type", "time_fired"]
+
+    def __init__(self, row, attributes_cache):
+        """Initialize the event."""
+        self._row = row
+        self._data = None
+        self._attributes = None
+        self.event_type = row.event_type
+        self.time_fired = process_timestamp(row.time_fired)
+        if row.state_entity_id is not None:
+            self._attributes = _decode_attributes(row, attributes_cache)
+
+    @property
+    def context(self):
+        """Return the context of the event."""
+        return Context(id=self._row.context_id, user_id=self._row.context_user_id)
+
+    @property
+    def data(self):
+        """Return the event data, the entity of state_changed events."""
+        if self._data is None:
+            if self._attributes is not None:
+                self._data = {"entity_id": self._row.state_entity_id}
+            else:
+                self._data = json.loads(self._row.event_data)
+        return self._data
+
+    @property
+    def new_state(self):
+        """Return the new state of a state_changed event."""
+        if self._attributes is None:
+            return State.from_dict(self.data.get("new_state"))
+        return State(
+            self._row.state_entity_id,
+            self._row.state,
+            self._attributes,
+            temp_invalid_id_bypass=True,
+        )
+
+    def keep(self, entities_filter):
+        """Return if the event should be in the logbook.
+
+        The entity filter of state rows and whether only their attributes
+        changed is already part of the query.
+        """
+        if self._attributes is None:
+            return _keep_event(self, entities_filter)
+
+        event_data = self._row.event_data
+        # Do not report on new entities or entity removal. The text only
+        # preselects the rows to decode, attributes can contain it too.
+        if RE_STATE_NULL.search(event_data):
+            data = json.loads(event_data)
+            if data.get("old_state") is None or data.get("new_state") is None:
+                return False
+
+        # Also filter auto groups.
+        if self._row.state_domain == "group" and self._attributes.get("auto", False):
+            return False
+
+        # exclude entities which are customized hidden
+        return not self._attributes.get(ATTR_HIDDEN, False)
+
+
+def _decode_attributes(row, attributes_cache):
+    """Return the attributes of a state row, decoding shared ones once."""
+    if row.attributes_id is not None and row.attributes_id in attributes_cache:
+        return attributes_cache[row.attributes_id]
+
+    if row.shared_attrs is not None:
+        attributes = json.loads(row.shared_attrs)
+        attributes_cache[row.attributes_id] = attributes
+    else:
+        # Rows written before the attributes were shared store them inline
+        attributes = json.loads(row.attributes or "{}")
+    return attributes
+
+
+def _new_state_of_event(event):
+    """Return the new state of a state_changed event."""
+    if isinstance(event, LazyEventPartialState):
+        return event.new_state
+    return State.from_dict(event.data.get("new_state"))
+
+
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
     entities_filter = _generate_filter_from_config(config)
+    attributes_cache = {}
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(500):
-            event = row.to_native()
-            if _keep_event(event, entities_filter):
+            event = LazyEventPartialState(row, attributes_cache)
+            if event.keep(entities_filter):
                 yield event
 
-    with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
-        else:
-            entity_ids = _get_related_entity_ids(session, entities_filter)
+    entity_condition = _generate_sql_filter_from_config(config)
+    if entity_id is not None:
+        entity_condition = (States.entity_id == entity_id.lower()) & entity_condition
 
+    with session_scope(hass=hass) as session:
         query = (
-            session.query(Events)
+            session.query(
+                Events.event_type,
+                Events.event_data,
+                Events.time_fired,
+                Events.context_id,
+                Events.context_user_id,
+                States.entity_id.label("state_entity_id"),
+                States.domain.label("state_domain"),
+                States.state,
+                States.attributes,
+                States.attributes_id,
+                StateAttributes.shared_attrs,
+            )
             .order_by(Events.time_fired)
             .outerjoin(States, (Events.event_id == States.event_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
             .filter(Events.event_type.in_(ALL_EVENT_TYPES))
             .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
             .filter(
                 (
                     (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
+                    & (States.state_id.isnot(None))
+                    & entity_condition
                 )
                 | (States.state_id.is_(None))
             )
@@ -460,6 +655,14 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
         return list(humanify(hass, yield_events(query)))
 
 
+def _encoded_events(hass, config, start_day, end_day, entity_id=None):
+    """Return the JSON encoded entries of a period, without brackets."""
+    events = _get_events(hass, config, start_day, end_day, entity_id)
+    if not events:
+        return b""
+    return json.dumps(events, sort_keys=True, cls=JSONEncoder)[1:-1].encode("UTF-8")
+
+
 def _keep_event(event, entities_filter):
     domain, entity_id = None, None
 
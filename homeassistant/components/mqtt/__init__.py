@@ -1,7 +1,7 @@
 """Support for MQTT message handling."""
 import asyncio
 import sys
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import inspect
 from itertools import groupby
 import json
@@ -11,7 +11,7 @@ import os
 import socket
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import attr
 import requests.certs
@@ -120,6 +120,9 @@ ATTR_RETAIN = CONF_RETAIN
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Number of topics to remember the matching subscriptions of
+MATCH_CACHE_SIZE = 8192
+
 CONNECTION_SUCCESS = "connection_success"
 CONNECTION_FAILED = "connection_failed"
 CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
@@ -727,12 +730,17 @@ class MQTT:
         # should be able to optionally rely on MQTT.
         # pylint: disable=import-outside-toplevel
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        self._matcher = MQTTMatcher()
+        self._matching_subscriptions = lru_cache(maxsize=MATCH_CACHE_SIZE)(
+            self._find_matching_subscriptions
+        )
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
@@ -838,6 +846,7 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._async_track_subscription(subscription)
 
         await self._async_perform_subscription(topic, qos)
 
@@ -847,6 +856,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._async_untrack_subscription(subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -858,6 +868,32 @@ class MQTT:
 
         return async_remove
 
+    @callback
+    def _async_track_subscription(self, subscription: Subscription) -> None:
+        """Add a subscription to the topic matcher."""
+        try:
+            self._matcher[subscription.topic].append(subscription)
+        except KeyError:
+            self._matcher[subscription.topic] = [subscription]
+        self._matching_subscriptions.cache_clear()
+
+    @callback
+    def _async_untrack_subscription(self, subscription: Subscription) -> None:
+        """Remove a subscription from the topic matcher."""
+        subscriptions = self._matcher[subscription.topic]
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._matcher[subscription.topic]
+        self._matching_subscriptions.cache_clear()
+
+    def _find_matching_subscriptions(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions whose topic filter matches topic."""
+        return [
+            subscription
+            for subscriptions in self._matcher.iter_match(topic)
+            for subscription in subscriptions
+        ]
+
     async def _async_unsubscribe(self, topic: str) -> None:
         """Unsubscribe from a topic.
 
@@ -923,15 +959,22 @@ class MQTT:
             msg.payload,
         )
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        # Payloads decoded with each encoding, None if decoding failed
+        decoded: Dict[str, Optional[str]] = {}
 
+        for subscription in self._matching_subscriptions(msg.topic):
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
+                if subscription.encoding not in decoded:
+                    try:
+                        decoded[subscription.encoding] = msg.payload.decode(
+                            subscription.encoding
+                        )
+                    except (AttributeError, UnicodeDecodeError):
+                        decoded[subscription.encoding] = None
+
+                payload = decoded[subscription.encoding]
+                if payload is None:
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
                         msg.payload,
@@ -986,20 +1029,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
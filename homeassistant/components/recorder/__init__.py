@@ -1,6 +1,6 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -38,7 +38,7 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import DATA_INSTANCE
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -64,9 +64,18 @@ CONF_DB_URL = "db_url"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
+CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_BATCH_SIZE = "max_batch_size"
+CONF_RETENTION = "retention"
+
+DEFAULT_COMMIT_INTERVAL = 0
+DEFAULT_MAX_BATCH_SIZE = 500
 
 CONNECT_RETRY_WAIT = 3
 
+# Number of recently written attribute hashes to remember
+ATTRIBUTES_CACHE_SIZE = 2048
+
 FILTER_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_EXCLUDE, default={}): vol.Schema(
@@ -85,17 +94,31 @@ FILTER_SCHEMA = vol.Schema(
     }
 )
 
+KEEP_DAYS_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+RETENTION_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_DOMAINS, default={}): {cv.string: KEEP_DAYS_SCHEMA},
+        vol.Optional(CONF_ENTITIES, default={}): {cv.entity_id: KEEP_DAYS_SCHEMA},
+    }
+)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         vol.Optional(DOMAIN, default=dict): FILTER_SCHEMA.extend(
             {
-                vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
-                    vol.Coerce(int), vol.Range(min=1)
-                ),
+                vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): KEEP_DAYS_SCHEMA,
                 vol.Optional(CONF_PURGE_INTERVAL, default=1): vol.All(
                     vol.Coerce(int), vol.Range(min=0)
                 ),
                 vol.Optional(CONF_DB_URL): cv.string,
+                vol.Optional(CONF_RETENTION, default={}): RETENTION_SCHEMA,
+                vol.Optional(
+                    CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
             }
         )
     },
@@ -133,6 +156,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config[DOMAIN]
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL)
+    max_batch_size = conf.get(CONF_MAX_BATCH_SIZE)
+    retention = conf.get(CONF_RETENTION, {})
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -144,6 +170,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         hass=hass,
         keep_days=keep_days,
         purge_interval=purge_interval,
+        commit_interval=commit_interval,
+        max_batch_size=max_batch_size,
+        retention=retention,
         uri=db_url,
         include=include,
         exclude=exclude,
@@ -162,7 +191,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return await instance.async_db_ready
 
 
-PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
+PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack", "progress"])
+StopTask = namedtuple("StopTask", [])
 
 
 class Recorder(threading.Thread):
@@ -173,6 +203,9 @@ class Recorder(threading.Thread):
         hass: HomeAssistant,
         keep_days: int,
         purge_interval: int,
+        commit_interval: float,
+        max_batch_size: int,
+        retention: Dict,
         uri: str,
         include: Dict,
         exclude: Dict,
@@ -183,6 +216,9 @@ class Recorder(threading.Thread):
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.retention = retention
         self.queue: Any = queue.Queue()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -199,6 +235,8 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
 
         self.get_session = None
+        self._attributes_ids: OrderedDict = OrderedDict()
+        self._last_attributes: Dict[str, Any] = {}
 
     @callback
     def async_initialize(self):
@@ -210,7 +248,7 @@ class Recorder(threading.Thread):
         keep_days = kwargs.get(ATTR_KEEP_DAYS, self.keep_days)
         repack = kwargs.get(ATTR_REPACK)
 
-        self.queue.put(PurgeTask(keep_days, repack))
+        self.queue.put(PurgeTask(keep_days, repack, purge.PurgeProgress()))
 
     def run(self):
         """Start processing events to save."""
@@ -261,7 +299,7 @@ class Recorder(threading.Thread):
                 """Shut down the Recorder."""
                 if not hass_started.done():
                     hass_started.set_result(shutdown_task)
-                self.queue.put(None)
+                self.queue.put(StopTask())
                 self.join()
 
             self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
@@ -292,7 +330,9 @@ class Recorder(threading.Thread):
             @callback
             def async_purge(now):
                 """Trigger the purge and schedule the next run."""
-                self.queue.put(PurgeTask(self.keep_days, repack=False))
+                self.queue.put(
+                    PurgeTask(self.keep_days, False, purge.PurgeProgress())
+                )
                 self.hass.helpers.event.async_track_point_in_time(
                     async_purge, now + timedelta(days=self.purge_interval)
                 )
@@ -311,78 +351,193 @@ class Recorder(threading.Thread):
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
         while True:
-            event = self.queue.get()
+            events, task = self._get_batch()
+
+            if events:
+                self._save_events(events)
+                for _ in events:
+                    self.queue.task_done()
 
-            if event is None:
+            if isinstance(task, StopTask):
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
-            if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
-                self.queue.task_done()
-                continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self.queue.task_done()
-                continue
-            if event.event_type in self.exclude_t:
+            if isinstance(task, PurgeTask):
+                deleted_attributes = task.progress.deleted_attributes
+                finished = purge.purge_old_data(
+                    self, task.keep_days, task.repack, task.progress
+                )
+                if task.progress.deleted_attributes != deleted_attributes:
+                    # Events saved before the next chunk must not reuse the
+                    # cached ids of purged attribute rows
+                    self._reset_attributes_cache()
+                if not finished:
+                    # Purge the next chunk after the events queued meanwhile
+                    self.queue.put(task)
                 self.queue.task_done()
-                continue
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    self.queue.task_done()
-                    continue
-
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
+    def _get_batch(self):
+        """Drain the queue into a batch of events to commit together.
+
+        Blocks until the first item arrives, then keeps collecting events
+        until the batch is full, commit_interval has passed or a task (purge
+        or shutdown) is dequeued. Returns the events and the task that ended
+        the batch, or None if no task was dequeued.
+        """
+        events = []
+        deadline = None
+
+        while len(events) < self.max_batch_size:
+            if deadline is None:
+                item = self.queue.get()
+                deadline = time.monotonic() + self.commit_interval
+            else:
                 try:
-                    with session_scope(session=self.get_session()) as session:
-                        try:
-                            dbevent = Events.from_event(event)
-                            session.add(dbevent)
-                            session.flush()
-                        except (TypeError, ValueError):
-                            _LOGGER.warning("Event is not JSON serializable: %s", event)
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            try:
-                                dbstate = States.from_event(event)
-                                dbstate.event_id = dbevent.event_id
-                                session.add(dbstate)
-                            except (TypeError, ValueError):
-                                _LOGGER.warning(
-                                    "State is not JSON serializable: %s",
-                                    event.data.get("new_state"),
-                                )
-
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error(
-                        "Error in database connectivity: %s. "
-                        "(retrying in %s seconds)",
-                        err,
-                        CONNECT_RETRY_WAIT,
-                    )
-                    tries += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        item = self.queue.get(timeout=remaining)
+                    else:
+                        item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if isinstance(item, (PurgeTask, StopTask)):
+                return events, item
+
+            events.append(item)
+
+        return events, None
+
+    def _should_record(self, event):
+        """Return if an event should be written to the database."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return False
+        if event.event_type in self.exclude_t:
+            return False
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        return entity_id is None or self.entity_filter(entity_id)
+
+    def _save_events(self, events):
+        """Write a batch of events in a single transaction."""
+        events = [event for event in events if self._should_record(event)]
+        if not events:
+            return
 
-                except exc.SQLAlchemyError:
-                    updated = True
-                    _LOGGER.exception("Error saving event: %s", event)
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                with session_scope(session=self.get_session()) as session:
+                    for event in events:
+                        self._add_event(session, event)
+
+                updated = True
 
-            if not updated:
+            except exc.OperationalError as err:
+                self._reset_attributes_cache()
                 _LOGGER.error(
-                    "Error in database update. Could not save "
-                    "after %d tries. Giving up",
-                    tries,
+                    "Error in database connectivity: %s. (retrying in %s seconds)",
+                    err,
+                    CONNECT_RETRY_WAIT,
                 )
+                tries += 1
+
+            except exc.SQLAlchemyError:
+                self._reset_attributes_cache()
+                updated = True
+                if len(events) == 1:
+                    _LOGGER.exception("Error saving event: %s", events[0])
+                else:
+                    # Save the events one by one to only lose the bad ones
+                    for event in events:
+                        self._save_event(event)
+
+        if not updated:
+            _LOGGER.error(
+                "Error in database update. Could not save "
+                "after %d tries. Giving up",
+                tries,
+            )
+
+    def _save_event(self, event):
+        """Write a single event in its own transaction."""
+        try:
+            with session_scope(session=self.get_session()) as session:
+                self._add_event(session, event)
+        except exc.SQLAlchemyError:
+            self._reset_attributes_cache()
+            _LOGGER.exception("Error saving event: %s", event)
+
+    def _add_event(self, session, event):
+        """Add an event and its state to the session."""
+        try:
+            dbevent = Events.from_event(event)
+            session.add(dbevent)
+            session.flush()
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            try:
+                dbstate = States.from_event(event)
+                dbstate.event_id = dbevent.event_id
+                dbstate.attributes_id = self._get_attributes_id(session, event)
+                session.add(dbstate)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state")
+                )
+
+    def _get_attributes_id(self, session, event):
+        """Return the id of the shared attributes row for a state change.
+
+        Attributes that are equal to the previous ones of the entity are not
+        serialized again and recently written ones are not looked up.
+        """
+        entity_id = event.data["entity_id"]
+        state = event.data.get("new_state")
+        attributes = state.attributes if state is not None else {}
+
+        last = self._last_attributes.get(entity_id)
+        if last is not None and last[0] == attributes:
+            return last[1]
+
+        dbattrs = StateAttributes.from_event(event)
+        attributes_id = self._attributes_ids.get(dbattrs.hash)
+
+        if attributes_id is None:
+            existing = (
+                session.query(StateAttributes.attributes_id)
+                .filter(
+                    (StateAttributes.hash == dbattrs.hash)
+                    & (StateAttributes.shared_attrs == dbattrs.shared_attrs)
+                )
+                .first()
+            )
+            if existing is not None:
+                attributes_id = existing[0]
+            else:
+                session.add(dbattrs)
+                session.flush()
+                attributes_id = dbattrs.attributes_id
+        else:
+            self._attributes_ids.move_to_end(dbattrs.hash)
+
+        self._attributes_ids[dbattrs.hash] = attributes_id
+        if len(self._attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
+
+        self._last_attributes[entity_id] = (attributes, attributes_id)
+        return attributes_id
 
-            self.queue.task_done()
+    def _reset_attributes_cache(self):
+        """Forget cached attribute ids that may no longer be in the database."""
+        self._attributes_ids.clear()
+        self._last_attributes.clear()
 
     @callback
     def event_listener(self, event):
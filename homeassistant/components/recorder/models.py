@@ -1,9 +1,11 @@
 """Models for SQLAlchemy."""
+import hashlib
 import json
 from datetime import datetime
 import logging
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -15,6 +17,7 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
 import homeassistant.util.dt as dt_util
@@ -25,7 +28,7 @@ from homeassistant.helpers.json import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 8
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,7 +68,7 @@ class Events(Base):  # type: ignore
                 self.event_type,
                 json.loads(self.event_data),
                 EventOrigin(self.origin),
-                _process_timestamp(self.time_fired),
+                process_timestamp(self.time_fired),
                 context=context,
             )
         except ValueError:
@@ -84,6 +87,9 @@ class States(Base):  # type: ignore
     state = Column(String(255))
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
@@ -97,9 +103,14 @@ class States(Base):  # type: ignore
         Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
     )
 
+    state_attributes = relationship("StateAttributes", lazy="joined")
+
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are stored separately, see StateAttributes.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
@@ -114,13 +125,11 @@ class States(Base):  # type: ignore
         if state is None:
             dbstate.state = ""
             dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -129,13 +138,18 @@ class States(Base):  # type: ignore
     def to_native(self):
         """Convert to an HA state object."""
         context = Context(id=self.context_id, user_id=self.context_user_id)
+        if self.state_attributes is not None:
+            attributes = self.state_attributes.shared_attrs
+        else:
+            # Rows written before the attributes were shared store them inline
+            attributes = self.attributes or "{}"
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
-                _process_timestamp(self.last_changed),
-                _process_timestamp(self.last_updated),
+                json.loads(attributes),
+                process_timestamp(self.last_changed),
+                process_timestamp(self.last_updated),
                 context=context,
                 # Temp, because database can still store invalid entity IDs
                 # Remove with 1.0 or in 2020.
@@ -147,6 +161,36 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attributes shared between state rows."""
+
+    __tablename__ = "state_attributes"
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        state = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            shared_attrs = "{}"
+        else:
+            shared_attrs = json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return a hash of the serialized attributes that fits a BigInteger."""
+        digest = hashlib.sha256(shared_attrs.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") >> 1
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -194,7 +238,7 @@ class SchemaChanges(Base):  # type: ignore
     changed = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
-def _process_timestamp(ts):
+def process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
         return None
@@ -0,0 +1,292 @@
+"""Preload the recent history of entities in bulk.
+
+Integrations that replay the recorded history of an entity when they start
+request it here instead of querying the database themselves. Requests made
+in the same event loop iteration are coalesced and loaded with one windowed
+query per batch of entities in the executor.
+"""
+from collections import deque
+import logging
+
+from sqlalchemy import and_, func, or_, select, true
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
+
+from homeassistant.core import callback
+import homeassistant.util.dt as dt_util
+
+from .models import States
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PRELOADER = "recorder_preloader"
+
+# Maximum number of entities loaded by a single query
+PRELOAD_BATCH_SIZE = 50
+
+
+class PreloadRequest:
+    """Request for the recent history of an entity."""
+
+    def __init__(
+        self, entity_id, max_rows, cutoff, include_start_state, state_changes_only=False
+    ):
+        """Initialize the request."""
+        self.entity_id = entity_id.lower()
+        self.max_rows = max_rows
+        self.cutoff = cutoff
+        self.include_start_state = include_start_state
+        self.state_changes_only = state_changes_only
+        self.future = None
+
+    def select(self, newest_first):
+        """Return the requested states, oldest first.
+
+        The states of every request are the newest states of the entity, so
+        the states loaded for all requests of an entity hold them as prefix.
+        """
+        states = deque()
+        for state in newest_first:
+            if self.max_rows is not None and len(states) >= self.max_rows:
+                break
+            if self.cutoff is not None and state.last_updated < self.cutoff:
+                if self.include_start_state:
+                    states.appendleft(state)
+                break
+            states.appendleft(state)
+        return states
+
+
+class HistoryPreloader:
+    """Coalesce history requests into windowed queries."""
+
+    def __init__(self, hass):
+        """Initialize the preloader."""
+        self.hass = hass
+        self._pending = []
+        self._windowed = True
+
+    @callback
+    def async_request(self, request):
+        """Queue a request and return a future for its states."""
+        request.future = self.hass.loop.create_future()
+        if not self._pending:
+            self.hass.loop.call_soon(self._async_flush)
+        self._pending.append(request)
+        return request.future
+
+    @callback
+    def _async_flush(self):
+        """Load the queued requests in batches of entities.
+
+        Requests for state changes only are loaded in batches of their own,
+        as their rows are counted without the attribute-only updates.
+        """
+        by_kind = {False: {}, True: {}}
+        for request in self._pending:
+            by_entity = by_kind[request.state_changes_only]
+            by_entity.setdefault(request.entity_id, []).append(request)
+        self._pending = []
+
+        for state_changes_only, by_entity in by_kind.items():
+            entity_ids = list(by_entity)
+            for index in range(0, len(entity_ids), PRELOAD_BATCH_SIZE):
+                batch = {
+                    entity_id: by_entity[entity_id]
+                    for entity_id in entity_ids[index : index + PRELOAD_BATCH_SIZE]
+                }
+                self.hass.async_create_task(
+                    self._async_load_batch(batch, state_changes_only)
+                )
+
+    async def _async_load_batch(self, batch, state_changes_only):
+        """Load a batch in the executor and resolve its requests."""
+        try:
+            newest_first = await self.hass.async_add_executor_job(
+                self._load_batch, batch, state_changes_only
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            for requests in batch.values():
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(err)
+            return
+
+        for entity_id, requests in batch.items():
+            states = newest_first.get(entity_id, ())
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_result(request.select(states))
+
+    def _load_batch(self, batch, state_changes_only):
+        """Return the newest states of each entity of the batch."""
+        if self._windowed:
+            try:
+                return _query_windowed(self.hass, batch, state_changes_only)
+            except SQLAlchemyError as err:
+                # Window functions need SQLite 3.25 or MySQL 8
+                _LOGGER.debug("Windowed history query failed: %s", err)
+                self._windowed = False
+
+        return {
+            entity_id: _query_entity(
+                self.hass, entity_id, requests, state_changes_only
+            )
+            for entity_id, requests in batch.items()
+        }
+
+
+def _query_windowed(hass, batch, state_changes_only=False):
+    """Load the states of all entities of the batch with one query."""
+    newest_first = States.last_updated.desc()
+    row_number = (
+        func.row_number()
+        .over(partition_by=States.entity_id, order_by=newest_first)
+        .label("row_number")
+    )
+    newer_updated = (
+        func.lag(States.last_updated, type_=States.last_updated.type)
+        .over(partition_by=States.entity_id, order_by=newest_first)
+        .label("newer_updated")
+    )
+
+    entity_filters = [
+        _entity_filter(entity_id, requests, state_changes_only)
+        for entity_id, requests in batch.items()
+    ]
+    row_filters = []
+
+    with session_scope(hass=hass) as session:
+        window = (
+            session.query(States.state_id, row_number, newer_updated)
+            .filter(or_(*entity_filters))
+            .subquery()
+        )
+
+        for entity_id, requests in batch.items():
+            row_filters.append(
+                and_(
+                    States.entity_id == entity_id,
+                    or_(*(_row_filter(window, request) for request in requests)),
+                )
+            )
+
+        query = (
+            session.query(States)
+            .join(window, States.state_id == window.c.state_id)
+            .filter(or_(*row_filters))
+            .order_by(States.entity_id, newest_first)
+        )
+
+        result = {}
+        for row in query:
+            state = row.to_native()
+            if state is not None:
+                result.setdefault(state.entity_id, []).append(state)
+
+    return result
+
+
+def _query_entity(hass, entity_id, requests, state_changes_only=False):
+    """Load the states of a single entity."""
+    with session_scope(hass=hass) as session:
+        query = session.query(States).filter(
+            _entity_filter(entity_id, requests, state_changes_only)
+        )
+        query = query.order_by(States.last_updated.desc())
+        if all(request.max_rows is not None for request in requests):
+            query = query.limit(max(request.max_rows for request in requests))
+        return execute(query) or []
+
+
+def _entity_filter(entity_id, requests, state_changes_only=False):
+    """Return the condition selecting the states the requests of an entity need.
+
+    These are the states since the oldest cutoff and the start state of
+    every request asking for it. With state_changes_only the states that
+    only updated the attributes are left out.
+    """
+    condition = States.entity_id == entity_id
+    if state_changes_only:
+        condition = and_(condition, States.last_changed == States.last_updated)
+    cutoffs = []
+    for request in requests:
+        if request.cutoff is None:
+            return condition
+        cutoffs.append(request.cutoff)
+
+    in_period = States.last_updated >= min(cutoffs)
+    for cutoff in {
+        request.cutoff for request in requests if request.include_start_state
+    }:
+        in_period |= States.state_id == _start_state_id(
+            entity_id, cutoff, state_changes_only
+        )
+    return and_(condition, in_period)
+
+
+def _start_state_id(entity_id, cutoff, state_changes_only):
+    """Return a subquery for the id of the last state before cutoff."""
+    older = aliased(States)
+    condition = and_(older.entity_id == entity_id, older.last_updated < cutoff)
+    if state_changes_only:
+        condition = and_(condition, older.last_changed == older.last_updated)
+    return (
+        select([older.state_id])
+        .where(condition)
+        .order_by(older.last_updated.desc())
+        .limit(1)
+        .as_scalar()
+    )
+
+
+def _row_filter(window, request):
+    """Return the condition selecting the states of a request."""
+    conditions = []
+    if request.max_rows is not None:
+        conditions.append(window.c.row_number <= request.max_rows)
+    if request.cutoff is not None:
+        in_period = States.last_updated >= request.cutoff
+        if request.include_start_state:
+            in_period |= window.c.newer_updated.is_(None) | (
+                window.c.newer_updated >= request.cutoff
+            )
+        conditions.append(in_period)
+    return and_(*conditions) if conditions else true()
+
+
+@callback
+def async_get_preloader(hass):
+    """Return the history preloader."""
+    preloader = hass.data.get(DATA_PRELOADER)
+    if preloader is None:
+        preloader = hass.data[DATA_PRELOADER] = HistoryPreloader(hass)
+    return preloader
+
+
+async def async_preload_history(
+    hass,
+    entity_id,
+    max_rows=None,
+    max_age=None,
+    start_time=None,
+    include_start_state=False,
+    state_changes_only=False,
+):
+    """Return the recent states of an entity in a deque, oldest first.
+
+    At most max_rows of the newest states are returned, not older than
+    max_age or start_time. With include_start_state the last state before
+    that time is returned first. With state_changes_only the states that
+    only updated the attributes are skipped.
+    """
+    cutoff = None
+    if start_time is not None:
+        cutoff = dt_util.as_utc(start_time)
+    elif max_age is not None:
+        cutoff = dt_util.utcnow() - max_age
+    request = PreloadRequest(
+        entity_id, max_rows, cutoff, include_start_state, state_changes_only
+    )
+    return await async_get_preloader(hass).async_request(request)
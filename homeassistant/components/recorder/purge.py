@@ -1,37 +1,113 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
+from sqlalchemy import exists
 from sqlalchemy.exc import SQLAlchemyError
 
+from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES
 import homeassistant.util.dt as dt_util
-from .models import Events, States
+from .models import Events, StateAttributes, States
 
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of rows deleted before yielding back to the recorder
+PURGE_CHUNK_SIZE = 1000
+
+
+class PurgeProgress:
+    """Progress of a purge that is executed in chunks."""
+
+    def __init__(self):
+        """Initialize the progress."""
+        self.started = None
+        self.deleted_states = 0
+        self.deleted_events = 0
+        self.deleted_attributes = 0
+
+    @property
+    def deleted_rows(self):
+        """Return the number of rows deleted so far."""
+        return self.deleted_states + self.deleted_events
+
+    @property
+    def rows_per_second(self):
+        """Return the number of rows deleted per second."""
+        if self.started is None:
+            return 0
+        elapsed = time.monotonic() - self.started
+        if elapsed <= 0:
+            return 0
+        return self.deleted_rows / elapsed
+
+
+def purge_old_data(instance, purge_days, repack, progress=None):
+    """Purge a chunk of events and states older than purge_days ago.
+
+    At most PURGE_CHUNK_SIZE rows are deleted per call so the database is
+    not locked for long. Returns True when the purge is finished and False
+    if it should be called again to delete the next chunk.
+    """
+    if progress is None:
+        progress = PurgeProgress()
+    if progress.started is None:
+        progress.started = time.monotonic()
 
-def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
-                .filter((States.last_updated < purge_before))
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
-
-            deleted_rows = (
-                session.query(Events)
-                .filter((Events.time_fired < purge_before))
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            budget = PURGE_CHUNK_SIZE
+
+            for condition in _states_conditions(instance.retention, purge_before):
+                deleted_rows, attributes_ids = _purge_chunk(
+                    session,
+                    States,
+                    States.state_id,
+                    condition,
+                    budget,
+                    States.attributes_id,
+                )
+                progress.deleted_attributes += _purge_attributes(
+                    session, attributes_ids
+                )
+                progress.deleted_states += deleted_rows
+                budget -= deleted_rows
+                if not budget:
+                    break
+
+            if budget:
+                deleted_rows, _ = _purge_chunk(
+                    session,
+                    Events,
+                    Events.event_id,
+                    _events_condition(instance.retention, purge_before),
+                    budget,
+                )
+                progress.deleted_events += deleted_rows
+                budget -= deleted_rows
+
+        _LOGGER.debug(
+            "Deleted %s states and %s events so far (%.0f rows/s)",
+            progress.deleted_states,
+            progress.deleted_events,
+            progress.rows_per_second,
+        )
+
+        if not budget:
+            return False
+
+        _LOGGER.info(
+            "Purged %s states and %s events in %.1f seconds (%.0f rows/s)",
+            progress.deleted_states,
+            progress.deleted_events,
+            time.monotonic() - progress.started,
+            progress.rows_per_second,
+        )
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +116,96 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+
+    return True
+
+
+def _purge_chunk(session, table, id_column, condition, limit, related=None):
+    """Delete the oldest rows matching condition, at most limit of them.
+
+    The matching ids are looked up first so the delete only has to scan
+    the id range they span. Returns the number of deleted rows and the set
+    of values the deleted rows had in the related column.
+    """
+    columns = [id_column] if related is None else [id_column, related]
+    rows = (
+        session.query(*columns)
+        .filter(condition)
+        .order_by(id_column)
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return 0, set()
+
+    deleted_rows = (
+        session.query(table)
+        .filter((id_column >= rows[0][0]) & (id_column <= rows[-1][0]) & condition)
+        .delete(synchronize_session=False)
+    )
+    if related is None:
+        return deleted_rows, set()
+    return deleted_rows, {row[1] for row in rows if row[1] is not None}
+
+
+def _purge_attributes(session, attributes_ids):
+    """Delete the attributes of purged states no remaining state uses.
+
+    Returns the number of deleted attribute rows.
+    """
+    if not attributes_ids:
+        return 0
+
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(
+            StateAttributes.attributes_id.in_(attributes_ids)
+            & ~exists().where(States.attributes_id == StateAttributes.attributes_id)
+        )
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+    return deleted_rows
+
+
+def _states_conditions(retention, purge_before):
+    """Return the conditions selecting states to purge.
+
+    Domains and entities with their own retention are excluded from the
+    default condition and get a condition with their own cut-off.
+    """
+    domains = retention.get(CONF_DOMAINS, {})
+    entities = retention.get(CONF_ENTITIES, {})
+    now = dt_util.utcnow()
+
+    default = States.last_updated < purge_before
+    if domains:
+        default &= ~States.domain.in_(domains)
+    if entities:
+        default &= ~States.entity_id.in_(entities)
+    conditions = [default]
+
+    for domain, keep_days in domains.items():
+        condition = (States.domain == domain) & (
+            States.last_updated < now - timedelta(days=keep_days)
+        )
+        if entities:
+            condition &= ~States.entity_id.in_(entities)
+        conditions.append(condition)
+
+    for entity_id, keep_days in entities.items():
+        conditions.append(
+            (States.entity_id == entity_id)
+            & (States.last_updated < now - timedelta(days=keep_days))
+        )
+
+    return conditions
+
+
+def _events_condition(retention, purge_before):
+    """Return the condition selecting events to purge."""
+    condition = Events.time_fired < purge_before
+    if retention.get(CONF_DOMAINS) or retention.get(CONF_ENTITIES):
+        # Keep the events of states that are retained for longer
+        condition &= ~exists().where(States.event_id == Events.event_id)
+    return condition
@@ -1,7 +1,8 @@
 """Support for statistics for sensor values."""
-import logging
-import statistics
+from bisect import bisect_left, insort
 from collections import deque
+import logging
+import math
 
 import voluptuous as vol
 
@@ -19,7 +20,7 @@ from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.util import dt as dt_util
-from homeassistant.components.recorder.util import session_scope, execute
+from homeassistant.components.recorder import preload
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,6 +76,118 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     return True
 
 
+class SlidingWindow:
+    """Running aggregates over a window of numbers.
+
+    Values are added at one end and removed from the other. The mean and
+    variance are kept up to date with Welford's algorithm and a sorted copy
+    of the values is kept for the order statistics, so the median and any
+    quantile are a lookup by index. Adding or removing a value is a binary
+    search and a single memmove of the list, which beats a pure Python
+    order statistic tree for any window the sensor keeps in memory.
+    """
+
+    def __init__(self):
+        """Initialize an empty window."""
+        self._sorted = []
+        self._total = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._removed = 0
+
+    def __len__(self):
+        """Return the number of values in the window."""
+        return len(self._sorted)
+
+    def add(self, value):
+        """Add a value to the window."""
+        insort(self._sorted, value)
+        self._total += value
+        delta = value - self._mean
+        self._mean += delta / len(self._sorted)
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, value):
+        """Remove a value that was added to the window before."""
+        del self._sorted[bisect_left(self._sorted, value)]
+        count = len(self._sorted)
+        if not count:
+            self.clear()
+            return
+
+        # Removing values accumulates rounding errors, so recompute the sums
+        # once every window length of removals.
+        self._removed += 1
+        if self._removed >= count:
+            self._resync()
+            return
+
+        self._total -= value
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+    def clear(self):
+        """Remove all values."""
+        self._sorted.clear()
+        self._total = self._mean = self._m2 = 0.0
+        self._removed = 0
+
+    def _resync(self):
+        """Recompute the running sums from the values."""
+        self._total = math.fsum(self._sorted)
+        self._mean = self._total / len(self._sorted)
+        self._m2 = math.fsum((value - self._mean) ** 2 for value in self._sorted)
+        self._removed = 0
+
+    @property
+    def total(self):
+        """Return the sum of the values."""
+        return self._total
+
+    @property
+    def mean(self):
+        """Return the arithmetic mean of the values."""
+        return self._mean
+
+    @property
+    def variance(self):
+        """Return the sample variance of the values."""
+        return self._m2 / (len(self._sorted) - 1)
+
+    @property
+    def stdev(self):
+        """Return the sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self):
+        """Return the smallest value."""
+        return self._sorted[0]
+
+    @property
+    def max(self):
+        """Return the largest value."""
+        return self._sorted[-1]
+
+    @property
+    def median(self):
+        """Return the median, the mean of the middle values for even counts."""
+        middle, odd = divmod(len(self._sorted), 2)
+        if odd:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+    def quantile(self, fraction):
+        """Return the quantile at fraction, interpolating between values."""
+        position = fraction * (len(self._sorted) - 1)
+        lower = int(position)
+        if lower == position:
+            return self._sorted[lower]
+        low, high = self._sorted[lower], self._sorted[lower + 1]
+        return low + (high - low) * (position - lower)
+
+
 class StatisticsSensor(Entity):
     """Representation of a Statistics sensor."""
 
@@ -89,6 +202,7 @@ class StatisticsSensor(Entity):
         self._unit_of_measurement = None
         self.states = deque(maxlen=self._sampling_size)
         self.ages = deque(maxlen=self._sampling_size)
+        self._window = SlidingWindow()
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -132,19 +246,28 @@ class StatisticsSensor(Entity):
         if new_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
             return
 
-        try:
-            if self.is_binary:
-                self.states.append(new_state.state)
-            else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
-        except ValueError:
-            _LOGGER.error(
-                "%s: parsing error, expected number and received %s",
-                self.entity_id,
-                new_state.state,
-            )
+        if self.is_binary:
+            value = new_state.state
+        else:
+            try:
+                value = float(new_state.state)
+            except ValueError:
+                value = None
+
+            if value is None or not math.isfinite(value):
+                _LOGGER.error(
+                    "%s: parsing error, expected number and received %s",
+                    self.entity_id,
+                    new_state.state,
+                )
+                return
+
+            if len(self.states) == self._sampling_size:
+                self._window.remove(self.states[0])
+            self._window.add(value)
+
+        self.states.append(value)
+        self.ages.append(new_state.last_updated)
 
     @property
     def name(self):
@@ -196,22 +319,18 @@ class StatisticsSensor(Entity):
         """Remove states which are older than self._max_age."""
         now = dt_util.utcnow()
 
-        _LOGGER.debug(
-            "%s: purging records older then %s(%s)",
-            self.entity_id,
-            dt_util.as_local(now - self._max_age),
-            self._max_age,
-        )
-
         while self.ages and (now - self.ages[0]) > self._max_age:
-            _LOGGER.debug(
-                "%s: purging record with datetime %s(%s)",
-                self.entity_id,
-                dt_util.as_local(self.ages[0]),
-                (now - self.ages[0]),
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "%s: purging record with datetime %s(%s)",
+                    self.entity_id,
+                    dt_util.as_local(self.ages[0]),
+                    (now - self.ages[0]),
+                )
             self.ages.popleft()
-            self.states.popleft()
+            value = self.states.popleft()
+            if not self.is_binary:
+                self._window.remove(value)
 
     async def async_update(self):
         """Get the latest data and updates the states."""
@@ -222,24 +341,26 @@ class StatisticsSensor(Entity):
         self.count = len(self.states)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            window = self._window
+
+            if window:  # require only one data point
+                self.mean = round(window.mean, self._precision)
+                self.median = round(window.median, self._precision)
+            else:
+                _LOGGER.debug("%s: no data points", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if len(window) > 1:  # require at least two data points
+                self.stdev = round(window.stdev, self._precision)
+                self.variance = round(window.variance, self._precision)
+            else:
+                _LOGGER.debug("%s: less than two data points", self.entity_id)
                 self.stdev = self.variance = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(window.total, self._precision)
+                self.min = round(window.min, self._precision)
+                self.max = round(window.max, self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -268,39 +389,19 @@ class StatisticsSensor(Entity):
     async def _async_initialize_from_database(self):
         """Initialize the list of states from the database.
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
-
-        If MaxAge is provided then query will restrict to entries younger then
-        current datetime - MaxAge.
+        The last self._sampling_size states are loaded. If MaxAge is provided
+        then only states younger than current datetime - MaxAge are loaded.
         """
-        from homeassistant.components.recorder.models import States
-
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
-        with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._entity_id.lower()
-            )
-
-            if self._max_age is not None:
-                records_older_then = dt_util.utcnow() - self._max_age
-                _LOGGER.debug(
-                    "%s: retrieve records not older then %s",
-                    self.entity_id,
-                    records_older_then,
-                )
-                query = query.filter(States.last_updated >= records_older_then)
-            else:
-                _LOGGER.debug("%s: retrieving all records.", self.entity_id)
-
-            query = query.order_by(States.last_updated.desc()).limit(
-                self._sampling_size
-            )
-            states = execute(query)
+        states = await preload.async_preload_history(
+            self.hass,
+            self._entity_id,
+            max_rows=self._sampling_size,
+            max_age=self._max_age,
+        )
 
-        for state in reversed(states):
+        for state in states:
             self._add_state_to_queue(state)
 
         self.async_schedule_update_ha_state(True)
@@ -19,13 +19,16 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_DEVICE_CLASS,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
 )
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change, async_track_same_state
-from . import extract_entities, initialise_templates
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change,
+    async_track_template_result,
+)
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -78,13 +81,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "binary sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             BinarySensorTemplate(
@@ -146,6 +143,8 @@ class BinarySensorTemplate(BinarySensorDevice):
         self._available = True
         self._attribute_templates = attribute_templates
         self._attributes = {}
+        self._delay_state = None
+        self._delay_cancel = None
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -155,14 +154,28 @@ class BinarySensorTemplate(BinarySensorDevice):
             """Handle the target device state changes."""
             self.async_check_state()
 
+        @callback
+        def template_bsensor_result_listener(event, last_result, result):
+            """Handle template result changes."""
+            self.async_check_state()
+
         @callback
         def template_bsensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_bsensor_state_listener
+            if self._entities is not None:
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_bsensor_state_listener
+                    )
                 )
+            else:
+                # Follow the states each template read during its last render
+                for template in self._async_templates():
+                    self.async_on_remove(
+                        async_track_template_result(
+                            self.hass, template, template_bsensor_result_listener
+                        ).async_remove
+                    )
 
             self.async_check_state()
 
@@ -170,6 +183,23 @@ class BinarySensorTemplate(BinarySensorDevice):
             EVENT_HOMEASSISTANT_START, template_bsensor_startup
         )
 
+    async def async_will_remove_from_hass(self):
+        """Cancel a pending delayed state change."""
+        self._async_cancel_delay()
+
+    @callback
+    def _async_templates(self):
+        """Return all templates of the binary sensor."""
+        templates = [
+            self._template,
+            self._icon_template,
+            self._entity_picture_template,
+            self._availability_template,
+        ]
+        if self._attribute_templates is not None:
+            templates.extend(self._attribute_templates.values())
+        return [template for template in templates if template is not None]
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -273,18 +303,40 @@ class BinarySensorTemplate(BinarySensorDevice):
 
         return state
 
+    @callback
+    def _async_cancel_delay(self):
+        """Cancel a pending delayed state change."""
+        if self._delay_cancel is not None:
+            self._delay_cancel()
+            self._delay_cancel = None
+            self._delay_state = None
+
     @callback
     def async_check_state(self):
         """Update the state from the template."""
         state = self._async_render()
 
-        # return if the state don't change or is invalid
-        if state is None or state == self.state:
+        # return if the state is invalid
+        if state is None:
+            return
+
+        # return if the state is already pending
+        if self._delay_cancel is not None and state == self._delay_state:
+            return
+
+        # the state changed back or changed to another state than the pending
+        self._async_cancel_delay()
+
+        # only the attributes can have changed
+        if state == self._state:
+            self.async_schedule_update_ha_state()
             return
 
         @callback
-        def set_state():
+        def set_state(*_):
             """Set state of template binary sensor."""
+            self._delay_cancel = None
+            self._delay_state = None
             self._state = state
             self.async_schedule_update_ha_state()
 
@@ -294,12 +346,9 @@ class BinarySensorTemplate(BinarySensorDevice):
             return
 
         period = self._delay_on if state else self._delay_off
-        async_track_same_state(
-            self.hass,
-            period,
-            set_state,
-            entity_ids=self._entities,
-            async_check_same_func=lambda *args: self._async_render() == state,
+        self._delay_state = state
+        self._delay_cancel = async_call_later(
+            self.hass, period.total_seconds(), set_state
         )
 
     async def async_update(self):
@@ -20,15 +20,17 @@ from homeassistant.const import (
     CONF_SENSORS,
     EVENT_HOMEASSISTANT_START,
     CONF_FRIENDLY_NAME_TEMPLATE,
-    MATCH_ALL,
     CONF_DEVICE_CLASS,
 )
 
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
-from . import extract_entities, initialise_templates
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_template_result,
+)
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
@@ -81,13 +83,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             SensorTemplate(
@@ -158,14 +154,28 @@ class SensorTemplate(Entity):
             """Handle device state changes."""
             self.async_schedule_update_ha_state(True)
 
+        @callback
+        def template_sensor_result_listener(event, last_result, result):
+            """Handle template result changes."""
+            self.async_schedule_update_ha_state(True)
+
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_sensor_state_listener
+            if self._entities is not None:
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_sensor_state_listener
+                    )
                 )
+            else:
+                # Follow the states each template read during its last render
+                for template in self._async_templates():
+                    self.async_on_remove(
+                        async_track_template_result(
+                            self.hass, template, template_sensor_result_listener
+                        ).async_remove
+                    )
 
             self.async_schedule_update_ha_state(True)
 
@@ -173,6 +183,19 @@ class SensorTemplate(Entity):
             EVENT_HOMEASSISTANT_START, template_sensor_startup
         )
 
+    @callback
+    def _async_templates(self):
+        """Return all templates of the sensor."""
+        templates = [
+            self._template,
+            self._icon_template,
+            self._entity_picture_template,
+            self._friendly_name_template,
+            self._availability_template,
+        ]
+        templates.extend(self._attribute_templates.values())
+        return [template for template in templates if template is not None]
+
     @property
     def name(self):
         """Return the name of the sensor."""
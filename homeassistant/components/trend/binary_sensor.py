@@ -125,6 +125,12 @@ class SensorTrend(BinarySensorDevice):
         self._state = None
         self.samples = deque(maxlen=max_samples)
 
+        # Running sums of the samples for the least squares fit, with the
+        # timestamps relative to _origin to keep their squares small
+        self._origin = None
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._removed = 0
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -170,8 +176,7 @@ class SensorTrend(BinarySensorDevice):
                 else:
                     state = new_state.state
                 if state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-                    sample = (new_state.last_updated.timestamp(), float(state))
-                    self.samples.append(sample)
+                    self._add_sample(new_state.last_updated.timestamp(), float(state))
                     self.async_schedule_update_ha_state(True)
             except (ValueError, TypeError) as ex:
                 _LOGGER.error(ex)
@@ -186,13 +191,13 @@ class SensorTrend(BinarySensorDevice):
         if self._sample_duration > 0:
             cutoff = utcnow().timestamp() - self._sample_duration
             while self.samples and self.samples[0][0] < cutoff:
-                self.samples.popleft()
+                self._remove_sample()
 
         if len(self.samples) < 2:
             return
 
         # Calculate gradient of linear trend
-        await self.hass.async_add_job(self._calculate_gradient)
+        self._calculate_gradient()
 
         # Update state
         self._state = (
@@ -203,12 +208,63 @@ class SensorTrend(BinarySensorDevice):
         if self._invert:
             self._state = not self._state
 
+    def _add_sample(self, timestamp, value):
+        """Append a sample and add it to the running sums."""
+        if len(self.samples) == self.samples.maxlen:
+            self._remove_sample()
+        if self._origin is None:
+            self._origin = timestamp
+
+        self.samples.append((timestamp, value))
+        offset = timestamp - self._origin
+        self._sum_t += offset
+        self._sum_v += value
+        self._sum_tt += offset * offset
+        self._sum_tv += offset * value
+
+    def _remove_sample(self):
+        """Remove the oldest sample and subtract it from the running sums."""
+        timestamp, value = self.samples.popleft()
+        if not self.samples:
+            self._origin = None
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+            self._removed = 0
+            return
+
+        offset = timestamp - self._origin
+        self._sum_t -= offset
+        self._sum_v -= value
+        self._sum_tt -= offset * offset
+        self._sum_tv -= offset * value
+        self._removed += 1
+
+    def _recenter(self):
+        """Recompute the running sums relative to the oldest sample."""
+        samples = np.array(self.samples)
+        offsets = samples[:, 0] - samples[0, 0]
+        values = samples[:, 1]
+        self._origin = self.samples[0][0]
+        self._sum_t = float(offsets.sum())
+        self._sum_v = float(values.sum())
+        self._sum_tt = float(offsets.dot(offsets))
+        self._sum_tv = float(offsets.dot(values))
+        self._removed = 0
+
     def _calculate_gradient(self):
         """Compute the linear trend gradient of the current samples.
 
-        This need run inside executor.
+        Once the window has been replaced by new samples the sums are
+        recomputed, so the offsets stay small and rounding errors of the
+        subtractions do not accumulate.
         """
-        timestamps = np.array([t for t, _ in self.samples])
-        values = np.array([s for _, s in self.samples])
-        coeffs = np.polyfit(timestamps, values, 1)
-        self._gradient = coeffs[0]
+        count = len(self.samples)
+        if self._removed >= count:
+            self._recenter()
+
+        variance_t = self._sum_tt - self._sum_t * self._sum_t / count
+        if variance_t <= 0:
+            self._gradient = 0.0
+            return
+
+        covariance = self._sum_tv - self._sum_t * self._sum_v / count
+        self._gradient = covariance / variance_t
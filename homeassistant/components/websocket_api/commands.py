@@ -10,6 +10,7 @@ from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.event import async_track_state_change
 
 from . import const, decorators, messages
+from .subscription import async_get_event_hub
 
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -52,17 +53,28 @@ def handle_subscribe_events(hass, connection, msg):
     if event_type not in SUBSCRIBE_WHITELIST and not connection.user.is_admin:
         raise Unauthorized
 
+    @callback
+    def send_event(event, **kwargs):
+        """Send an event, encoded once for all connections."""
+        try:
+            message = messages.cached_event_message(msg["id"], event)
+        except (ValueError, TypeError):
+            # Let the writer report the event that can't be serialized
+            message = messages.event_message(msg["id"], event.as_dict())
+
+        connection.send_message(message, **kwargs)
+
     if event_type == EVENT_STATE_CHANGED:
 
         @callback
         def forward_events(event):
             """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
-            ):
+            entity_id = event.data["entity_id"]
+            if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            # A slow client only gets the latest change of each entity
+            send_event(event, coalesce_key=(msg["id"], entity_id))
 
     else:
 
@@ -72,9 +84,9 @@ def handle_subscribe_events(hass, connection, msg):
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
+            send_event(event)
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+    connection.subscriptions[msg["id"]] = async_get_event_hub(hass).async_subscribe(
         event_type, forward_events
     )
 
@@ -177,7 +189,13 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    try:
+        message = messages.cached_states_result_message(msg["id"], states)
+    except (ValueError, TypeError):
+        # Let the writer report the state that can't be serialized
+        message = messages.result_message(msg["id"], states)
+
+    connection.send_message(message)
 
 
 @decorators.async_response
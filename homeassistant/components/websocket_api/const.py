@@ -8,6 +8,9 @@ from homeassistant.helpers.json import JSONEncoder
 DOMAIN = "websocket_api"
 URL = "/api/websocket"
 MAX_PENDING_MSG = 512
+# Above this many pending messages, state changes of the same entity are
+# collapsed into the latest one until the queue drained to half of it
+PENDING_MSG_PEAK = 256
 
 ERR_ID_REUSE = "id_reuse"
 ERR_INVALID_FORMAT = "invalid_format"
@@ -32,4 +35,10 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = DOMAIN + ".connections"
 
+# Data used to store how many messages were coalesced and dropped
+DATA_MESSAGE_STATS = DOMAIN + ".message_stats"
+
+# Data used to store the event subscriptions shared by all connections
+DATA_EVENT_HUB = DOMAIN + ".event_hub"
+
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
@@ -1,8 +1,10 @@
 """View to accept incoming websocket connection."""
 import asyncio
+from collections import OrderedDict
 from contextlib import suppress
+from itertools import count
 import logging
-from typing import Optional
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 from aiohttp import web, WSMsgType
 import async_timeout
@@ -13,12 +15,14 @@ from homeassistant.components.http import HomeAssistantView
 
 from .const import (
     MAX_PENDING_MSG,
+    PENDING_MSG_PEAK,
     CANCELLATION_ERRORS,
     URL,
     ERR_UNKNOWN_ERROR,
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
     DATA_CONNECTIONS,
+    DATA_MESSAGE_STATS,
     JSON_DUMP,
 )
 from .auth import AuthPhase, auth_required_message
@@ -49,7 +53,16 @@ class WebSocketHandler:
         self.hass = hass
         self.request = request
         self.wsock: Optional[web.WebSocketResponse] = None
-        self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
+        # Pending (coalesce key, message) entries in the order they are sent
+        self._to_write: Dict[int, Tuple[Optional[Hashable], Any]] = OrderedDict()
+        self._to_write_ready = asyncio.Event()
+        self._entry_ids = count()
+        # Entry id of the latest pending message of each coalesce key
+        self._pending_keys: Dict[Hashable, int] = {}
+        self._coalescing = False
+        self._dropped_client = False
+        self.coalesced = 0
+        self.dropped = 0
         self._handle_task = None
         self._writer_task = None
         self._logger = logging.getLogger("{}.connection.{}".format(__name__, id(self)))
@@ -59,7 +72,12 @@ class WebSocketHandler:
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
+                if not self._to_write:
+                    self._to_write_ready.clear()
+                    await self._to_write_ready.wait()
+                    continue
+
+                message = self._pop_message()
                 if message is None:
                     break
 
@@ -84,21 +102,88 @@ class WebSocketHandler:
 
                 await self.wsock.send_str(dumped)
 
+    def _pop_message(self):
+        """Return the oldest pending message."""
+        entry_id = next(iter(self._to_write))
+        key, message = self._to_write.pop(entry_id)
+        if key is not None and self._pending_keys.get(key) == entry_id:
+            del self._pending_keys[key]
+
+        if self._coalescing and len(self._to_write) <= PENDING_MSG_PEAK // 2:
+            self._coalescing = False
+
+        return message
+
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, coalesce_key=None):
         """Send a message to the client.
 
-        Closes connection if the client is not reading the messages.
+        Messages with a coalesce_key replace a pending message with the same
+        key once the client fell behind, the older message is dropped and the
+        new one is queued last. Closes connection if the client is not
+        reading the messages.
 
         Async friendly.
         """
-        try:
-            self._to_write.put_nowait(message)
-        except asyncio.QueueFull:
+        if not self._coalescing and len(self._to_write) >= PENDING_MSG_PEAK:
+            self._coalescing = True
+            self._coalesce()
+
+        if self._dropped_client:
+            self._count("dropped", 1)
+            return
+
+        if self._coalescing and coalesce_key is not None:
+            entry_id = self._pending_keys.pop(coalesce_key, None)
+            if entry_id is not None:
+                del self._to_write[entry_id]
+                self._count("coalesced", 1)
+
+        if len(self._to_write) >= MAX_PENDING_MSG:
+            # Coalescing could not keep up, the pending messages are lost
+            self._dropped_client = True
             self._logger.error(
                 "Client exceeded max pending messages [2]: %s", MAX_PENDING_MSG
             )
+            self._count("dropped", len(self._to_write) + 1)
+            self._to_write.clear()
+            self._pending_keys.clear()
             self._cancel()
+            return
+
+        entry_id = next(self._entry_ids)
+        self._to_write[entry_id] = (coalesce_key, message)
+        if coalesce_key is not None:
+            self._pending_keys[coalesce_key] = entry_id
+        self._to_write_ready.set()
+
+    @callback
+    def _coalesce(self):
+        """Drop pending messages superseded by a later one with the same key."""
+        latest = {}
+        for entry_id, (key, _) in self._to_write.items():
+            if key is not None:
+                latest[key] = entry_id
+
+        pending = OrderedDict(
+            (entry_id, entry)
+            for entry_id, entry in self._to_write.items()
+            if entry[0] is None or latest[entry[0]] == entry_id
+        )
+        self._count("coalesced", len(self._to_write) - len(pending))
+        self._to_write = pending
+        self._pending_keys = latest
+
+    @callback
+    def _count(self, counter, amount):
+        """Count coalesced or dropped messages."""
+        if not amount:
+            return
+        setattr(self, counter, getattr(self, counter) + amount)
+        stats = self.hass.data.setdefault(
+            DATA_MESSAGE_STATS, {"coalesced": 0, "dropped": 0}
+        )
+        stats[counter] += amount
 
     @callback
     def _cancel(self):
@@ -203,12 +288,13 @@ class WebSocketHandler:
             if connection is not None:
                 connection.async_close()
 
-            try:
-                self._to_write.put_nowait(None)
+            if self._dropped_client:
+                self._writer_task.cancel()
+            else:
+                self._to_write[next(self._entry_ids)] = (None, None)
+                self._to_write_ready.set()
                 # Make sure all error messages are written before closing
                 await self._writer_task
-            except asyncio.QueueFull:
-                self._writer_task.cancel()
 
             await wsock.close()
 
@@ -3,6 +3,7 @@
 import voluptuous as vol
 
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import cached_state_json
 
 from . import const
 
@@ -37,3 +38,25 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden, event):
+    """Return an event message as JSON, encoding the event only once.
+
+    The encoded event is cached on the event, so every subscription it is
+    forwarded to only has to add its message id.
+    """
+    # pylint: disable=protected-access
+    if event._json is None:
+        event._json = const.JSON_DUMP(event.as_dict())
+
+    return '{"id": %d, "type": "event", "event": %s}' % (iden, event._json)
+
+
+def cached_states_result_message(iden, states):
+    """Return a result message of states as JSON, reusing encoded states."""
+    return '{"id": %d, "type": "%s", "success": true, "result": [%s]}' % (
+        iden,
+        const.TYPE_RESULT,
+        ", ".join(cached_state_json(state) for state in states),
+    )
@@ -1,4 +1,5 @@
 """Entity to track connections to websocket API."""
+from datetime import timedelta
 
 from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
@@ -7,8 +8,15 @@ from .const import (
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
     DATA_CONNECTIONS,
+    DATA_MESSAGE_STATS,
 )
 
+ATTR_COALESCED_MESSAGES = "coalesced_messages"
+ATTR_DROPPED_MESSAGES = "dropped_messages"
+
+# Interval of updating the coalesced and dropped messages
+SCAN_INTERVAL = timedelta(seconds=30)
+
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 
@@ -47,6 +55,15 @@ class APICount(Entity):
         """Return current API count."""
         return self.count
 
+    @property
+    def device_state_attributes(self):
+        """Return the messages coalesced and dropped for slow clients."""
+        stats = self.hass.data.get(DATA_MESSAGE_STATS, {})
+        return {
+            ATTR_COALESCED_MESSAGES: stats.get("coalesced", 0),
+            ATTR_DROPPED_MESSAGES: stats.get("dropped", 0),
+        }
+
     @property
     def unit_of_measurement(self):
         """Return the unit of measurement."""
@@ -0,0 +1,73 @@
+"""Event subscriptions shared by all websocket connections."""
+import logging
+from typing import Callable, Dict, List
+
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.helpers.typing import HomeAssistantType
+
+from . import const
+
+_LOGGER = logging.getLogger(__name__)
+
+# mypy: allow-untyped-calls
+
+
+class EventSubscriptionHub:
+    """Forward events to the subscriptions of all websocket connections.
+
+    Each event type has a single listener on the event bus, no matter how
+    many connections subscribed to it.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self._subscriptions: Dict[str, List[Callable[[Event], None]]] = {}
+        self._unsub_listeners: Dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_subscribe(
+        self, event_type: str, forward: Callable[[Event], None]
+    ) -> CALLBACK_TYPE:
+        """Subscribe forward to events of event_type."""
+        if event_type in self._subscriptions:
+            subscriptions = self._subscriptions[event_type]
+        else:
+            subscriptions = self._subscriptions[event_type] = []
+
+            @callback
+            def forward_events(event: Event) -> None:
+                """Forward an event to all subscriptions."""
+                # Copy, subscriptions can be removed while we loop
+                for subscription in list(subscriptions):
+                    try:
+                        subscription(event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error forwarding %s", event)
+
+            self._unsub_listeners[event_type] = self.hass.bus.async_listen(
+                event_type, forward_events
+            )
+
+        subscriptions.append(forward)
+
+        @callback
+        def unsubscribe() -> None:
+            """Unsubscribe forward."""
+            if forward not in subscriptions:
+                return
+            subscriptions.remove(forward)
+            if not subscriptions:
+                del self._subscriptions[event_type]
+                self._unsub_listeners.pop(event_type)()
+
+        return unsubscribe
+
+
+@callback
+def async_get_event_hub(hass: HomeAssistantType) -> EventSubscriptionHub:
+    """Return the event subscription hub."""
+    hub = hass.data.get(const.DATA_EVENT_HUB)
+    if hub is None:
+        hub = hass.data[const.DATA_EVENT_HUB] = EventSubscriptionHub(hass)
+    return hub
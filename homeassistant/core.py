@@ -12,6 +12,7 @@ import functools
 import logging
 import os
 import pathlib
+import sys
 import threading
 from time import monotonic
 import uuid
@@ -29,19 +30,22 @@ from typing import (
     TYPE_CHECKING,
     Awaitable,
     Mapping,
+    Tuple,
 )
 
 from async_timeout import timeout
-import attr
 import voluptuous as vol
 
 from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
     ATTR_DOMAIN,
     ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
     ATTR_NOW,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
     ATTR_SECONDS,
+    ATTR_UNIT_OF_MEASUREMENT,
     CONF_UNIT_SYSTEM_IMPERIAL,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
@@ -133,6 +137,50 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return getattr(func, "_hass_callback", False) is True
 
 
+class HassJobType(enum.Enum):
+    """Represent a job type."""
+
+    Coroutinefunction = 1
+    Callback = 2
+    Executor = 3
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    The type of the target is determined once, so it does not have to be
+    checked every time the job is run.
+    """
+
+    __slots__ = ("job_type", "target")
+
+    def __init__(self, target: Callable) -> None:
+        """Create a job object."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine not allowed to be passed to HassJob")
+
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the job."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_callable_job_type(target: Callable) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if is_callback(check_target):
+        return HassJobType.Callback
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    return HassJobType.Executor
+
+
 @callback
 def async_loop_exception_handler(_: Any, context: Dict) -> None:
     """Handle all exception inside the core loop."""
@@ -319,6 +367,34 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+            return None
+
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(hassjob.target(*args))
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, hassjob.target, *args
+            )
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
     @callback
     def async_create_task(self, target: Coroutine) -> asyncio.tasks.Task:
         """Create a task from within the eventloop.
@@ -357,6 +433,20 @@ class HomeAssistant:
         """Stop track tasks so you can't wait for all tasks to be done."""
         self._track_task = False
 
+    @callback
+    def async_run_hass_job(self, hassjob: HassJob, *args: Any) -> None:
+        """Run a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            hassjob.target(*args)
+        else:
+            self.async_add_hass_job(hassjob, *args)
+
     @callback
     def async_run_job(self, target: Callable[..., None], *args: Any) -> None:
         """Run a job from within the event loop.
@@ -437,18 +527,59 @@ class HomeAssistant:
             self.loop.stop()
 
 
-@attr.s(slots=True, frozen=True)
+# Default context id, generated when the id is first used
+_GENERATE_ID = object()
+
+
 class Context:
-    """The context that triggered something."""
+    """The context that triggered something.
+
+    The id is only generated when it is first used.
+    """
 
-    user_id = attr.ib(type=str, default=None)
-    parent_id = attr.ib(type=Optional[str], default=None)
-    id = attr.ib(type=str, default=attr.Factory(lambda: uuid.uuid4().hex))
+    __slots__ = ["user_id", "parent_id", "_id"]
+
+    def __init__(
+        self,
+        user_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        id: Any = _GENERATE_ID,  # pylint: disable=redefined-builtin
+    ) -> None:
+        """Initialize a new context."""
+        self.user_id = user_id
+        self.parent_id = parent_id
+        self._id = id
+
+    @property
+    def id(self) -> Optional[str]:  # pylint: disable=invalid-name
+        """Return the id of the context."""
+        if self._id is _GENERATE_ID:
+            self._id = uuid.uuid4().hex
+        return self._id  # type: ignore
 
     def as_dict(self) -> dict:
         """Return a dictionary representation of the context."""
         return {"id": self.id, "parent_id": self.parent_id, "user_id": self.user_id}
 
+    def __eq__(self, other: Any) -> bool:
+        """Return the comparison of the context."""
+        return (  # type: ignore
+            self.__class__ == other.__class__
+            and self.user_id == other.user_id
+            and self.parent_id == other.parent_id
+            and self.id == other.id
+        )
+
+    def __hash__(self) -> int:
+        """Return the hash of the context."""
+        return hash((self.user_id, self.parent_id, self.id))
+
+    def __repr__(self) -> str:
+        """Return the representation of the context."""
+        return "Context(user_id={!r}, parent_id={!r}, id={!r})".format(
+            self.user_id, self.parent_id, self.id
+        )
+
 
 class EventOrigin(enum.Enum):
     """Represent the origin of an event."""
@@ -464,7 +595,7 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = ["event_type", "data", "origin", "time_fired", "context", "_json"]
 
     def __init__(
         self,
@@ -480,6 +611,8 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        # JSON of as_dict, cached by consumers that send it to many clients
+        self._json: Optional[str] = None
 
     def as_dict(self) -> Dict:
         """Create a dict representation of this Event.
@@ -521,7 +654,8 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[HassJob]] = {}
+        self._dispatch: Dict[str, Tuple[HassJob, ...]] = {}
         self._hass = hass
 
     @callback
@@ -563,23 +697,40 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        jobs = self._dispatch.get(event_type)
+        if jobs is None:
+            jobs = self._async_build_dispatch(event_type)
 
         event = Event(event_type, event_data, origin, None, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        for job in jobs:
+            self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> Tuple[HassJob, ...]:
+        """Merge and cache the listeners an event type is dispatched to.
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        This method must be run in the event loop.
+        """
+        jobs = tuple(self._listeners.get(event_type, ()))
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            jobs = tuple(self._listeners.get(MATCH_ALL, ())) + jobs
+
+        self._dispatch[event_type] = jobs
+        return jobs
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop the cached dispatch after the listeners changed."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -606,10 +757,12 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        job = HassJob(listener)
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(job)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [job]
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -646,6 +799,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        job = HassJob(listener)
 
         @callback
         def onetime_listener(event: Event) -> None:
@@ -659,7 +813,7 @@ class EventBus:
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
             self._async_remove_listener(event_type, onetime_listener)
-            self._hass.async_run_job(listener, event)
+            self._hass.async_run_hass_job(job, event)
 
         return self.async_listen(event_type, onetime_listener)
 
@@ -670,15 +824,45 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            jobs = self._listeners[event_type]
+            jobs.remove(next(job for job in jobs if job.target == listener))
 
             # delete event_type list if empty
-            if not self._listeners[event_type]:
+            if not jobs:
                 self._listeners.pop(event_type)
-        except (KeyError, ValueError):
+        except (KeyError, StopIteration):
             # KeyError is key event_type listener did not exist
-            # ValueError if listener did not exist within event_type
+            # StopIteration if listener did not exist within event_type
             _LOGGER.warning("Unable to remove unknown listener %s", listener)
+        else:
+            self._async_invalidate_dispatch(event_type)
+
+
+# Attributes of which many entities have the same value
+_SHARED_VALUE_ATTRIBUTES = frozenset(
+    (ATTR_DEVICE_CLASS, ATTR_FRIENDLY_NAME, ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT)
+)
+
+_EMPTY_ATTRIBUTES: MappingProxyType = MappingProxyType({})
+
+
+def _compact_attributes(attributes: Mapping) -> Dict:
+    """Return a copy of attributes with interned names and common values.
+
+    The same strings are then shared by the states of all entities instead
+    of every state holding its own copy.
+    """
+    compact = {}
+    for key, value in attributes.items():
+        if type(key) is str:  # pylint: disable=unidiomatic-typecheck
+            key = sys.intern(key)
+            if (
+                key in _SHARED_VALUE_ATTRIBUTES
+                and type(value) is str  # pylint: disable=unidiomatic-typecheck
+            ):
+                value = sys.intern(value)
+        compact[key] = value
+    return compact
 
 
 class State:
@@ -699,6 +883,7 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "_json",
     ]
 
     def __init__(
@@ -734,10 +919,18 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            # Attributes shared with another state
+            self.attributes = attributes
+        elif attributes:
+            self.attributes = MappingProxyType(attributes)
+        else:
+            self.attributes = _EMPTY_ATTRIBUTES
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        # State encoded as JSON, set when first needed
+        self._json: Optional[str] = None
 
     @property
     def domain(self) -> str:
@@ -839,6 +1032,9 @@ class StateMachine:
         self._states: Dict[str, State] = {}
         self._bus = bus
         self._loop = loop
+        # Bumped whenever a state is set or removed, overall and per domain
+        self._version = 0
+        self._domain_versions: Dict[str, int] = {}
 
     def entity_ids(self, domain_filter: Optional[str] = None) -> List[str]:
         """List of entity ids that are being tracked."""
@@ -878,6 +1074,24 @@ class StateMachine:
         """
         return list(self._states.values())
 
+    @callback
+    def async_version(self, domain: Optional[str] = None) -> int:
+        """Return a number that changes whenever a state of domain changes.
+
+        Without a domain the number changes whenever any state changes.
+
+        This method must be run in the event loop.
+        """
+        if domain is None:
+            return self._version
+        return self._domain_versions.get(domain, 0)
+
+    @callback
+    def _async_bump_version(self, entity_id: str) -> None:
+        """Record that the state of entity_id changed."""
+        self._version += 1
+        self._domain_versions[split_entity_id(entity_id)[0]] = self._version
+
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
 
@@ -916,6 +1130,7 @@ class StateMachine:
         if old_state is None:
             return False
 
+        self._async_bump_version(entity_id)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -984,8 +1199,17 @@ class StateMachine:
         if context is None:
             context = Context()
 
-        state = State(entity_id, new_state, attributes, last_changed, None, context)
+        if same_attr:
+            # The new state shares the attributes of the old state
+            state_attributes: Mapping = old_state.attributes  # type: ignore
+        else:
+            state_attributes = _compact_attributes(attributes)
+
+        state = State(
+            entity_id, new_state, state_attributes, last_changed, None, context
+        )
         self._states[entity_id] = state
+        self._async_bump_version(entity_id)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
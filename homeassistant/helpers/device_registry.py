@@ -76,7 +76,9 @@ class DeviceRegistry:
         """Initialize the device registry."""
         self.hass = hass
         self.devices = None
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, journal_keys={"devices": "id"}
+        )
 
     @callback
     def async_get(self, device_id: str) -> Optional[DeviceEntry]:
@@ -249,7 +251,7 @@ class DeviceRegistry:
             return old
 
         new = self.devices[device_id] = attr.evolve(old, **changes)
-        self.async_schedule_save()
+        self.async_schedule_save(device_id)
 
         self.hass.bus.async_fire(
             EVENT_DEVICE_REGISTRY_UPDATED,
@@ -267,7 +269,7 @@ class DeviceRegistry:
         self.hass.bus.async_fire(
             EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": device_id}
         )
-        self.async_schedule_save()
+        self.async_schedule_save(device_id)
 
     async def async_load(self):
         """Load the device registry."""
@@ -299,31 +301,30 @@ class DeviceRegistry:
         self.devices = devices
 
     @callback
-    def async_schedule_save(self):
-        """Schedule saving the device registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    def async_schedule_save(self, *device_ids):
+        """Schedule saving the device registry.
+
+        If the changed device ids are given only their entries are written.
+        """
+        if not device_ids:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+            return
+
+        items = {}
+        for device_id in device_ids:
+            entry = self.devices.get(device_id)
+            items[device_id] = None if entry is None else _device_to_save(entry)
+
+        self._store.async_delay_save_items(
+            self._data_to_save, "devices", items, SAVE_DELAY
+        )
 
     @callback
     def _data_to_save(self):
         """Return data of device registry to store in a file."""
         data = {}
 
-        data["devices"] = [
-            {
-                "config_entries": list(entry.config_entries),
-                "connections": list(entry.connections),
-                "identifiers": list(entry.identifiers),
-                "manufacturer": entry.manufacturer,
-                "model": entry.model,
-                "name": entry.name,
-                "sw_version": entry.sw_version,
-                "id": entry.id,
-                "via_device_id": entry.via_device_id,
-                "area_id": entry.area_id,
-                "name_by_user": entry.name_by_user,
-            }
-            for entry in self.devices.values()
-        ]
+        data["devices"] = [_device_to_save(entry) for entry in self.devices.values()]
 
         return data
 
@@ -349,6 +350,23 @@ class DeviceRegistry:
                 self._async_update_device(dev_id, area_id=None)
 
 
+def _device_to_save(entry: DeviceEntry) -> dict:
+    """Return the data of a device to store in a file."""
+    return {
+        "config_entries": list(entry.config_entries),
+        "connections": list(entry.connections),
+        "identifiers": list(entry.identifiers),
+        "manufacturer": entry.manufacturer,
+        "model": entry.model,
+        "name": entry.name,
+        "sw_version": entry.sw_version,
+        "id": entry.id,
+        "via_device_id": entry.via_device_id,
+        "area_id": entry.area_id,
+        "name_by_user": entry.name_by_user,
+    }
+
+
 @bind_hass
 async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
     """Return device registry instance."""
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import logging
 import functools as ft
 from timeit import default_timer as timer
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
@@ -29,7 +29,7 @@ from homeassistant.helpers.entity_registry import (
     EVENT_ENTITY_REGISTRY_UPDATED,
     RegistryEntry,
 )
-from homeassistant.core import HomeAssistant, callback, CALLBACK_TYPE, Context
+from homeassistant.core import HomeAssistant, callback, CALLBACK_TYPE, Context, State
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.exceptions import NoEntitySpecifiedError
 from homeassistant.util import ensure_unique_string, slugify
@@ -99,6 +99,10 @@ class Entity(ABC):
     # Owning platform instance. Will be set by EntityPlatform
     platform: Optional[EntityPlatform] = None
 
+    # If the name, icon, supported features and device class never change.
+    # They are then only looked up again when the registry entry changes.
+    static_attributes = False
+
     # If we reported if this entity was slow
     _slow_reported = False
 
@@ -121,6 +125,14 @@ class Entity(ABC):
     _context: Optional[Context] = None
     _context_set: Optional[datetime] = None
 
+    # Cached static attributes and customization
+    _static_attr: Optional[Dict[str, Any]] = None
+    _customize: Optional[Tuple[Any, str, Dict[str, Any]]] = None
+
+    # What the last written state was built from and the state written
+    _written: Optional[Tuple] = None
+    _written_state: Optional[State] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -313,9 +325,10 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes or {}
+        capability_attr = self.capability_attributes
         if not self.available:
             state = STATE_UNAVAILABLE
+            state_attr = device_attr = None
         else:
             state = self.state
 
@@ -324,42 +337,14 @@ class Entity(ABC):
             else:
                 state = str(state)
 
-            attr.update(self.state_attributes or {})
-            attr.update(self.device_state_attributes or {})
+            state_attr = self.state_attributes
+            device_attr = self.device_state_attributes
 
         unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
         entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
         hidden = self.hidden
-        if hidden:
-            attr[ATTR_HIDDEN] = hidden
-
         assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        static_attr = self._async_static_attributes()
 
         end = timer()
 
@@ -374,14 +359,56 @@ class Entity(ABC):
                 end - start,
             )
 
+        customize = self._async_customize()
+        units = self.hass.config.units
+        written = (
+            state,
+            capability_attr,
+            state_attr,
+            device_attr,
+            unit_of_measurement,
+            entity_picture,
+            hidden,
+            assumed_state,
+            static_attr,
+            customize,
+            units,
+        )
+
+        # Skip building the attributes if nothing changed since the last write
+        if (
+            written == self._written
+            and not self.force_update
+            and self.hass.states.get(self.entity_id) is self._written_state
+        ):
+            if self.platform is not None:
+                self.platform.suppressed_writes += 1
+            return
+
+        attr = dict(capability_attr or {})
+        attr.update(state_attr or {})
+        attr.update(device_attr or {})
+
+        if unit_of_measurement is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        if entity_picture is not None:
+            attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if hidden:
+            attr[ATTR_HIDDEN] = hidden
+
+        if assumed_state:
+            attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        attr.update(static_attr)
+
         # Overwrite properties that have been set in the config file.
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        attr.update(customize)
 
         # Convert temperature if we detect one
         try:
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
-            units = self.hass.config.units
             if (
                 unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
                 and unit_of_measure != units.temperature_unit
@@ -405,6 +432,61 @@ class Entity(ABC):
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+        # Copy the attributes in case the entity changes them in place
+        self._written = tuple(
+            dict(part) if isinstance(part, dict) else part for part in written
+        )
+        self._written_state = self.hass.states.get(self.entity_id)
+
+    @callback
+    def _async_static_attributes(self) -> Dict[str, Any]:
+        """Return the name, icon, supported features and device class."""
+        if self._static_attr is not None:
+            return self._static_attr
+
+        attr: Dict[str, Any] = {}
+
+        entry = self.registry_entry
+        # pylint: disable=consider-using-ternary
+        name = (entry and entry.name) or self.name
+        if name is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        icon = self.icon
+        if icon is not None:
+            attr[ATTR_ICON] = icon
+
+        supported_features = self.supported_features
+        if supported_features is not None:
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        device_class = self.device_class
+        if device_class is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        if self.static_attributes:
+            self._static_attr = attr
+        return attr
+
+    @callback
+    def _async_customize(self) -> Dict[str, Any]:
+        """Return the attributes customized in the config file."""
+        assert self.hass is not None
+
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
+        if customize is None:
+            return {}
+
+        # The customization is replaced when the core config is reloaded
+        cached = self._customize
+        if cached is None or cached[0] is not customize or cached[1] != self.entity_id:
+            cached = self._customize = (
+                customize,
+                self.entity_id,
+                customize.get(self.entity_id),
+            )
+        return cached[2]
+
     def schedule_update_ha_state(self, force_refresh=False):
         """Schedule an update ha state change task.
 
@@ -527,6 +609,7 @@ class Entity(ABC):
         ent_reg = await self.hass.helpers.entity_registry.async_get_registry()
         old = self.registry_entry
         self.registry_entry = ent_reg.async_get(data["entity_id"])
+        self._static_attr = None
 
         if self.registry_entry.disabled_by is not None:
             await self.async_remove()
@@ -54,6 +54,8 @@ class EntityPlatform:
         self.async_entities_added_callback = async_entities_added_callback
         self.config_entry = None
         self.entities = {}
+        # Number of state writes skipped because nothing changed
+        self.suppressed_writes = 0
         self._tasks = []
         # Method to cancel the state change listener
         self._async_unsub_polling = None
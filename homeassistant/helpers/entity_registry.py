@@ -84,7 +84,9 @@ class EntityRegistry:
         """Initialize the registry."""
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, journal_keys={"entities": "entity_id"}
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
         )
@@ -188,7 +190,7 @@ class EntityRegistry:
         )
         self.entities[entity_id] = entity
         _LOGGER.info("Registered new %s.%s entity: %s", domain, platform, entity_id)
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "create", "entity_id": entity_id}
@@ -203,7 +205,7 @@ class EntityRegistry:
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "remove", "entity_id": entity_id}
         )
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
     @callback
     def async_device_removed(self, event: Event) -> None:
@@ -300,7 +302,7 @@ class EntityRegistry:
 
         new = self.entities[entity_id] = attr.evolve(old, **changes)
 
-        self.async_schedule_save()
+        self.async_schedule_save(old.entity_id, entity_id)
 
         data = {"action": "update", "entity_id": entity_id, "changes": list(changes)}
 
@@ -336,27 +338,30 @@ class EntityRegistry:
         self.entities = entities
 
     @callback
-    def async_schedule_save(self) -> None:
-        """Schedule saving the entity registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    def async_schedule_save(self, *entity_ids: str) -> None:
+        """Schedule saving the entity registry.
+
+        If the changed entity ids are given only their entries are written.
+        """
+        if not entity_ids:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+            return
+
+        items = {}
+        for entity_id in entity_ids:
+            entry = self.entities.get(entity_id)
+            items[entity_id] = None if entry is None else _entry_to_save(entry)
+
+        self._store.async_delay_save_items(
+            self._data_to_save, "entities", items, SAVE_DELAY
+        )
 
     @callback
     def _data_to_save(self) -> Dict[str, Any]:
         """Return data of entity registry to store in a file."""
         data = {}
 
-        data["entities"] = [
-            {
-                "entity_id": entry.entity_id,
-                "config_entry_id": entry.config_entry_id,
-                "device_id": entry.device_id,
-                "unique_id": entry.unique_id,
-                "platform": entry.platform,
-                "name": entry.name,
-                "disabled_by": entry.disabled_by,
-            }
-            for entry in self.entities.values()
-        ]
+        data["entities"] = [_entry_to_save(entry) for entry in self.entities.values()]
 
         return data
 
@@ -371,6 +376,19 @@ class EntityRegistry:
             self.async_remove(entity_id)
 
 
+def _entry_to_save(entry: RegistryEntry) -> Dict[str, Any]:
+    """Return the data of an entry to store in a file."""
+    return {
+        "entity_id": entry.entity_id,
+        "config_entry_id": entry.config_entry_id,
+        "device_id": entry.device_id,
+        "unique_id": entry.unique_id,
+        "platform": entry.platform,
+        "name": entry.name,
+        "disabled_by": entry.disabled_by,
+    }
+
+
 @bind_hass
 async def async_get_registry(hass: HomeAssistantType) -> EntityRegistry:
     """Return entity registry instance."""
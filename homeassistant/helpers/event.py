@@ -1,14 +1,26 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+import itertools
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import attr
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.helpers.template import Template
-from homeassistant.core import HomeAssistant, callback, CALLBACK_TYPE, Event, State
+from homeassistant.helpers.template import RenderInfo, Template, is_template_string
+from homeassistant.core import (
+    HassJob,
+    HomeAssistant,
+    callback,
+    CALLBACK_TYPE,
+    Event,
+    State,
+    split_entity_id,
+)
+from homeassistant.exceptions import TemplateError
 from homeassistant.const import (
     ATTR_NOW,
     EVENT_STATE_CHANGED,
@@ -21,6 +33,12 @@ from homeassistant.const import (
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
+TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+TRACK_STATE_DOMAIN_CALLBACKS = "track_state_domain_callbacks"
+TRACK_TIME_PATTERN_SCHEDULER = "track_time_pattern_scheduler"
+
+_LOGGER = logging.getLogger(__name__)
 
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
@@ -73,21 +91,17 @@ def async_track_state_change(
 
     # Ensure it is a lowercase list with entity ids we want to match on
     if entity_ids == MATCH_ALL:
-        pass
+        entity_ids = (MATCH_ALL,)
     elif isinstance(entity_ids, str):
         entity_ids = (entity_ids.lower(),)
     else:
         entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
 
+    job = HassJob(action)
+
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -97,14 +111,98 @@ def async_track_state_change(
             new_state = new_state.state
 
         if match_from_state(old_state) and match_to_state(new_state):
-            hass.async_run_job(
-                action,
+            hass.async_run_hass_job(
+                job,
                 event.data.get("entity_id"),
                 event.data.get("old_state"),
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    return _async_add_state_change_listener(hass, entity_ids, state_change_listener)
+
+
+@callback
+def _async_add_state_change_listener(
+    hass: HomeAssistant,
+    entity_ids: Iterable[str],
+    listener: Callable[[Event], None],
+    domains: Iterable[str] = (),
+) -> CALLBACK_TYPE:
+    """Register a callback for state changes of entity_ids and domains.
+
+    All callbacks share a single state_changed listener on the bus that only
+    calls the callbacks registered for the entity that changed, its domain
+    and the ones registered for MATCH_ALL.
+    """
+    entity_callbacks: Dict[str, List[Callable[[Event], None]]] = hass.data.setdefault(
+        TRACK_STATE_CHANGE_CALLBACKS, {}
+    )
+    domain_callbacks: Dict[str, List[Callable[[Event], None]]] = hass.data.setdefault(
+        TRACK_STATE_DOMAIN_CALLBACKS, {}
+    )
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by entity_id and domain."""
+            entity_id = event.data.get("entity_id")
+            if entity_id is None:
+                return
+
+            # Copy, callbacks can be removed while we loop
+            callbacks: List[Callable[[Event], None]] = []
+            for key in (entity_id, MATCH_ALL):
+                callbacks.extend(entity_callbacks.get(key, ()))
+            if domain_callbacks:
+                callbacks.extend(
+                    domain_callbacks.get(split_entity_id(entity_id)[0], ())
+                )
+
+            for entity_callback in callbacks:
+                try:
+                    entity_callback(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s", entity_id
+                    )
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+        )
+
+    # Register once per entity, also when it was listed more than once
+    entity_ids = set(entity_ids)
+    domains = set(domains)
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(listener)
+    for domain in domains:
+        domain_callbacks.setdefault(domain, []).append(listener)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        for key_callbacks, keys in (
+            (entity_callbacks, entity_ids),
+            (domain_callbacks, domains),
+        ):
+            for key in keys:
+                callbacks = key_callbacks.get(key)
+                if callbacks is None or listener not in callbacks:
+                    continue
+                callbacks.remove(listener)
+                if not callbacks:
+                    del key_callbacks[key]
+
+        if (
+            not entity_callbacks
+            and not domain_callbacks
+            and TRACK_STATE_CHANGE_LISTENER in hass.data
+        ):
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
@@ -118,33 +216,215 @@ def async_track_template(
     action: Callable[[str, State, State], None],
     variables: Optional[Dict[str, Any]] = None,
 ) -> CALLBACK_TYPE:
-    """Add a listener that track state changes with template condition."""
-    from . import condition
+    """Add a listener that fires when a template changes to true."""
+    job = HassJob(action)
 
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id: str, from_s: State, to_s: State) -> None:
-        """Check if condition is correct and run action."""
+    def template_result_listener(
+        event: Optional[Event], last_result: Any, result: Any
+    ) -> None:
+        """Check if the template became true and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Error during template condition: %s", result)
+            template_result = False
+        else:
+            template_result = result.lower() == "true"
 
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            data = event.data if event is not None else {}
+            hass.async_run_hass_job(
+                job,
+                data.get("entity_id"),
+                data.get("old_state"),
+                data.get("new_state"),
+            )
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables), template_condition_listener
+    info = async_track_template_result(
+        hass, template, template_result_listener, variables
     )
 
+    return info.async_remove
+
 
 track_template = threaded_listener_factory(async_track_template)
 
 
+class TrackTemplateResultInfo:
+    """Track the result of a template using what its last render read."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        template: Template,
+        action: Callable[[Optional[Event], Any, Any], None],
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._template = template
+        self._job = HassJob(action)
+        self._variables = variables
+        self._info: Optional[RenderInfo] = None
+        self._last_result: Any = None
+        self._reported = False
+        self._listening: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        self._unsub_state_changed: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def listeners(self) -> Dict[str, Tuple[str, ...]]:
+        """Return the entity ids and domains currently listened to."""
+        entity_ids, domains = self._listening
+        return {"entities": entity_ids, "domains": domains}
+
+    @property
+    def result(self) -> Any:
+        """Return the last result, a TemplateError if the render failed."""
+        return self._last_result
+
+    @callback
+    def async_setup(self) -> None:
+        """Render the template and listen to what it read."""
+        self._info = self._template.async_render_to_info(self._variables)
+        self._last_result = _render_info_result(self._info)
+        self._async_update_listeners()
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop tracking the template."""
+        if self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+        self._listening = ((), ())
+
+    @callback
+    def async_refresh(self, event: Optional[Event] = None) -> None:
+        """Render the template and run the action if the result changed."""
+        self._info = self._template.async_render_to_info(self._variables)
+        self._async_update_listeners()
+
+        result = _render_info_result(self._info)
+        if self._reported and _same_result(result, self._last_result):
+            return
+
+        self._reported = True
+        last_result, self._last_result = self._last_result, result
+        self.hass.async_run_hass_job(self._job, event, last_result, result)
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        """Listen to the entities and domains the last render read."""
+        info = self._info
+        assert info is not None
+
+        if not is_template_string(self._template.template):
+            # Plain strings never change
+            listening: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        elif info.all_states or (not info.entities and not info.domains):
+            # Renders that read no state, like constant templates, templates
+            # that only depend on the time or renders that raised before
+            # reading anything, are checked on every state change.
+            listening = ((MATCH_ALL,), ())
+        else:
+            info_domains = info.domains
+            listening = (
+                tuple(
+                    sorted(
+                        entity_id
+                        for entity_id in info.entities
+                        if split_entity_id(entity_id)[0] not in info_domains
+                    )
+                ),
+                tuple(sorted(info_domains)),
+            )
+
+        if listening == self._listening:
+            return
+
+        if self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+
+        self._listening = listening
+        entity_ids, domains = listening
+        if entity_ids or domains:
+            self._unsub_state_changed = _async_add_state_change_listener(
+                self.hass, entity_ids, self._async_state_changed, domains
+            )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Re-render if the state change affects the template."""
+        info = self._info
+        assert info is not None
+
+        # Renders that read no state re-render on every change
+        if info.all_states or info.entities or info.domains:
+            entity_id = event.data.get("entity_id")
+            if entity_id is None:
+                return
+            if (
+                event.data.get("old_state") is None
+                or event.data.get("new_state") is None
+            ):
+                # Added or removed entities change what the domains contain
+                if not info.filter_lifecycle(entity_id):
+                    return
+            elif not info.filter(entity_id):
+                return
+
+        self.async_refresh(event)
+
+
+def _render_info_result(info: RenderInfo) -> Any:
+    """Return the result of a render or the TemplateError it raised."""
+    try:
+        return info.result
+    except TemplateError as ex:
+        return ex
+
+
+def _same_result(result: Any, other: Any) -> bool:
+    """Return if two render results are the same."""
+    if isinstance(result, TemplateError) and isinstance(other, TemplateError):
+        return str(result) == str(other)
+    return bool(result == other)
+
+
+@callback
+@bind_hass
+def async_track_template_result(
+    hass: HomeAssistant,
+    template: Template,
+    action: Callable[[Optional[Event], Any, Any], None],
+    variables: Optional[Dict[str, Any]] = None,
+) -> TrackTemplateResultInfo:
+    """Add a listener that fires when the result of a template changes.
+
+    The template is rendered right away. After every render, the listener
+    follows the entities and domains the render actually read instead of
+    guessing them from the template source. Iterating a domain only wakes
+    the template when an entity of that domain is added or removed, or one
+    of the states it read changed.
+
+    The action is called with the state_changed event, the last result and
+    the new result. It is called for the first state change that re-renders
+    the template, then only when the result changed. A result is a
+    TemplateError if the render failed.
+    """
+    info = TrackTemplateResultInfo(hass, template, action, variables)
+    info.async_setup()
+    return info
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -391,6 +671,148 @@ def async_track_sunset(
 track_sunset = threaded_listener_factory(async_track_sunset)
 
 
+class _TimePattern:
+    """Time pattern a listener fires on."""
+
+    __slots__ = ("action", "seconds", "minutes", "hours", "local", "removed")
+
+    def __init__(
+        self,
+        action: Callable[..., None],
+        seconds: List[int],
+        minutes: List[int],
+        hours: List[int],
+        local: bool,
+    ) -> None:
+        """Initialize the time pattern."""
+        self.action = action
+        self.seconds = seconds
+        self.minutes = minutes
+        self.hours = hours
+        self.local = local
+        self.removed = False
+
+    def next_time(self, now: datetime) -> datetime:
+        """Return the first time at or after now matching the pattern."""
+        localized_now = dt_util.as_local(now) if self.local else now
+        return dt_util.find_next_time_expression_time(
+            localized_now, self.seconds, self.minutes, self.hours
+        )
+
+
+class TimePatternScheduler:
+    """Fire time pattern listeners when they are due.
+
+    All time pattern listeners share a single time_changed listener on the
+    bus. It keeps a heap of the next time each pattern matches and only
+    looks at the patterns that are due.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: List[Tuple[datetime, int, _TimePattern]] = []
+        # Patterns of which the next time is calculated on the next event
+        self._new: List[_TimePattern] = []
+        # Order of patterns with the same next time
+        self._sequence = itertools.count()
+        self._listeners = 0
+        self._removed = 0
+        self._last_now: Optional[datetime] = None
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_add(self, pattern: _TimePattern) -> CALLBACK_TYPE:
+        """Add a time pattern and return a function to remove it."""
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        self._new.append(pattern)
+        self._listeners += 1
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the time pattern."""
+            if pattern.removed:
+                return
+            pattern.removed = True
+            self._listeners -= 1
+
+            if pattern in self._new:
+                self._new.remove(pattern)
+            else:
+                self._removed += 1
+
+            if not self._listeners:
+                self._async_stop()
+            elif self._removed > len(self._heap) // 2:
+                self._async_compact()
+
+        return remove_listener
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop listening for time changes."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._heap.clear()
+        self._new.clear()
+        self._removed = 0
+        self._last_now = None
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop the removed patterns from the heap."""
+        self._heap[:] = [entry for entry in self._heap if not entry[2].removed]
+        heapq.heapify(self._heap)
+        self._removed = 0
+
+    @callback
+    def _async_push(self, pattern: _TimePattern, now: datetime) -> None:
+        """Schedule the next time at or after now the pattern matches."""
+        heapq.heappush(
+            self._heap, (pattern.next_time(now), next(self._sequence), pattern)
+        )
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Fire the patterns that are due."""
+        now = event.data[ATTR_NOW]
+        heap = self._heap
+
+        # Make sure rolling back the clock doesn't prevent the patterns from
+        # triggering.
+        if self._last_now is not None and now < self._last_now:
+            self._new[:0] = [entry[2] for entry in heap if not entry[2].removed]
+            heap.clear()
+            self._removed = 0
+
+        self._last_now = now
+
+        new = self._new
+        self._new = []
+        for pattern in new:
+            self._async_push(pattern, now)
+
+        while heap and heap[0][0] <= now:
+            pattern = heapq.heappop(heap)[2]
+            if pattern.removed:
+                self._removed -= 1
+                continue
+
+            self._async_push(pattern, now + timedelta(seconds=1))
+
+            try:
+                self.hass.async_run_job(
+                    pattern.action, dt_util.as_local(now) if pattern.local else now
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while processing time pattern listener")
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -413,46 +835,19 @@ def async_track_utc_time_change(
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    matching_seconds = dt_util.parse_time_expression(second, 0, 59)
-    matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
-    matching_hours = dt_util.parse_time_expression(hour, 0, 23)
-
-    next_time = None
-
-    def calculate_next(now: datetime) -> None:
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
-
-        localized_now = dt_util.as_local(now) if local else now
-        next_time = dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
-        )
-
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
-
-    @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
-
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
-
-        last_now = now
+    pattern = _TimePattern(
+        action,
+        dt_util.parse_time_expression(second, 0, 59),
+        dt_util.parse_time_expression(minute, 0, 59),
+        dt_util.parse_time_expression(hour, 0, 23),
+        local,
+    )
 
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
+    scheduler = hass.data.get(TRACK_TIME_PATTERN_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_PATTERN_SCHEDULER] = TimePatternScheduler(hass)
 
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+    return scheduler.async_add(pattern)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -2,7 +2,10 @@
 from datetime import datetime
 import json
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import State  # pylint: disable=unused-import
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,3 +27,18 @@ class JSONEncoder(json.JSONEncoder):
             return o.as_dict()
 
         return json.JSONEncoder.default(self, o)
+
+
+def cached_state_json(state: "State") -> str:
+    """Return a state encoded as JSON, encoding the state only once.
+
+    States do not change once created, so the encoded state is cached on
+    the state and shared by every response it is sent in.
+    """
+    # pylint: disable=protected-access
+    encoded = state._json
+    if encoded is None:
+        encoded = state._json = json.dumps(
+            state.as_dict(), sort_keys=True, cls=JSONEncoder, allow_nan=False
+        )
+    return encoded
@@ -1,5 +1,6 @@
 """Support for restoring entity states on startup."""
 import asyncio
+import json
 import logging
 from datetime import timedelta, datetime
 from typing import Any, Dict, List, Set, Optional
@@ -16,7 +17,7 @@ import homeassistant.util.dt as dt_util
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, cached_state_json
 from homeassistant.helpers.storage import Store
 
 
@@ -36,6 +37,10 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long unchanged states are not written again, so the time they were
+# last seen stays recent
+STATE_DUMP_MAX_AGE = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -114,6 +119,9 @@ class RestoreStateData:
         )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # State of each entity written by the last dump
+        self._dumped: Dict[str, State] = {}
+        self._last_dump: Optional[datetime] = None
 
     def async_get_stored_states(self) -> List[StoredState]:
         """Get the set of states which should be stored.
@@ -149,17 +157,52 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        """Save the current state machine to storage.
+
+        Nothing is written if no stored state changed since the last dump.
+        States are only encoded once, the encoded states are reused.
+        """
+        now = dt_util.utcnow()
+        stored_states = self.async_get_stored_states()
+        dumped = {}
+        items = []
+        changed = len(stored_states) != len(self._dumped)
+
+        for stored_state in stored_states:
+            state = stored_state.state
+            if self._dumped.get(state.entity_id) is not state:
+                changed = True
+            try:
+                state_json = cached_state_json(state)
+            except (ValueError, TypeError) as exc:
+                _LOGGER.error("Error saving state of %s", state.entity_id, exc_info=exc)
+                continue
+
+            dumped[state.entity_id] = state
+            items.append(
+                '{"last_seen": %s, "state": %s}'
+                % (json.dumps(stored_state.last_seen, cls=JSONEncoder), state_json)
+            )
+
+        if (
+            not changed
+            and self._last_dump is not None
+            and now - self._last_dump < STATE_DUMP_MAX_AGE
+        ):
+            _LOGGER.debug("Not dumping states - no changes")
+            return
+
         _LOGGER.debug("Dumping states")
+        self._dumped = dumped
+
         try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
-            )
+            await self.store.async_save_json("[%s]" % ", ".join(items))
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            # Write everything again on the next dump
+            self._dumped = {}
+        else:
+            self._last_dump = now
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
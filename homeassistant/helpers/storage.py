@@ -1,5 +1,6 @@
 """Helper to help store data."""
 import asyncio
+import json
 from json import JSONEncoder
 import logging
 import os
@@ -18,6 +19,10 @@ from homeassistant.helpers.event import async_call_later
 STORAGE_DIR = ".storage"
 _LOGGER = logging.getLogger(__name__)
 
+JOURNAL_SUFFIX = ".journal"
+# Once the journal grows past this many bytes the snapshot is rewritten
+JOURNAL_MAX_SIZE = 256 * 1024
+
 
 @bind_hass
 async def async_migrator(
@@ -65,13 +70,26 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        journal_keys: Optional[Dict[str, str]] = None,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        With journal_keys the store can append changed items of the listed
+        collections to a journal instead of rewriting all data. It maps each
+        collection to the key that identifies its items.
+        """
         self.version = version
         self.key = key
         self.hass = hass
         self._private = private
         self._data: Optional[Dict[str, Any]] = None
+        self._journal_keys = journal_keys
+        self._journal: List[Dict[str, Any]] = []
+        self._journal_data_func: Optional[Callable[[], Dict]] = None
+        # Generation of the snapshot on disk, None until it is known to be
+        # written in the current version
+        self._journal_generation: Optional[int] = None
+        self._journal_size = 0
         self._unsub_delay_listener: Optional[CALLBACK_TYPE] = None
         self._unsub_stop_listener: Optional[CALLBACK_TYPE] = None
         self._write_lock = asyncio.Lock()
@@ -83,6 +101,11 @@ class Store:
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self):
+        """Return the path of the journal."""
+        return self.path + JOURNAL_SUFFIX
+
     async def async_load(self) -> Union[Dict, List, None]:
         """Load data.
 
@@ -107,14 +130,18 @@ class Store:
             # If we didn't generate data yet, do it now.
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
+            elif "data_json" in data:
+                data["data"] = json.loads(data.pop("data_json"))
+        elif self._journal:
+            data = {"version": self.version, "data": self._journal_data_func()}
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
-            )
+            data = await self.hass.async_add_executor_job(self._load_data)
 
             if data == {}:
                 return None
         if data["version"] == self.version:
+            if self._journal_keys is not None and "journal" in data:
+                self._journal_generation = data["journal"]
             stored = data["data"]
         else:
             _LOGGER.info(
@@ -128,9 +155,50 @@ class Store:
         self._load_task = None
         return stored
 
+    def _load_data(self) -> Union[Dict, List]:
+        """Load the data and replay the journal on top of it."""
+        data = json_util.load_json(self.path)
+
+        if (
+            self._journal_keys is None
+            or not isinstance(data, dict)
+            or "journal" not in data
+        ):
+            return data
+
+        entries = []
+        self._journal_size = 0
+        try:
+            with open(self.journal_path, encoding="utf-8") as fdesc:
+                for line in fdesc:
+                    self._journal_size += len(line.encode("utf-8"))
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line is incomplete if writing it failed
+                        _LOGGER.warning("Skipping invalid journal line of %s", self.key)
+                        continue
+                    if entry.get("journal") == data["journal"]:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+
+        _replay_journal(data["data"], self._journal_keys, entries)
+        return data
+
     async def async_save(self, data: Union[Dict, List]) -> None:
         """Save data."""
         self._data = {"version": self.version, "key": self.key, "data": data}
+        self._journal = []
+
+        self._async_cleanup_delay_listener()
+        self._async_cleanup_stop_listener()
+        await self._async_handle_write_data()
+
+    async def async_save_json(self, data_json: str) -> None:
+        """Save data that is already encoded as JSON."""
+        self._data = {"version": self.version, "key": self.key, "data_json": data_json}
+        self._journal = []
 
         self._async_cleanup_delay_listener()
         self._async_cleanup_stop_listener()
@@ -140,7 +208,43 @@ class Store:
     def async_delay_save(self, data_func: Callable[[], Dict], delay: float = 0) -> None:
         """Save data with an optional delay."""
         self._data = {"version": self.version, "key": self.key, "data_func": data_func}
+        self._journal = []
+
+        self._async_schedule_write(delay)
+
+    @callback
+    def async_delay_save_items(
+        self,
+        data_func: Callable[[], Dict],
+        collection: str,
+        items: Dict[str, Optional[Dict]],
+        delay: float = 0,
+    ) -> None:
+        """Save changed items of a collection with an optional delay.
+
+        Items maps the identifier of each changed item to the item, or to
+        None if it was removed. They are appended to the journal when the
+        store has one, otherwise all data returned by data_func is saved.
+        """
+        if (
+            self._journal_keys is None
+            or self._journal_generation is None
+            or self._data is not None
+        ):
+            self.async_delay_save(data_func, delay)
+            return
+
+        self._journal_data_func = data_func
+        self._journal.extend(
+            {"collection": collection, "id": item_id, "item": item}
+            for item_id, item in items.items()
+        )
 
+        self._async_schedule_write(delay)
+
+    @callback
+    def _async_schedule_write(self, delay: float) -> None:
+        """Schedule writing the pending data."""
         self._async_cleanup_delay_listener()
 
         self._unsub_delay_listener = async_call_later(
@@ -186,11 +290,29 @@ class Store:
     async def _async_handle_write_data(self, *_args):
         """Handle writing the config."""
         data = self._data
+        journal = self._journal
+        self._data = None
+        self._journal = []
+
+        if data is None:
+            if not journal:
+                return
+
+            if await self._async_append_journal(journal):
+                return
+
+            # Compact the journal into a new snapshot
+            data = {
+                "version": self.version,
+                "key": self.key,
+                "data_func": self._journal_data_func,
+            }
 
         if "data_func" in data:
             data["data"] = data.pop("data_func")()
 
-        self._data = None
+        if self._journal_keys is not None:
+            data["journal"] = (self._journal_generation or 0) + 1
 
         async with self._write_lock:
             try:
@@ -199,6 +321,41 @@ class Store:
                 )
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
+            else:
+                if self._journal_keys is not None:
+                    # Lines of older generations are ignored when loading
+                    self._journal_generation = data["journal"]
+                    self._journal_size = 0
+
+    async def _async_append_journal(self, journal: List[Dict[str, Any]]) -> bool:
+        """Append entries to the journal, return False if it needs compaction."""
+        async with self._write_lock:
+            # A snapshot written while waiting for the lock starts a generation
+            generation = self._journal_generation
+            try:
+                lines = "".join(
+                    json.dumps(dict(entry, journal=generation), cls=self._encoder)
+                    + "\n"
+                    for entry in journal
+                )
+            except TypeError as err:
+                _LOGGER.error("Error writing journal for %s: %s", self.key, err)
+                return False
+
+            size = len(lines.encode("utf-8"))
+            if self._journal_size + size > JOURNAL_MAX_SIZE:
+                return False
+
+            try:
+                await self.hass.async_add_executor_job(
+                    self._write_journal, self.journal_path, lines
+                )
+            except OSError as err:
+                _LOGGER.error("Error writing journal for %s: %s", self.key, err)
+                return False
+
+            self._journal_size += size
+        return True
 
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
@@ -206,8 +363,59 @@ class Store:
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        if "data_json" in data:
+            # Splice the encoded data in without decoding it
+            header = {
+                key: value for key, value in data.items() if key != "data_json"
+            }
+            json_util.save_json(
+                path,
+                '{"data": %s, %s' % (data["data_json"], json.dumps(header)[1:]),
+                self._private,
+            )
+        else:
+            json_util.save_json(path, data, self._private, encoder=self._encoder)
+
+        if "journal" in data and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def _write_journal(self, path: str, lines: str) -> None:
+        """Append lines to the journal."""
+        _LOGGER.debug("Writing journal for %s", self.key)
+        fdesc = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        with open(fdesc, "a", encoding="utf-8") as journal:
+            journal.write(lines)
+            journal.flush()
+            os.fsync(journal.fileno())
+        if not self._private:
+            os.chmod(path, 0o644)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
         raise NotImplementedError
+
+
+def _replay_journal(
+    data: Dict[str, Any], journal_keys: Dict[str, str], entries: List[Dict]
+) -> None:
+    """Apply journal entries to the collections of data in place."""
+    indexes: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        collection = entry["collection"]
+        if collection not in journal_keys:
+            continue
+
+        index = indexes.get(collection)
+        if index is None:
+            key = journal_keys[collection]
+            index = indexes[collection] = {
+                item[key]: item for item in data.get(collection, [])
+            }
+
+        if entry["item"] is None:
+            index.pop(entry["id"], None)
+        else:
+            index[entry["id"]] = entry["item"]
+
+    for collection, index in indexes.items():
+        data[collection] = list(index.values())
@@ -7,7 +7,7 @@ import random
 import re
 from datetime import datetime
 from functools import wraps
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
@@ -39,6 +39,7 @@ _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
+_RENDER_CACHE_STATS = "template.render_cache_stats"
 _ENVIRONMENT = "template.environment"
 
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
@@ -74,6 +75,11 @@ def render_complex(value, variables=None):
     return value
 
 
+def is_template_string(maybe_template: str) -> bool:
+    """Check if the input is a Jinja2 template."""
+    return _RE_JINJA_DELIMITERS.search(maybe_template) is not None
+
+
 def extract_entities(
     template: Optional[str], variables: Optional[Dict[str, Any]] = None
 ) -> Union[str, List[str]]:
@@ -115,6 +121,26 @@ def _true(arg: Any) -> bool:
     return True
 
 
+@callback
+def async_render_cache_stats(hass: HomeAssistantType) -> Dict[str, int]:
+    """Return how many renders were served from the render cache."""
+    return dict(hass.data.get(_RENDER_CACHE_STATS, {"hits": 0, "misses": 0}))
+
+
+def _state_version(hass, entity_id):
+    """Return a value that changes whenever the state of entity_id changes."""
+    state = hass.states.get(entity_id)
+    return None if state is None else state.last_updated
+
+
+def _domain_version(hass, domain):
+    """Return a value that changes whenever a state in a domain changes.
+
+    A domain of None covers all states.
+    """
+    return hass.states.async_version(domain)
+
+
 class RenderInfo:
     """Holds information about a template render."""
 
@@ -128,6 +154,12 @@ class RenderInfo:
         self._all_states = False
         self._domains = []
         self._entities = []
+        # Entities looked up by the render, read or only checked to exist
+        self._lookups = []
+        # Set if the result depends on more than the states, like the time
+        self._volatile = False
+        self._entity_versions = None
+        self._domain_versions = None
 
     def filter(self, entity_id: str) -> bool:
         """Template should re-render if the state changes."""
@@ -140,6 +172,21 @@ class RenderInfo:
             or entity_id in self._entities
         )
 
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the entities whose state the render read."""
+        return frozenset(self._entities)
+
+    @property
+    def domains(self) -> FrozenSet[str]:
+        """Return the domains the render iterated over."""
+        return frozenset(getattr(self, "_domains", ()))
+
+    @property
+    def all_states(self) -> bool:
+        """Return if the render iterated over all states."""
+        return self._all_states
+
     @property
     def result(self) -> str:
         """Results of the template computation."""
@@ -147,6 +194,38 @@ class RenderInfo:
             raise self._exception
         return self._result
 
+    def _snapshot(self, hass: HomeAssistantType) -> None:
+        """Remember the version of the states the render depended on."""
+        self._entity_versions = {
+            entity_id: _state_version(hass, entity_id)
+            for entity_id in self._entities + self._lookups
+        }
+        domains = [None] if self._all_states else self._domains
+        self._domain_versions = {
+            domain: _domain_version(hass, domain) for domain in domains
+        }
+
+    def _is_current(self, hass: HomeAssistantType) -> bool:
+        """Return if the result is still valid for the current states."""
+        if self._volatile or self._exception is not None:
+            return False
+        return all(
+            _state_version(hass, entity_id) == version
+            for entity_id, version in self._entity_versions.items()
+        ) and all(
+            _domain_version(hass, domain) == version
+            for domain, version in self._domain_versions.items()
+        )
+
+    def _merge_into(self, other: "RenderInfo") -> None:
+        """Add what this render depended on to an enclosing render."""
+        # pylint: disable=protected-access
+        other._entities.extend(self._entities)
+        other._lookups.extend(self._lookups)
+        other._domains.extend(getattr(self, "_domains", ()))
+        other._all_states = other._all_states or self._all_states
+        other._volatile = other._volatile or self._volatile
+
     def _freeze(self) -> None:
         self._entities = frozenset(self._entities)
         if self._all_states:
@@ -171,6 +250,8 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._last_render: Optional[RenderInfo] = None
+        self._last_variables: Optional[Dict[str, Any]] = None
         self.hass = hass
 
     @property
@@ -213,15 +294,10 @@ class Template:
 
         This method must be run in the event loop.
         """
-        compiled = self._compiled or self._ensure_compiled()
-
         if variables is not None:
             kwargs.update(variables)
 
-        try:
-            return compiled.render(kwargs).strip()
-        except jinja2.TemplateError as err:
-            raise TemplateError(err)
+        return self._async_render_info(kwargs).result
 
     @callback
     def async_render_to_info(
@@ -229,15 +305,63 @@ class Template:
     ) -> RenderInfo:
         """Render the template and collect an entity filter."""
         assert self.hass and _RENDER_INFO not in self.hass.data
-        render_info = self.hass.data[_RENDER_INFO] = RenderInfo(self)
-        # pylint: disable=protected-access
+        if variables is not None:
+            kwargs.update(variables)
+
         try:
-            render_info._result = self.async_render(variables, **kwargs)
+            return self._async_render_info(kwargs)
         except TemplateError as ex:
+            render_info = RenderInfo(self)
+            # pylint: disable=protected-access
             render_info._exception = ex
-        finally:
-            del self.hass.data[_RENDER_INFO]
             render_info._freeze()
+            return render_info
+
+    @callback
+    def _async_render_info(self, variables: Dict[str, Any]) -> RenderInfo:
+        """Render the template, or reuse the last render if still valid.
+
+        The last render is reused if it had the same variables and none of
+        the states it read have changed since.
+        """
+        compiled = self._compiled or self._ensure_compiled()
+        # pylint: disable=protected-access
+        outer_info = self.hass.data.get(_RENDER_INFO)
+        stats = self.hass.data.setdefault(_RENDER_CACHE_STATS, {"hits": 0, "misses": 0})
+
+        last_render = self._last_render
+        if (
+            last_render is not None
+            and self._last_variables == variables
+            and last_render._is_current(self.hass)
+        ):
+            stats["hits"] += 1
+            if outer_info is not None:
+                last_render._merge_into(outer_info)
+            return last_render
+
+        stats["misses"] += 1
+        render_info = self.hass.data[_RENDER_INFO] = RenderInfo(self)
+        try:
+            render_info._result = compiled.render(variables).strip()
+        except jinja2.TemplateError as err:
+            render_info._exception = TemplateError(err)
+        finally:
+            if outer_info is None:
+                del self.hass.data[_RENDER_INFO]
+            else:
+                self.hass.data[_RENDER_INFO] = outer_info
+                render_info._merge_into(outer_info)
+
+        render_info._snapshot(self.hass)
+        render_info._freeze()
+
+        if render_info._exception is None:
+            self._last_render = render_info
+            self._last_variables = dict(variables)
+        else:
+            self._last_render = self._last_variables = None
+
         return render_info
 
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
@@ -455,6 +579,13 @@ class TemplateState(State):
         return "<template " + rep[1:]
 
 
+def _collect_volatile(hass):
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        # pylint: disable=protected-access
+        render_info._volatile = True
+
+
 def _collect_state(hass, entity_id):
     entity_collect = hass.data.get(_RENDER_INFO)
     if entity_collect is not None:
@@ -462,6 +593,13 @@ def _collect_state(hass, entity_id):
         entity_collect._entities.append(entity_id)
 
 
+def _collect_lookup(hass, entity_id):
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        # pylint: disable=protected-access
+        render_info._lookups.append(entity_id)
+
+
 def _wrap_state(hass, state):
     """Wrap a state."""
     return None if state is None else TemplateState(hass, state)
@@ -469,6 +607,7 @@ def _wrap_state(hass, state):
 
 def _get_state(hass, entity_id):
     state = hass.states.get(entity_id)
+    _collect_lookup(hass, entity_id)
     if state is None:
         # Only need to collect if none, if not none collect first actuall
         # access to the state properties in the state wrapper.
@@ -985,11 +1124,30 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
             return contextfunction(wrapper)
 
+        # The result of these changes without any state changing, so
+        # renders using them are never served from the render cache.
+        def volatilefunction(func):
+            """Wrap function that returns a different value every call."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                _collect_volatile(hass)
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        self.filters["random"] = contextfilter(volatilefunction(random_every_time))
+        self.globals["now"] = volatilefunction(dt_util.now)
+        self.globals["utcnow"] = volatilefunction(dt_util.utcnow)
+        self.globals["relative_time"] = volatilefunction(dt_util.get_age)
+
         self.globals["expand"] = hassfunction(expand)
         self.filters["expand"] = contextfilter(self.globals["expand"])
-        self.globals["closest"] = hassfunction(closest)
-        self.filters["closest"] = contextfilter(hassfunction(closest_filter))
-        self.globals["distance"] = hassfunction(distance)
+        self.globals["closest"] = hassfunction(volatilefunction(closest))
+        self.filters["closest"] = contextfilter(
+            hassfunction(volatilefunction(closest_filter))
+        )
+        self.globals["distance"] = hassfunction(volatilefunction(distance))
         self.globals["is_state"] = hassfunction(is_state)
         self.globals["is_state_attr"] = hassfunction(is_state_attr)
         self.globals["state_attr"] = hassfunction(state_attr)
@@ -3,8 +3,11 @@ import argparse
 import asyncio
 from contextlib import suppress
 from datetime import datetime
+import gc
+import json
 import logging
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, Dict
 
 from homeassistant import core
@@ -186,3 +189,45 @@ def _logbook_filtering(hass, last_changed, last_updated):
     list(logbook.humanify(None, yield_events(event)))
 
     return timer() - start
+
+
+@benchmark
+async def state_memory(hass):
+    """Measure the memory the state machine uses per entity."""
+    start = timer()
+
+    for count in (5000, 20000, 50000):
+        per_entity = _state_memory(hass, count)
+        print(f"{count} entities: {per_entity:.0f} bytes per entity")
+
+    return timer() - start
+
+
+def _state_memory(hass, count):
+    """Return the bytes used per entity for the old and new state of count."""
+    # Attributes are decoded so the values are not shared string constants
+    attributes = (
+        '{"friendly_name": "Temperature %d", "unit_of_measurement": "\\u00b0C", '
+        '"device_class": "temperature", "icon": "mdi:thermometer"}'
+    )
+    entity_ids = [f"sensor.temperature_{index}" for index in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    # Hold the old states like listeners of state changes do
+    old_states = []
+    for index, entity_id in enumerate(entity_ids):
+        hass.states.async_set(entity_id, "20.5", json.loads(attributes % index))
+        old_states.append(hass.states.get(entity_id))
+        hass.states.async_set(entity_id, "21.0", json.loads(attributes % index))
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    for entity_id in entity_ids:
+        hass.states.async_remove(entity_id)
+
+    return used / count
@@ -43,19 +43,24 @@ def load_json(
 
 def save_json(
     filename: str,
-    data: Union[List, Dict],
+    data: Union[List, Dict, str],
     private: bool = False,
     *,
     encoder: Optional[Type[json.JSONEncoder]] = None,
 ) -> None:
     """Save JSON data to a file.
 
+    Data that is a string is expected to be encoded JSON and written as is.
+
     Returns True on success.
     """
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        if isinstance(data, str):
+            json_data = data
+        else:
+            json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
         # Modern versions of Python tempfile create this file with mode 0o600
         with tempfile.NamedTemporaryFile(
             mode="w", encoding="utf-8", dir=tmp_path, delete=False
@@ -242,3 +242,53 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_refresh_token_indexes(hass, hass_storage):
+    """Test refresh tokens are looked up by id and token after changes."""
+    hass_storage[auth_store.STORAGE_KEY] = {
+        "version": 1,
+        "data": {
+            "credentials": [],
+            "users": [
+                {
+                    "id": "user-id",
+                    "is_active": True,
+                    "is_owner": True,
+                    "name": "Paulus",
+                    "system_generated": False,
+                }
+            ],
+            "refresh_tokens": [
+                {
+                    "access_token_expiration": 1800.0,
+                    "client_id": "http://localhost:8123/",
+                    "created_at": "2018-10-03T13:43:19.774637+00:00",
+                    "id": "user-token-id",
+                    "jwt_key": "some-key",
+                    "token": "some-token",
+                    "user_id": "user-id",
+                }
+            ],
+        },
+    }
+
+    store = auth_store.AuthStore(hass)
+    loaded = await store.async_get_refresh_token("user-token-id")
+    assert loaded is not None
+    assert await store.async_get_refresh_token_by_token("some-token") is loaded
+    assert await store.async_get_refresh_token_by_token("other-token") is None
+
+    user = loaded.user
+    created = await store.async_create_refresh_token(user, "http://localhost:8123/")
+    assert await store.async_get_refresh_token(created.id) is created
+    assert await store.async_get_refresh_token_by_token(created.token) is created
+
+    await store.async_remove_refresh_token(loaded)
+    assert await store.async_get_refresh_token("user-token-id") is None
+    assert await store.async_get_refresh_token_by_token("some-token") is None
+    assert list(user.refresh_tokens) == [created.id]
+
+    await store.async_remove_user(user)
+    assert await store.async_get_refresh_token(created.id) is None
+    assert await store.async_get_refresh_token_by_token(created.token) is None
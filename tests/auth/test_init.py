@@ -473,6 +473,38 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validated_access_token_cache(mock_hass):
+    """Test validated access tokens are not decoded again until they expire."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    with patch("homeassistant.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert mock_decode.call_count == 2
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert mock_decode.call_count == 2
+
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.utcnow() + auth_const.ACCESS_TOKEN_EXPIRATION,
+        ):
+            assert (
+                await manager.async_validate_access_token(access_token)
+                is refresh_token
+            )
+        assert mock_decode.call_count == 4
+
+        user.is_active = False
+        assert await manager.async_validate_access_token(access_token) is None
+        user.is_active = True
+
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        await manager.async_remove_refresh_token(refresh_token)
+        assert await manager.async_validate_access_token(access_token) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
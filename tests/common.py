@@ -156,6 +156,7 @@ async def async_test_home_assistant(loop):
     INSTANCES.append(hass)
 
     orig_async_add_job = hass.async_add_job
+    orig_async_add_hass_job = hass.async_add_hass_job
     orig_async_add_executor_job = hass.async_add_executor_job
     orig_async_create_task = hass.async_create_task
 
@@ -165,6 +166,12 @@ async def async_test_home_assistant(loop):
             return mock_coro(target(*args))
         return orig_async_add_job(target, *args)
 
+    def async_add_hass_job(hassjob, *args):
+        """Add HassJob."""
+        if isinstance(hassjob.target, Mock):
+            return mock_coro(hassjob.target(*args))
+        return orig_async_add_hass_job(hassjob, *args)
+
     def async_add_executor_job(target, *args):
         """Add executor job."""
         if isinstance(target, Mock):
@@ -178,6 +185,7 @@ async def async_test_home_assistant(loop):
         return orig_async_create_task(coroutine)
 
     hass.async_add_job = async_add_job
+    hass.async_add_hass_job = async_add_hass_job
     hass.async_add_executor_job = async_add_executor_job
     hass.async_create_task = async_create_task
 
@@ -964,9 +972,20 @@ def mock_storage(data=None):
     def mock_write_data(store, path, data_to_write):
         """Mock version of write data."""
         _LOGGER.info("Writing data to %s: %s", store.key, data_to_write)
+        if "data_json" in data_to_write:
+            data_to_write = dict(data_to_write)
+            data_to_write["data"] = json.loads(data_to_write.pop("data_json"))
         # To ensure that the data can be serialized
         data[store.key] = json.loads(json.dumps(data_to_write, cls=store._encoder))
 
+    def mock_write_journal(store, path, lines):
+        """Mock version of write journal."""
+        _LOGGER.info("Writing journal to %s: %s", store.key, lines)
+        stored = data.get(store.key)
+        entries = [json.loads(line) for line in lines.splitlines()]
+        if stored is not None and entries[0]["journal"] == stored.get("journal"):
+            storage._replay_journal(stored["data"], store._journal_keys, entries)
+
     with patch(
         "homeassistant.helpers.storage.Store._async_load",
         side_effect=mock_async_load,
@@ -975,13 +994,17 @@ def mock_storage(data=None):
         "homeassistant.helpers.storage.Store._write_data",
         side_effect=mock_write_data,
         autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.Store._write_journal",
+        side_effect=mock_write_journal,
+        autospec=True,
     ):
         yield data
 
 
 async def flush_store(store):
     """Make sure all delayed writes of a store are written."""
-    if store._data is None:
+    if store._data is None and not store._journal:
         return
 
     store._async_cleanup_stop_listener()
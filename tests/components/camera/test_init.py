@@ -23,6 +23,7 @@ from tests.common import (
     get_test_instance_port,
     assert_setup_component,
     mock_coro,
+    mock_coro_func,
 )
 from tests.components.camera import common
 
@@ -381,3 +382,56 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_frame_broker(hass, mock_camera):
+    """Test viewers share one upstream fetch and the fetched frame."""
+    entity = hass.data[camera.DOMAIN].get_entity("camera.demo_camera")
+    frame = b"frame"
+    fetched = asyncio.Event()
+
+    async def fetch_frame():
+        """Return a frame once allowed."""
+        await fetched.wait()
+        return frame
+
+    with patch.object(
+        entity, "async_camera_image", side_effect=fetch_frame
+    ) as mock_image:
+        viewers = [
+            hass.async_create_task(entity.frame_broker.async_get_frame(0.5))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        fetched.set()
+        frames = await asyncio.gather(*viewers)
+
+        assert mock_image.call_count == 1
+        assert all(viewer_frame is frame for viewer_frame in frames)
+
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content is frame
+        assert mock_image.call_count == 1
+
+        assert await entity.frame_broker.async_get_frame(0) is frame
+        assert mock_image.call_count == 2
+
+    with patch.object(
+        entity, "async_camera_image", side_effect=mock_coro_func(None)
+    ) as mock_image:
+        assert await entity.frame_broker.async_get_frame(0) is None
+        assert await entity.frame_broker.async_get_frame(0) is None
+        assert mock_image.call_count == 2
+
+
+async def test_still_stream_ends_on_timeout(hass, hass_client, mock_camera):
+    """Test the MJPEG stream ends when fetching a frame times out."""
+    client = await hass_client()
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=asyncio.TimeoutError,
+    ):
+        response = await client.get("/api/camera_proxy_stream/camera.demo_camera")
+        assert response.status == 200
+        assert await response.read() == b""
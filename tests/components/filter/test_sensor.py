@@ -1,4 +1,5 @@
 """The test for the data filter sensor platform."""
+from collections import deque
 from datetime import timedelta
 import unittest
 from unittest.mock import patch
@@ -18,6 +19,7 @@ from tests.common import (
     get_test_home_assistant,
     assert_setup_component,
     init_recorder_component,
+    mock_coro,
 )
 
 
@@ -104,36 +106,38 @@ class TestFilterSensor(unittest.TestCase):
         t_2 = dt_util.utcnow() - timedelta(minutes=3)
 
         if missing:
-            fake_states = {}
+            fake_states = deque()
         else:
-            fake_states = {
-                "sensor.test_monitored": [
+            fake_states = deque(
+                [
                     ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
                     ha.State("sensor.test_monitored", 19.0, last_changed=t_1),
                     ha.State("sensor.test_monitored", 18.2, last_changed=t_2),
                 ]
-            }
+            )
 
         with patch(
-            "homeassistant.components.history." "state_changes_during_period",
-            return_value=fake_states,
-        ):
-            with patch(
-                "homeassistant.components.history." "get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
-
-                for value in self.values:
-                    self.hass.states.set(config["sensor"]["entity_id"], value.state)
-                    self.hass.block_till_done()
-
-                state = self.hass.states.get("sensor.test")
-                if missing:
-                    assert "18.05" == state.state
-                else:
-                    assert "17.05" == state.state
+            "homeassistant.components.recorder.preload.async_preload_history",
+            side_effect=lambda *args, **kwargs: mock_coro(fake_states),
+        ) as mock_preload:
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
+
+            for value in self.values:
+                self.hass.states.set(config["sensor"]["entity_id"], value.state)
+                self.hass.block_till_done()
+
+            state = self.hass.states.get("sensor.test")
+            if missing:
+                assert "18.05" == state.state
+            else:
+                assert "17.05" == state.state
+
+        assert mock_preload.call_count == 1
+        assert mock_preload.call_args[1] == {
+            "max_rows": 10,
+            "state_changes_only": True,
+        }
 
     def test_chain_history_missing(self):
         """Test if filter chaining works when recorder is enabled but the source is not recorded."""
@@ -155,27 +159,29 @@ class TestFilterSensor(unittest.TestCase):
         t_1 = dt_util.utcnow() - timedelta(minutes=2)
         t_2 = dt_util.utcnow() - timedelta(minutes=3)
 
-        fake_states = {
-            "sensor.test_monitored": [
+        fake_states = deque(
+            [
                 ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
                 ha.State("sensor.test_monitored", 19.0, last_changed=t_1),
                 ha.State("sensor.test_monitored", 18.2, last_changed=t_2),
             ]
-        }
+        )
         with patch(
-            "homeassistant.components.history." "state_changes_during_period",
-            return_value=fake_states,
-        ):
-            with patch(
-                "homeassistant.components.history." "get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
+            "homeassistant.components.recorder.preload.async_preload_history",
+            side_effect=lambda *args, **kwargs: mock_coro(fake_states),
+        ) as mock_preload:
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
 
-                self.hass.block_till_done()
-                state = self.hass.states.get("sensor.test")
-                assert "18.0" == state.state
+            self.hass.block_till_done()
+            state = self.hass.states.get("sensor.test")
+            assert "18.0" == state.state
+
+        assert mock_preload.call_count == 1
+        assert mock_preload.call_args[1] == {
+            "max_age": timedelta(minutes=1),
+            "state_changes_only": True,
+        }
 
     def test_outlier(self):
         """Test if outlier filter works."""
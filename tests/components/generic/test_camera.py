@@ -34,7 +34,12 @@ def test_fetching_url(aioclient_mock, hass, hass_client):
     body = yield from resp.text()
     assert body == "hello world"
 
+    # Served from the frame cache of the camera
     resp = yield from client.get("/api/camera_proxy/camera.config_test")
+    assert aioclient_mock.call_count == 1
+
+    with mock.patch("homeassistant.components.camera.broker.SNAPSHOT_MAX_AGE", 0):
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
     assert aioclient_mock.call_count == 2
 
 
@@ -115,45 +120,47 @@ def test_limit_refetch(aioclient_mock, hass, hass_client):
 
     client = yield from hass_client()
 
-    resp = yield from client.get("/api/camera_proxy/camera.config_test")
+    # Test the refetching of the platform, not the frame cache of the camera
+    with mock.patch("homeassistant.components.camera.broker.SNAPSHOT_MAX_AGE", 0):
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
 
-    hass.states.async_set("sensor.temp", "5")
+        hass.states.async_set("sensor.temp", "5")
 
-    with mock.patch("async_timeout.timeout", side_effect=asyncio.TimeoutError()):
-        resp = yield from client.get("/api/camera_proxy/camera.config_test")
-        assert aioclient_mock.call_count == 0
-        assert resp.status == 500
+        with mock.patch("async_timeout.timeout", side_effect=asyncio.TimeoutError()):
+            resp = yield from client.get("/api/camera_proxy/camera.config_test")
+            assert aioclient_mock.call_count == 0
+            assert resp.status == 500
 
-    hass.states.async_set("sensor.temp", "10")
+        hass.states.async_set("sensor.temp", "10")
 
-    resp = yield from client.get("/api/camera_proxy/camera.config_test")
-    assert aioclient_mock.call_count == 1
-    assert resp.status == 200
-    body = yield from resp.text()
-    assert body == "hello world"
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
+        assert aioclient_mock.call_count == 1
+        assert resp.status == 200
+        body = yield from resp.text()
+        assert body == "hello world"
 
-    resp = yield from client.get("/api/camera_proxy/camera.config_test")
-    assert aioclient_mock.call_count == 1
-    assert resp.status == 200
-    body = yield from resp.text()
-    assert body == "hello world"
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
+        assert aioclient_mock.call_count == 1
+        assert resp.status == 200
+        body = yield from resp.text()
+        assert body == "hello world"
 
-    hass.states.async_set("sensor.temp", "15")
+        hass.states.async_set("sensor.temp", "15")
 
-    # Url change = fetch new image
-    resp = yield from client.get("/api/camera_proxy/camera.config_test")
-    assert aioclient_mock.call_count == 2
-    assert resp.status == 200
-    body = yield from resp.text()
-    assert body == "hello planet"
+        # Url change = fetch new image
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
+        assert aioclient_mock.call_count == 2
+        assert resp.status == 200
+        body = yield from resp.text()
+        assert body == "hello planet"
 
-    # Cause a template render error
-    hass.states.async_remove("sensor.temp")
-    resp = yield from client.get("/api/camera_proxy/camera.config_test")
-    assert aioclient_mock.call_count == 2
-    assert resp.status == 200
-    body = yield from resp.text()
-    assert body == "hello planet"
+        # Cause a template render error
+        hass.states.async_remove("sensor.temp")
+        resp = yield from client.get("/api/camera_proxy/camera.config_test")
+        assert aioclient_mock.call_count == 2
+        assert resp.status == 200
+        body = yield from resp.text()
+        assert body == "hello planet"
 
 
 @asyncio.coroutine
@@ -18,6 +18,7 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
 )
 import homeassistant.components.group as group
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 
 from tests.common import get_test_home_assistant, assert_setup_component
 from tests.components.group import common
@@ -416,7 +417,13 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "hello.world",
+            "light.bowl",
+            "sensor.happy",
+            "test.one",
+            "test.two",
+        ]
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -438,7 +445,11 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "light.bowl",
+            "test.one",
+            "test.two",
+        ]
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -183,6 +183,69 @@ class TestComponentHistory(unittest.TestCase):
 
         assert states == hist[entity_id]
 
+    def test_get_state_series(self):
+        """Test getting the states of an entity as columns."""
+        self.init_recorder()
+        entity_id = "sensor.power"
+
+        def set_state(state, attributes=None):
+            """Set the state."""
+            self.hass.states.set(entity_id, state, attributes)
+            self.wait_recording_done()
+
+        start = dt_util.utcnow().replace(microsecond=0) + timedelta(minutes=1)
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=start
+        ):
+            set_state("1")
+
+        # Attribute changes are not significant
+        for minute, state in ((1, "4"), (2, "2"), (3, "unknown"), (5, "7"), (6, "7")):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=start + timedelta(minutes=minute, seconds=30),
+            ):
+                set_state(state, {"unit_of_measurement": "W", "minute": minute})
+
+        series_start = start + timedelta(minutes=1)
+        start_state = history.get_state(self.hass, series_start, entity_id)
+        series = history.get_state_series(
+            self.hass, series_start, None, entity_id, start_state, True
+        )
+        stamp = series_start.timestamp()
+        assert series == {
+            "entity_id": entity_id,
+            "timestamps": [stamp, stamp + 30, stamp + 90, stamp + 150, stamp + 270],
+            "states": ["1", "4", "2", "unknown", "7"],
+            "attributes": [
+                {},
+                {"unit_of_measurement": "W", "minute": 1},
+                {"unit_of_measurement": "W", "minute": 2},
+                {"unit_of_measurement": "W", "minute": 3},
+                {"unit_of_measurement": "W", "minute": 5},
+            ],
+        }
+
+        series = history.get_state_series(
+            self.hass, series_start, None, entity_id, start_state, bucket=120
+        )
+        assert series == {
+            "entity_id": entity_id,
+            "bucket": 120,
+            "timestamps": [stamp, stamp + 120, stamp + 240],
+            "min": [1.0, None, 7.0],
+            "max": [4.0, None, 7.0],
+            "mean": [7 / 3, None, 7.0],
+            "last": ["2", "unknown", "7"],
+        }
+
+        assert (
+            history.get_state_series(
+                self.hass, series_start, start, "sensor.unknown", None
+            )
+            is None
+        )
+
     def test_get_significant_states(self):
         """Test that only significant states are returned.
 
@@ -650,3 +713,45 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_series_api(hass, hass_client):
+    """Test streaming the history of a period as columns."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "10")
+    hass.states.async_set("sensor.energy", "2")
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        "/api/history/series/{}".format(start.isoformat()),
+        params={"filter_entity_id": "sensor.power,sensor.energy,sensor.none"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert [series["entity_id"] for series in result] == [
+        "sensor.power",
+        "sensor.energy",
+    ]
+    assert result[0]["states"] == ["10"]
+    assert "attributes" not in result[0]
+
+    response = await client.get(
+        "/api/history/series/{}".format(start.isoformat()),
+        params={"bucket": "3600", "attributes": ""},
+    )
+    assert response.status == 200
+    result = {series["entity_id"]: series for series in await response.json()}
+    assert result["sensor.power"]["mean"] == [10.0]
+    assert result["sensor.power"]["last"] == ["10"]
+    assert result["sensor.power"]["attributes"] == [{}]
+
+    for bucket in ("0", "nan", "inf"):
+        response = await client.get(
+            "/api/history/series/{}".format(start.isoformat()),
+            params={"bucket": bucket},
+        )
+        assert response.status == 400
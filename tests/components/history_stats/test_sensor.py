@@ -1,5 +1,7 @@
 """The test for the History Statistics sensor platform."""
 # pylint: disable=protected-access
+import asyncio
+from collections import deque
 from datetime import datetime, timedelta
 import unittest
 from unittest.mock import patch
@@ -13,7 +15,7 @@ import homeassistant.core as ha
 from homeassistant.helpers.template import Template
 import homeassistant.util.dt as dt_util
 
-from tests.common import init_recorder_component, get_test_home_assistant
+from tests.common import init_recorder_component, get_test_home_assistant, mock_coro
 
 
 class TestHistoryStatsSensor(unittest.TestCase):
@@ -27,6 +29,10 @@ class TestHistoryStatsSensor(unittest.TestCase):
         """Stop everything that was started."""
         self.hass.stop()
 
+    def update(self, sensor):
+        """Update a sensor in the event loop."""
+        asyncio.run_coroutine_threadsafe(sensor.async_update(), self.hass.loop).result()
+
     def test_setup(self):
         """Test the history statistics sensor setup."""
         self.init_recorder()
@@ -105,11 +111,13 @@ class TestHistoryStatsSensor(unittest.TestCase):
         # |---off---|---on----|---off---|---on----|
 
         fake_states = {
-            "binary_sensor.test_id": [
-                ha.State("binary_sensor.test_id", "on", last_changed=t0),
-                ha.State("binary_sensor.test_id", "off", last_changed=t1),
-                ha.State("binary_sensor.test_id", "on", last_changed=t2),
-            ]
+            "binary_sensor.test_id": deque(
+                [
+                    ha.State("binary_sensor.test_id", "on", last_updated=t0),
+                    ha.State("binary_sensor.test_id", "off", last_updated=t1),
+                    ha.State("binary_sensor.test_id", "on", last_updated=t2),
+                ]
+            )
         }
 
         start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
@@ -136,20 +144,113 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor4._type == "ratio"
 
         with patch(
-            "homeassistant.components.history." "state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.recorder.preload.async_preload_history",
+            side_effect=lambda hass, entity_id, **kwargs: mock_coro(
+                fake_states.get(entity_id, deque())
+            ),
         ):
-            with patch("homeassistant.components.history.get_state", return_value=None):
-                sensor1.update()
-                sensor2.update()
-                sensor3.update()
-                sensor4.update()
+            self.update(sensor1)
+            self.update(sensor2)
+            self.update(sensor3)
+            self.update(sensor4)
 
         assert sensor1.state == 0.5
         assert sensor2.state is None
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the measure is updated from state changes without queries."""
+        start_time = dt_util.utcnow().replace(microsecond=0) - timedelta(minutes=60)
+        t0 = start_time + timedelta(minutes=20)
+        t1 = t0 + timedelta(minutes=20)
+
+        fake_states = deque([ha.State("binary_sensor.test_id", "on", last_updated=t0)])
+
+        start = Template(
+            "{{{{ {} }}}}".format(dt_util.as_timestamp(start_time)), self.hass
+        )
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.recorder.preload.async_preload_history",
+            side_effect=lambda hass, entity_id, **kwargs: mock_coro(fake_states),
+        ) as mock_changes:
+            self.update(sensor)
+            assert sensor.state == 1
+            assert round(sensor.value, 2) == 0.67
+
+            # Already returned by the database
+            sensor._changes.append((True, t0.timestamp()))
+            sensor._changes.append((False, t1.timestamp()))
+            self.update(sensor)
+            assert mock_changes.call_count == 1
+            assert sensor.state == 1
+            assert round(sensor.value, 2) == 0.33
+
+            sensor._changes.append((True, t1.timestamp() + 60))
+            self.update(sensor)
+            assert mock_changes.call_count == 1
+            assert sensor.state == 2
+
+            # A new period is seeded from the database again
+            start_time -= timedelta(hours=1)
+            sensor._start = Template(
+                "{{{{ {} }}}}".format(dt_util.as_timestamp(start_time)), self.hass
+            )
+            self.update(sensor)
+            assert mock_changes.call_count == 2
+            assert sensor.state == 1
+
+            # Changes queued before a seed are part of the database
+            sensor._changes.append((False, t1.timestamp() + 120))
+            sensor._changes.append((True, t1.timestamp() + 180))
+            start_time -= timedelta(hours=1)
+            sensor._start = Template(
+                "{{{{ {} }}}}".format(dt_util.as_timestamp(start_time)), self.hass
+            )
+            self.update(sensor)
+            assert mock_changes.call_count == 3
+            assert sensor.state == 1
+
+    def test_measure_on_at_start(self):
+        """Test an entity already on when the period starts is no change."""
+        start_time = dt_util.utcnow().replace(microsecond=0) - timedelta(minutes=60)
+        t0 = start_time + timedelta(minutes=20)
+
+        fake_states = deque(
+            [
+                ha.State(
+                    "binary_sensor.test_id",
+                    "on",
+                    last_updated=start_time - timedelta(minutes=10),
+                ),
+                ha.State("binary_sensor.test_id", "off", last_updated=t0),
+            ]
+        )
+
+        start = Template(
+            "{{{{ {} }}}}".format(dt_util.as_timestamp(start_time)), self.hass
+        )
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.recorder.preload.async_preload_history",
+            side_effect=lambda hass, entity_id, **kwargs: mock_coro(fake_states),
+        ):
+            self.update(sensor)
+
+        assert sensor.state == 0
+        assert round(sensor.value, 2) == 0.33
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
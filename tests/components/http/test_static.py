@@ -0,0 +1,178 @@
+"""Test static file serving of the HTTP component."""
+import gzip
+from unittest.mock import patch
+
+from aiohttp import hdrs
+
+from homeassistant.components.http import static
+from homeassistant.setup import async_setup_component
+
+
+async def setup_static(hass, aiohttp_client, tmp_path, **kwargs):
+    """Serve a static directory and return a client."""
+    assert await async_setup_component(hass, "http", {"http": {}})
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 100)
+    (tmp_path / "icon.png").write_bytes(b"\x89PNG")
+    (tmp_path / "large.bin").write_bytes(b"\0" * 10)
+    hass.http.register_static_path("/static", str(tmp_path))
+    return await aiohttp_client(hass.http.app, **kwargs)
+
+
+async def test_serving_cached_file(hass, aiohttp_client, tmp_path):
+    """Test files are read once and compressed variants are served."""
+    client = await setup_static(hass, aiohttp_client, tmp_path)
+
+    with patch.object(static, "_load", wraps=static._load) as mock_load:
+        resp = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert resp.status == 200
+        assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+        assert resp.headers[hdrs.CACHE_CONTROL] == static.CACHE_HEADERS["Cache-Control"]
+        assert await resp.text() == "console.log('hello');\n" * 100
+        etag = resp.headers[hdrs.ETAG]
+
+        resp = await client.get(
+            "/static/app.js", headers={"Accept-Encoding": "identity"}
+        )
+        assert resp.status == 200
+        assert hdrs.CONTENT_ENCODING not in resp.headers
+        assert await resp.text() == "console.log('hello');\n" * 100
+
+        resp = await client.get("/static/app.js", headers={"If-None-Match": etag})
+        assert resp.status == 304
+
+        resp = await client.get("/static/icon.png")
+        assert resp.status == 200
+        assert await resp.read() == b"\x89PNG"
+        assert hdrs.VARY not in resp.headers
+
+    assert mock_load.call_count == 2
+
+
+async def test_serving_precompressed_file(hass, aiohttp_client, tmp_path):
+    """Test brotli and gzip files next to the file are preferred."""
+    client = await setup_static(
+        hass, aiohttp_client, tmp_path, auto_decompress=False
+    )
+    (tmp_path / "app.js.br").write_bytes(b"brotli")
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"gzip"))
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip, deflate, br"}
+    )
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "br"
+    assert await resp.read() == b"brotli"
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+    assert gzip.decompress(await resp.read()) == b"gzip"
+
+
+async def test_serving_changed_file(hass, aiohttp_client, tmp_path):
+    """Test cached files are checked for changes after a while."""
+    client = await setup_static(hass, aiohttp_client, tmp_path)
+
+    resp = await client.get("/static/icon.png")
+    assert await resp.read() == b"\x89PNG"
+
+    (tmp_path / "icon.png").write_bytes(b"\x89PNG changed")
+
+    with patch.object(static, "STATIC_CACHE_REVALIDATE", -1):
+        resp = await client.get("/static/icon.png")
+        assert await resp.read() == b"\x89PNG changed"
+
+        (tmp_path / "icon.png").unlink()
+        resp = await client.get("/static/icon.png")
+        assert resp.status == 404
+
+
+async def test_serving_uncached_file(hass, aiohttp_client, tmp_path):
+    """Test large files and missing files."""
+    client = await setup_static(hass, aiohttp_client, tmp_path)
+
+    with patch.object(static, "MAX_CACHED_FILE_SIZE", 5):
+        resp = await client.get("/static/large.bin")
+        assert resp.status == 200
+        assert await resp.read() == b"\0" * 10
+        assert hdrs.ETAG not in resp.headers
+
+    resp = await client.get("/static/missing.js")
+    assert resp.status == 404
+
+    resp = await client.get("/static/../test_static.py")
+    assert resp.status == 404
+
+
+async def test_serving_encoding_qualities(hass, aiohttp_client, tmp_path):
+    """Test encodings refused with a zero quality are not served."""
+    client = await setup_static(
+        hass, aiohttp_client, tmp_path, auto_decompress=False
+    )
+    (tmp_path / "app.js.br").write_bytes(b"brotli")
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "br;q=0, gzip;q=0.5"}
+    )
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "gzip"
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "gzip;q=0.5, br;q=0.8"}
+    )
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "br"
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "*;q=0, identity"}
+    )
+    assert hdrs.CONTENT_ENCODING not in resp.headers
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "xgzip"})
+    assert hdrs.CONTENT_ENCODING not in resp.headers
+
+
+async def test_serving_conditional_and_range(hass, aiohttp_client, tmp_path):
+    """Test If-Modified-Since and ranges of cached files."""
+    client = await setup_static(hass, aiohttp_client, tmp_path)
+
+    resp = await client.get("/static/icon.png")
+    assert resp.status == 200
+    last_modified = resp.headers[hdrs.LAST_MODIFIED]
+
+    resp = await client.get(
+        "/static/icon.png", headers={"If-Modified-Since": last_modified}
+    )
+    assert resp.status == 304
+
+    resp = await client.get(
+        "/static/icon.png",
+        headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert resp.status == 200
+
+    resp = await client.get("/static/icon.png", headers={"Range": "bytes=1-2"})
+    assert resp.status == 206
+    assert await resp.read() == b"PN"
+
+
+async def test_serving_encoded_etags(hass, aiohttp_client, tmp_path):
+    """Test each content encoding has its own entity tag, compared weakly."""
+    client = await setup_static(hass, aiohttp_client, tmp_path)
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    gzip_etag = resp.headers[hdrs.ETAG]
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": "identity"}
+    )
+    identity_etag = resp.headers[hdrs.ETAG]
+    assert gzip_etag != identity_etag
+
+    resp = await client.get(
+        "/static/app.js",
+        headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag},
+    )
+    assert resp.status == 200
+
+    resp = await client.get(
+        "/static/app.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": f"W/{gzip_etag}"},
+    )
+    assert resp.status == 304
+    assert resp.headers[hdrs.ETAG] == gzip_etag
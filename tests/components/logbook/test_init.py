@@ -3,6 +3,7 @@
 import logging
 from datetime import timedelta, datetime
 import unittest
+from unittest.mock import Mock, patch
 
 import pytest
 import voluptuous as vol
@@ -427,6 +428,94 @@ class TestComponentLogbook(unittest.TestCase):
             entries[1], pointB, "blu", domain="sensor", entity_id=entity_id2
         )
 
+    def test_get_events_filters_in_database(self):
+        """Test the entity filter and state checks of the logbook query."""
+        entity_ids = ["switch.bla", "switch.blu", "light.bla", "sensor.bla"]
+        for entity_id in entity_ids:
+            self.hass.states.set(entity_id, STATE_OFF)
+            self.hass.states.set(entity_id, STATE_ON, {"friendly_name": "Bla"})
+        # Attribute changes, hidden entities and auto groups are left out
+        self.hass.states.set("switch.bla", STATE_ON, {"friendly_name": "Changed"})
+        self.hass.states.set("switch.hidden", STATE_OFF)
+        self.hass.states.set("switch.hidden", STATE_ON, {ATTR_HIDDEN: True})
+        self.hass.states.set("group.all_switches", STATE_OFF, {"auto": True})
+        self.hass.states.set("group.all_switches", STATE_ON, {"auto": True})
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        configs = [
+            {},
+            {logbook.CONF_INCLUDE: {logbook.CONF_DOMAINS: ["switch"]}},
+            {logbook.CONF_INCLUDE: {logbook.CONF_ENTITIES: ["light.bla"]}},
+            {logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ["switch"]}},
+            {
+                logbook.CONF_INCLUDE: {logbook.CONF_DOMAINS: ["switch"]},
+                logbook.CONF_EXCLUDE: {logbook.CONF_ENTITIES: ["switch.blu"]},
+            },
+            {
+                logbook.CONF_INCLUDE: {logbook.CONF_ENTITIES: ["switch.blu"]},
+                logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ["switch"]},
+            },
+        ]
+        for config in configs:
+            config = logbook.CONFIG_SCHEMA({logbook.DOMAIN: config})[logbook.DOMAIN]
+            entities_filter = logbook._generate_filter_from_config(config)
+            entries = logbook._get_events(
+                self.hass,
+                config,
+                dt_util.utcnow() - timedelta(hours=1),
+                dt_util.utcnow() + timedelta(hours=1),
+            )
+
+            assert [
+                entry["entity_id"] for entry in entries if "entity_id" in entry
+            ] == [entity_id for entity_id in entity_ids if entities_filter(entity_id)]
+            for entry in entries:
+                if "entity_id" in entry:
+                    assert entry["name"] == "Bla"
+                    assert entry["message"] == "turned on"
+
+    def test_get_events_state_checks(self):
+        """Test the entity filter applies to one entity and new state checks."""
+        self.hass.states.set("switch.bla", STATE_OFF)
+        self.hass.states.set("switch.bla", STATE_ON)
+        self.hass.states.set("light.bla", STATE_OFF)
+        self.hass.states.set("light.bla", STATE_ON, {"text": '"old_state": null'})
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        config = logbook.CONFIG_SCHEMA(
+            {logbook.DOMAIN: {logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ["switch"]}}}
+        )[logbook.DOMAIN]
+        start = dt_util.utcnow() - timedelta(hours=1)
+        end = dt_util.utcnow() + timedelta(hours=1)
+
+        for entity_id, expected in (("switch.bla", []), ("light.bla", ["light.bla"])):
+            entries = logbook._get_events(self.hass, config, start, end, entity_id)
+            assert [
+                entry["entity_id"] for entry in entries if "entity_id" in entry
+            ] == expected
+
+    def test_keep_added_and_removed_with_any_separators(self):
+        """Test added and removed entities are found in compact event data."""
+        row = Mock(
+            event_type=EVENT_STATE_CHANGED,
+            time_fired=dt_util.utcnow(),
+            state_entity_id="switch.bla",
+            state_domain="switch",
+            attributes_id=None,
+            shared_attrs=None,
+            attributes="{}",
+        )
+        for event_data, expected in (
+            ('{"old_state":null,"new_state":{}}', False),
+            ('{"old_state":{},"new_state" : null}', False),
+            ('{"old_state":{},"new_state":{}}', True),
+        ):
+            row.event_data = event_data
+            event = logbook.LazyEventPartialState(row, {})
+            assert event.keep(lambda entity_id: True) is expected
+
     def test_include_events_domain(self):
         """Test if events are filtered if domain is included in config."""
         entity_id = "switch.bla"
@@ -1336,6 +1425,72 @@ async def test_logbook_view_period_entity(hass, hass_client):
     assert json[0]["entity_id"] == entity_id_test
 
 
+async def test_logbook_view_caches_past_days(hass, hass_client):
+    """Test finished days are encoded once and streamed per day."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+    past_date = start_date - timedelta(days=2)
+
+    with patch(
+        "homeassistant.components.logbook._encoded_events",
+        wraps=logbook._encoded_events,
+    ) as mock_encoded:
+        for _ in range(2):
+            response = await client.get(
+                "/api/logbook/{}".format(past_date.isoformat())
+            )
+            assert response.status == 200
+            assert await response.json() == []
+        assert mock_encoded.call_count == 1
+
+        for _ in range(2):
+            response = await client.get(
+                "/api/logbook/{}?period=3".format(start_date.isoformat())
+            )
+            assert response.status == 200
+            json = await response.json()
+            assert len(json) == 1
+            assert json[0]["entity_id"] == "switch.test"
+        # The past days are encoded once, today is queried every time
+        assert mock_encoded.call_count == 4
+
+
+async def test_logbook_view_groups_across_days(hass, hass_client):
+    """Test a group of sensor updates is not split at the end of a day."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    # The second day of the period starts in the middle of a group
+    day_end = dt_util.utcnow().replace(minute=7, second=0, microsecond=0)
+    day_end -= timedelta(days=1)
+    for point, state in (
+        (day_end - timedelta(minutes=30), "1"),
+        (day_end - timedelta(minutes=4), "2"),
+        (day_end + timedelta(minutes=4), "3"),
+    ):
+        with patch("homeassistant.core.dt_util.utcnow", return_value=point):
+            hass.states.async_set("sensor.test", state)
+            await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get("/api/logbook/{}?period=2".format(day_end.isoformat()))
+    assert response.status == 200
+    json = await response.json()
+    assert [entry["message"] for entry in json] == ["changed to 3"]
+
+
 async def test_humanify_alexa_event(hass):
     """Test humanifying Alexa event."""
     hass.states.async_set("light.kitchen", "on", {"friendly_name": "Kitchen Light"})
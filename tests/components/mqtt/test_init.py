@@ -336,6 +336,42 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert len(self.calls) == 1
 
+    def test_subscribe_after_topic_matched(self):
+        """Test a new subscription receives topics matched before."""
+        mqtt.subscribe(self.hass, "test-topic/+", self.record_calls)
+
+        fire_mqtt_message(self.hass, "test-topic/bier", "first")
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+
+        unsub = mqtt.subscribe(self.hass, "test-topic/#", self.record_calls)
+
+        fire_mqtt_message(self.hass, "test-topic/bier", "second")
+        self.hass.block_till_done()
+        assert [call[0].payload for call in self.calls] == ["first", "second", "second"]
+
+        unsub()
+
+        fire_mqtt_message(self.hass, "test-topic/bier", "third")
+        self.hass.block_till_done()
+        assert len(self.calls) == 4
+
+    def test_payload_decoded_once_per_encoding(self):
+        """Test subscriptions with the same encoding share the payload."""
+        mqtt.subscribe(self.hass, "test-topic/+", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/#", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/bier", self.record_calls, encoding=None)
+
+        fire_mqtt_message(self.hass, "test-topic/bier", "test-payload")
+        self.hass.block_till_done()
+
+        payloads = sorted(
+            (call[0].payload for call in self.calls), key=lambda p: type(p).__name__
+        )
+        assert payloads[0] == b"test-payload"
+        assert payloads[1] == "test-payload"
+        assert payloads[1] is payloads[2]
+
     def test_subscribe_topic_not_match(self):
         """Test if subscribed topic is not a match."""
         mqtt.subscribe(self.hass, "test-topic", self.record_calls)
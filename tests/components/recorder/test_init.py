@@ -4,14 +4,15 @@ import unittest
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import exc
 
 from homeassistant.core import callback
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 from homeassistant.setup import async_setup_component
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import PurgeTask, Recorder, StopTask
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -198,7 +199,15 @@ def test_recorder_setup_failure():
     ):
         setup.side_effect = ImportError("driver not found")
         rec = Recorder(
-            hass, keep_days=7, purge_interval=2, uri="sqlite://", include={}, exclude={}
+            hass,
+            keep_days=7,
+            purge_interval=2,
+            commit_interval=0,
+            max_batch_size=500,
+            retention={},
+            uri="sqlite://",
+            include={},
+            exclude={},
         )
         rec.start()
         rec.join()
@@ -222,3 +231,113 @@ async def test_defaults_set(hass):
     assert recorder_config is not None
     assert recorder_config["purge_keep_days"] == 10
     assert recorder_config["purge_interval"] == 1
+    assert recorder_config["commit_interval"] == 0
+    assert recorder_config["max_batch_size"] == 500
+
+
+def test_saving_batch(hass_recorder):
+    """Test events queued together are committed in one transaction."""
+    hass = hass_recorder({"commit_interval": 0.1, "max_batch_size": 3})
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch(
+        "homeassistant.components.recorder.session_scope", wraps=session_scope
+    ) as mock_scope:
+        for idx in range(5):
+            hass.states.set("test.recorder", "state{}".format(idx))
+        hass.block_till_done()
+        instance.block_till_done()
+
+    assert mock_scope.call_count == 2
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 5
+        assert (
+            session.query(Events).filter_by(event_type=EVENT_STATE_CHANGED).count()
+            == 5
+        )
+
+
+def test_saving_batch_with_bad_event(hass_recorder, caplog):
+    """Test an event failing to save does not lose the rest of its batch."""
+    hass = hass_recorder({"commit_interval": 0.1, "max_batch_size": 3})
+    instance = hass.data[DATA_INSTANCE]
+    add_event = Recorder._add_event
+
+    def add_bad_event(self, session, event):
+        """Fail to add the state of test.bad."""
+        if event.data.get("entity_id") == "test.bad":
+            raise exc.IntegrityError("INSERT", {}, Exception())
+        add_event(self, session, event)
+
+    with patch.object(Recorder, "_add_event", add_bad_event):
+        hass.states.set("test.good", "1")
+        hass.states.set("test.bad", "1")
+        hass.states.set("test.good", "2")
+        hass.block_till_done()
+        instance.block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert [state.state for state in session.query(States)] == ["1", "2"]
+
+    errors = [
+        record.getMessage() for record in caplog.records if record.levelname == "ERROR"
+    ]
+    assert any("Error saving event" in error for error in errors)
+    assert not any("test.good" in error for error in errors)
+
+
+def test_get_batch_stops_at_task(hass_recorder):
+    """Test a purge or shutdown task ends the batch it is queued in."""
+    hass = hass_recorder({"commit_interval": 10})
+    instance = Recorder(
+        hass,
+        keep_days=7,
+        purge_interval=2,
+        commit_interval=10,
+        max_batch_size=500,
+        retention={},
+        uri="sqlite://",
+        include={},
+        exclude={},
+    )
+    instance.queue.put("event1")
+    instance.queue.put("event2")
+    instance.queue.put(PurgeTask(7, False, None))
+    instance.queue.put("event3")
+    instance.queue.put(StopTask())
+
+    events, task = instance._get_batch()
+    assert events == ["event1", "event2"]
+    assert task == PurgeTask(7, False, None)
+
+    events, task = instance._get_batch()
+    assert events == ["event3"]
+    assert task == StopTask()
+
+
+def test_saving_shared_attributes(hass_recorder):
+    """Test states with equal attributes share one attributes row."""
+    hass = hass_recorder()
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set("test.recorder", "on", attributes)
+    hass.states.set("test.recorder", "off", attributes)
+    hass.states.set("test.other", "on", attributes)
+    hass.states.set("test.other", "off", {"test_attr": 6})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = session.query(States).order_by(States.state_id).all()
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        states = [db_state.to_native() for db_state in db_states]
+
+    assert [state.attributes for state in states] == [
+        attributes,
+        attributes,
+        attributes,
+        {"test_attr": 6},
+    ]
+    assert states[-1] == hass.states.get("test.other")
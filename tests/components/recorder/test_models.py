@@ -8,7 +8,13 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
-from homeassistant.components.recorder.models import Base, Events, States, RecorderRuns
+from homeassistant.components.recorder.models import (
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 
 ENGINE = None
 SESSION = None
@@ -60,6 +66,19 @@ class TestStates(unittest.TestCase):
         )
         assert state == States.from_event(event).to_native()
 
+    def test_from_event_with_attributes(self):
+        """Test converting event to db state with shared attributes."""
+        state = ha.State("sensor.temperature", "18", {"unit_of_measurement": "°C"})
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+            context=state.context,
+        )
+        db_state = States.from_event(event)
+        db_state.state_attributes = StateAttributes.from_event(event)
+        assert db_state.attributes is None
+        assert state == db_state.to_native()
+
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
         event = ha.Event(
@@ -152,6 +171,14 @@ class TestRecorderRuns(unittest.TestCase):
         assert run.entity_ids(in_run2) == ["sensor.humidity"]
 
 
+def test_state_attributes_hash():
+    """Test equal attributes share a hash that fits a BigInteger."""
+    attrs_hash = StateAttributes.hash_shared_attrs('{"a": 1}')
+    assert attrs_hash == StateAttributes.hash_shared_attrs('{"a": 1}')
+    assert attrs_hash != StateAttributes.hash_shared_attrs('{"a": 2}')
+    assert 0 <= attrs_hash < 2 ** 63
+
+
 def test_states_from_native_invalid_entity_id():
     """Test loading a state from an invalid entity ID."""
     event = States()
@@ -0,0 +1,207 @@
+"""Test preloading the recorded history of entities."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components.recorder import preload
+from homeassistant.components.recorder.const import DATA_INSTANCE
+import homeassistant.util.dt as dt_util
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """HASS fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def record_states(hass, now):
+    """Record six states of sensor.a and one of sensor.b, ten minutes apart."""
+    for minutes in range(50, -10, -10):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=now - timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.a", minutes)
+            if minutes == 30:
+                hass.states.set("sensor.b", minutes)
+            hass.block_till_done()
+            hass.data[DATA_INSTANCE].block_till_done()
+
+
+def preload_many(hass, requests):
+    """Request the history of several entities at once."""
+
+    async def async_preload():
+        """Request all histories in the same loop iteration."""
+        return await asyncio.gather(
+            *(
+                preload.async_preload_history(hass, entity_id, **kwargs)
+                for entity_id, kwargs in requests
+            )
+        )
+
+    return asyncio.run_coroutine_threadsafe(async_preload(), hass.loop).result()
+
+
+def assert_states(states, expected):
+    """Assert the states hold the expected values, oldest first."""
+    assert [state.state for state in states] == [str(value) for value in expected]
+
+
+def test_preload_history(hass_recorder):
+    """Test requests are coalesced in one windowed query."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    record_states(hass, now)
+
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow", return_value=now
+    ), patch.object(
+        preload, "_query_windowed", wraps=preload._query_windowed
+    ) as mock_query:
+        rows, age, both, start, other, missing = preload_many(
+            hass,
+            [
+                ("sensor.a", {"max_rows": 2}),
+                ("sensor.a", {"max_age": timedelta(minutes=25)}),
+                ("sensor.a", {"max_rows": 2, "max_age": timedelta(minutes=5)}),
+                (
+                    "sensor.a",
+                    {
+                        "start_time": now - timedelta(minutes=25),
+                        "include_start_state": True,
+                    },
+                ),
+                ("sensor.b", {}),
+                ("sensor.missing", {"max_rows": 5}),
+            ],
+        )
+
+    assert mock_query.call_count == 1
+    assert hass.data[preload.DATA_PRELOADER]._windowed
+    assert_states(rows, [10, 0])
+    assert_states(age, [20, 10, 0])
+    assert_states(both, [0])
+    assert_states(start, [30, 20, 10, 0])
+    assert_states(other, [30])
+    assert_states(missing, [])
+
+
+def test_preload_history_without_window_functions(hass_recorder):
+    """Test falling back to a query per entity."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    record_states(hass, now)
+
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow", return_value=now
+    ), patch.object(
+        preload,
+        "_query_windowed",
+        side_effect=OperationalError("statement", {}, "no such function"),
+    ) as mock_query:
+        rows, start = preload_many(
+            hass,
+            [
+                ("sensor.a", {"max_rows": 2}),
+                (
+                    "sensor.a",
+                    {
+                        "start_time": now - timedelta(minutes=25),
+                        "include_start_state": True,
+                    },
+                ),
+            ],
+        )
+        (other,) = preload_many(hass, [("sensor.b", {})])
+
+    assert mock_query.call_count == 1
+    assert_states(rows, [10, 0])
+    assert_states(start, [30, 20, 10, 0])
+    assert_states(other, [30])
+
+
+def test_preload_start_state_bounded(hass_recorder):
+    """Test requests with a start state only load the states they need."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    record_states(hass, now)
+
+    requests = [
+        preload.PreloadRequest("sensor.a", None, now - timedelta(minutes=25), True),
+        preload.PreloadRequest("sensor.a", None, now - timedelta(minutes=5), True),
+    ]
+    newest_first = preload._query_entity(hass, "sensor.a", requests)
+    assert_states(reversed(newest_first), [30, 20, 10, 0])
+
+    (start,) = preload_many(
+        hass,
+        [
+            (
+                "sensor.a",
+                {
+                    "start_time": now - timedelta(minutes=15),
+                    "include_start_state": True,
+                },
+            )
+        ],
+    )
+    assert_states(start, [20, 10, 0])
+
+
+def test_preload_state_changes_only(hass_recorder):
+    """Test attribute-only updates are skipped and not counted when asked."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    for minutes, state, attributes in (
+        (40, "1", {}),
+        (30, "2", {}),
+        (20, "2", {"changed": 1}),
+        (10, "2", {"changed": 2}),
+    ):
+        with patch(
+            "homeassistant.core.dt_util.utcnow",
+            return_value=now - timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.c", state, attributes)
+            hass.block_till_done()
+            hass.data[DATA_INSTANCE].block_till_done()
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=now):
+        changes, rows, start = preload_many(
+            hass,
+            [
+                ("sensor.c", {"max_rows": 2, "state_changes_only": True}),
+                ("sensor.c", {"max_rows": 2}),
+                (
+                    "sensor.c",
+                    {
+                        "start_time": now - timedelta(minutes=15),
+                        "include_start_state": True,
+                        "state_changes_only": True,
+                    },
+                ),
+            ],
+        )
+    assert_states(changes, [1, 2])
+    assert_states(rows, [2, 2])
+    assert_states(start, [2])
+
+    requests = [preload.PreloadRequest("sensor.c", 2, None, False, True)]
+    newest_first = preload._query_entity(hass, "sensor.c", requests, True)
+    assert_states(reversed(newest_first), [1, 2])
@@ -5,10 +5,13 @@ import unittest
 from unittest.mock import patch
 
 from homeassistant.components import recorder
+from homeassistant.components.recorder import purge
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.core as ha
 from tests.common import get_test_home_assistant, init_recorder_component
 
 
@@ -106,6 +109,74 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 states left after purging
             assert states.count() == 2
 
+    def test_purge_unused_attributes(self):
+        """Test deleting attributes no longer referenced by a state."""
+        self._add_test_states()
+        with session_scope(hass=self.hass) as session:
+            session.add(StateAttributes(hash=1, shared_attrs='{"unused": true}'))
+            session.add(StateAttributes(hash=2, shared_attrs='{"used": true}'))
+            session.flush()
+            unused = session.query(StateAttributes).filter_by(hash=1).one()
+            used = session.query(StateAttributes).filter_by(hash=2).one()
+            session.query(States).filter_by(state="autopurgeme").update(
+                {"attributes_id": unused.attributes_id}, synchronize_session=False
+            )
+            session.query(States).filter(
+                States.state.in_(["purgeme", "dontpurgeme"])
+            ).update({"attributes_id": used.attributes_id}, synchronize_session=False)
+
+        purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            assert [attrs.hash for attrs in session.query(StateAttributes)] == [2]
+
+    def test_purge_attributes_between_chunks(self):
+        """Test states saved between two chunks do not use purged attributes."""
+        instance = self.hass.data[DATA_INSTANCE]
+        self.hass.states.set("sensor.live", "on", {"unit": "W"})
+        self.hass.block_till_done()
+        instance.block_till_done()
+        self._add_test_events()
+
+        eleven_days_ago = datetime.now() - timedelta(days=11)
+        with session_scope(hass=self.hass) as session:
+            session.query(States).update(
+                {"last_updated": eleven_days_ago}, synchronize_session=False
+            )
+
+        old_state = self.hass.states.get("sensor.live")
+        new_state = ha.State("sensor.live", "off", {"unit": "W"})
+        purge_chunk = purge.purge_old_data
+
+        def purge_then_save_state(*args):
+            """Save a state changed while the purge is not finished."""
+            finished = purge_chunk(*args)
+            if mock_purge.call_count == 1:
+                instance.queue.put(
+                    ha.Event(
+                        EVENT_STATE_CHANGED,
+                        {
+                            "entity_id": "sensor.live",
+                            "old_state": old_state,
+                            "new_state": new_state,
+                        },
+                    )
+                )
+            return finished
+
+        with patch.object(purge, "PURGE_CHUNK_SIZE", 1), patch.object(
+            purge, "purge_old_data", side_effect=purge_then_save_state
+        ) as mock_purge:
+            self.hass.services.call("recorder", "purge", {"keep_days": 4})
+            self.hass.block_till_done()
+            instance.block_till_done()
+
+        assert mock_purge.call_count > 1
+        with session_scope(hass=self.hass) as session:
+            state = session.query(States).filter_by(state="off").one()
+            assert state.state_attributes is not None
+            assert json.loads(state.state_attributes.shared_attrs) == {"unit": "W"}
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -120,6 +191,54 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_in_chunks(self):
+        """Test purging deletes a bounded number of rows per call."""
+        self._add_test_events()
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+        progress = PurgeProgress()
+
+        with patch(
+            "homeassistant.components.recorder.purge.PURGE_CHUNK_SIZE", 3
+        ), session_scope(hass=self.hass) as session:
+            states = session.query(States)
+            events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+
+            assert not purge_old_data(instance, 4, False, progress)
+            assert states.count() == 3
+            assert events.count() == 6
+
+            assert not purge_old_data(instance, 4, False, progress)
+            assert states.count() == 2
+            assert events.count() == 4
+
+            assert purge_old_data(instance, 4, False, progress)
+            assert states.count() == 2
+            assert events.count() == 2
+
+        assert progress.deleted_states == 4
+        assert progress.deleted_events == 4
+        assert progress.rows_per_second > 0
+
+    def test_purge_retention_overrides(self):
+        """Test domains and entities can be kept for a different time."""
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+        instance.retention = {"domains": {"sensor": 20}, "entities": {}}
+
+        with session_scope(hass=self.hass) as session:
+            states = session.query(States)
+
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 6
+
+            instance.retention = {
+                "domains": {"sensor": 20},
+                "entities": {"test.recorder2": 7},
+            }
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 4
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
@@ -173,6 +292,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 assert (
-                    mock_logger.debug.mock_calls[3][1][0]
+                    mock_logger.debug.mock_calls[-1][1][0]
                     == "Vacuuming SQL DB to free space"
                 )
@@ -5,11 +5,12 @@ import statistics
 import pytest
 
 from homeassistant.setup import setup_component
-from homeassistant.components.statistics.sensor import StatisticsSensor
+from homeassistant.components.statistics.sensor import SlidingWindow, StatisticsSensor
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, TEMP_CELSIUS, STATE_UNKNOWN
 from homeassistant.util import dt as dt_util
 from tests.common import get_test_home_assistant
 from unittest.mock import patch
+from collections import deque
 from datetime import datetime, timedelta
 from tests.common import init_recorder_component
 from homeassistant.components import recorder
@@ -363,3 +364,50 @@ class TestStatisticsSensor(unittest.TestCase):
         assert mock_data["return_time"] == state.attributes.get("max_age") + timedelta(
             hours=1
         )
+
+
+def test_sliding_window_matches_statistics():
+    """Test the running aggregates against a full recomputation."""
+    window = SlidingWindow()
+    values = deque()
+    size = 50
+
+    for index in range(1000):
+        value = ((index * 7919) % 1013) / 7.0 - 40
+        if len(values) == size:
+            window.remove(values.popleft())
+        values.append(value)
+        window.add(value)
+
+        assert len(window) == len(values)
+        assert window.min == min(values)
+        assert window.max == max(values)
+        assert window.median == statistics.median(values)
+        assert window.total == pytest.approx(sum(values))
+        assert window.mean == pytest.approx(statistics.mean(values))
+        if len(values) > 1:
+            assert window.variance == pytest.approx(statistics.variance(values))
+            assert window.stdev == pytest.approx(statistics.stdev(values))
+
+    while values:
+        window.remove(values.popleft())
+        if values:
+            assert window.mean == pytest.approx(statistics.mean(values))
+    assert not window
+    assert window.total == 0
+
+
+def test_sliding_window_quantile():
+    """Test the quantiles interpolate between the sorted values."""
+    window = SlidingWindow()
+    for value in (4, 1, 3, 2):
+        window.add(value)
+
+    assert window.quantile(0) == 1
+    assert window.quantile(1) == 4
+    assert window.quantile(0.5) == 2.5
+    assert window.quantile(0.25) == 1.75
+
+    window.remove(1)
+    assert window.quantile(0) == 2
+    assert window.quantile(0.5) == window.median == 3
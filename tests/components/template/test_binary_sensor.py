@@ -546,7 +546,7 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
 
 
 async def test_no_update_template_match_all(hass, caplog):
-    """Test that we do not update sensors that match on all."""
+    """Test binary sensors with templates that match on all."""
     hass.states.async_set("binary_sensor.test_sensor", "true")
 
     await setup.async_setup_component(
@@ -575,26 +575,6 @@ async def test_no_update_template_match_all(hass, caplog):
     )
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 5
-    assert (
-        "Template binary sensor 'all_state' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the value template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_icon' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the icon template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_entity_picture' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the entity_picture template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_attribute' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the test_attribute template"
-    ) in caplog.text
 
     assert hass.states.get("binary_sensor.all_state").state == "off"
     assert hass.states.get("binary_sensor.all_icon").state == "off"
@@ -612,11 +592,6 @@ async def test_no_update_template_match_all(hass, caplog):
     hass.states.async_set("binary_sensor.test_sensor", "false")
     await hass.async_block_till_done()
 
-    assert hass.states.get("binary_sensor.all_state").state == "on"
-    assert hass.states.get("binary_sensor.all_icon").state == "on"
-    assert hass.states.get("binary_sensor.all_entity_picture").state == "on"
-    assert hass.states.get("binary_sensor.all_attribute").state == "on"
-
     await hass.helpers.entity_component.async_update_entity("binary_sensor.all_state")
     await hass.helpers.entity_component.async_update_entity("binary_sensor.all_icon")
     await hass.helpers.entity_component.async_update_entity(
@@ -630,3 +605,34 @@ async def test_no_update_template_match_all(hass, caplog):
     assert hass.states.get("binary_sensor.all_icon").state == "off"
     assert hass.states.get("binary_sensor.all_entity_picture").state == "off"
     assert hass.states.get("binary_sensor.all_attribute").state == "off"
+
+
+async def test_template_tracks_rendered_entities(hass, caplog):
+    """Test that binary sensors follow the states their templates read."""
+    hass.states.async_set("binary_sensor.test_sensor", "true")
+
+    await setup.async_setup_component(
+        hass,
+        "binary_sensor",
+        {
+            "binary_sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test": {
+                        "value_template": "{{ states.binary_sensor.test_sensor.state }}",
+                        "icon_template": "{{ 1 + 1 }}",
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    assert "were we able to extract the entities" not in caplog.text
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == "on"
+
+    hass.states.async_set("binary_sensor.test_sensor", "false")
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test").state == "off"
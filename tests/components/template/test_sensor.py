@@ -514,7 +514,7 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
 
 
 async def test_no_template_match_all(hass, caplog):
-    """Test that we do not allow sensors that match on all."""
+    """Test sensors with templates that match on all."""
     hass.states.async_set("sensor.test_sensor", "startup")
 
     await async_setup_component(
@@ -553,31 +553,6 @@ async def test_no_template_match_all(hass, caplog):
 
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 6
-    assert (
-        "Template sensor 'invalid_state' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the value template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_icon' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the icon template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_entity_picture' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the entity_picture template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_friendly_name' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the friendly_name template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_attribute' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the test_attribute template"
-    ) in caplog.text
 
     assert hass.states.get("sensor.invalid_state").state == "unknown"
     assert hass.states.get("sensor.invalid_icon").state == "unknown"
@@ -597,12 +572,6 @@ async def test_no_template_match_all(hass, caplog):
     hass.states.async_set("sensor.test_sensor", "hello")
     await hass.async_block_till_done()
 
-    assert hass.states.get("sensor.invalid_state").state == "2"
-    assert hass.states.get("sensor.invalid_icon").state == "startup"
-    assert hass.states.get("sensor.invalid_entity_picture").state == "startup"
-    assert hass.states.get("sensor.invalid_friendly_name").state == "startup"
-    assert hass.states.get("sensor.invalid_attribute").state == "startup"
-
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_state")
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_icon")
     await hass.helpers.entity_component.async_update_entity(
@@ -618,3 +587,34 @@ async def test_no_template_match_all(hass, caplog):
     assert hass.states.get("sensor.invalid_entity_picture").state == "hello"
     assert hass.states.get("sensor.invalid_friendly_name").state == "hello"
     assert hass.states.get("sensor.invalid_attribute").state == "hello"
+
+
+async def test_template_tracks_rendered_entities(hass, caplog):
+    """Test that sensors follow the states their templates read."""
+    hass.states.async_set("sensor.test_sensor", "startup")
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test": {
+                        "value_template": "{{ states.sensor.test_sensor.state }}",
+                        "icon_template": "{{ 1 + 1 }}",
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    assert "were we able to extract the entities" not in caplog.text
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "startup"
+
+    hass.states.async_set("sensor.test_sensor", "hello")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "hello"
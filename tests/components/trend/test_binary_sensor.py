@@ -1,8 +1,13 @@
 """The test for the Trend sensor platform."""
 from datetime import timedelta
+import math
 from unittest.mock import patch
 
+import numpy as np
+import pytest
+
 from homeassistant import setup
+from homeassistant.components.trend.binary_sensor import SensorTrend
 import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant, assert_setup_component
@@ -359,3 +364,21 @@ class TestTrendBinarySensor:
                 self.hass, "binary_sensor", {"binary_sensor": {"platform": "trend"}}
             )
         assert self.hass.states.all() == []
+
+    def test_gradient_matches_polyfit(self):
+        """Test the running sums give the least squares gradient."""
+        sensor = SensorTrend(
+            self.hass, "test", "Test", "sensor.test", None, None, False, 20, 0, 0
+        )
+        start = dt_util.utcnow().timestamp()
+
+        for index in range(200):
+            timestamp = start + index * 7.5 + (index % 3) * 0.25
+            sensor._add_sample(timestamp, math.sin(index / 10) * 50 + index)
+            if len(sensor.samples) < 2:
+                continue
+
+            sensor._calculate_gradient()
+            samples = np.array(sensor.samples)
+            expected = np.polyfit(samples[:, 0], samples[:, 1], 1)[0]
+            assert sensor._gradient == pytest.approx(expected, rel=1e-6, abs=1e-9)
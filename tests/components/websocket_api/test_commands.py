@@ -1,4 +1,6 @@
 """Tests for WebSocket API commands."""
+from unittest.mock import patch
+
 from async_timeout import timeout
 
 from homeassistant.core import callback
@@ -185,6 +187,58 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_shared(
+    hass, websocket_client, hass_ws_client, hass_access_token
+):
+    """Test subscriptions share a bus listener and encode events once."""
+    other_client = await hass_ws_client(hass, hass_access_token)
+    init_count = sum(hass.bus.async_listeners().values())
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await other_client.send_json(
+        {"id": 8, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await other_client.receive_json()
+    assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    with patch(
+        "homeassistant.components.websocket_api.const.JSON_DUMP",
+        side_effect=const.JSON_DUMP,
+    ) as mock_dump:
+        hass.bus.async_fire("test_event", {"hello": "world"})
+
+        with timeout(3):
+            msg = await websocket_client.receive_json()
+            other_msg = await other_client.receive_json()
+
+    assert mock_dump.call_count == 1
+    assert msg["id"] == 5
+    assert other_msg["id"] == 8
+    assert msg["event"] == other_msg["event"]
+    assert msg["event"]["data"] == {"hello": "world"}
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    await other_client.send_json(
+        {"id": 9, "type": "unsubscribe_events", "subscription": 8}
+    )
+    msg = await other_client.receive_json()
+    assert msg["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
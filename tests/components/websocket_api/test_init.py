@@ -3,10 +3,11 @@ import asyncio
 from unittest.mock import patch, Mock
 
 from aiohttp import WSMsgType
+from async_timeout import timeout
 import pytest
 import voluptuous as vol
 
-from homeassistant.components.websocket_api import const, messages
+from homeassistant.components.websocket_api import const, http, messages
 
 
 @pytest.fixture
@@ -59,6 +60,83 @@ def test_pending_msg_overflow(hass, mock_low_queue, websocket_client):
     assert msg.type == WSMsgType.close
 
 
+async def test_pending_msg_coalescing(hass, websocket_client):
+    """Test state changes of a slow client are coalesced instead of dropped."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    with patch(
+        "homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 10
+    ), patch("homeassistant.components.websocket_api.http.PENDING_MSG_PEAK", 4):
+        # Nothing is written until the loop gets to the writer
+        for value in range(10):
+            hass.states.async_set("light.kitchen", str(value))
+            hass.states.async_set("light.living_room", str(value))
+
+        received = {}
+        count = 0
+        with timeout(3):
+            while received != {"light.kitchen": "9", "light.living_room": "9"}:
+                msg = await websocket_client.receive_json()
+                assert msg["id"] == 5
+                new_state = msg["event"]["data"]["new_state"]
+                received[new_state["entity_id"]] = new_state["state"]
+                count += 1
+
+    stats = hass.data[const.DATA_MESSAGE_STATS]
+    assert count < 20
+    assert stats["coalesced"] == 20 - count
+    assert stats["dropped"] == 0
+
+    await websocket_client.send_json({"id": 6, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "pong"
+
+
+async def test_pending_msg_coalescing_order(hass):
+    """Test coalesced messages are queued after the messages before them."""
+    handler = http.WebSocketHandler(hass, Mock())
+
+    with patch(
+        "homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 10
+    ), patch("homeassistant.components.websocket_api.http.PENDING_MSG_PEAK", 2):
+        handler._send_message("kitchen 1", "light.kitchen")
+        handler._send_message("living room 1", "light.living_room")
+        handler._send_message("result")
+        handler._send_message("kitchen 2", "light.kitchen")
+
+        assert list(entry[1] for entry in handler._to_write.values()) == [
+            "living room 1",
+            "result",
+            "kitchen 2",
+        ]
+        assert handler._pop_message() == "living room 1"
+        assert handler._pop_message() == "result"
+        assert handler._pop_message() == "kitchen 2"
+
+    assert handler.coalesced == 1
+    assert handler.dropped == 0
+
+
+async def test_pending_msg_dropped_once(hass):
+    """Test each message lost to a client falling behind is counted once."""
+    handler = http.WebSocketHandler(hass, Mock())
+    handler._handle_task = Mock()
+    handler._writer_task = Mock()
+
+    with patch("homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 3):
+        for idx in range(5):
+            handler._send_message(str(idx))
+
+    assert handler.dropped == 5
+    assert hass.data[const.DATA_MESSAGE_STATS]["dropped"] == 5
+    assert not handler._to_write
+    assert handler._handle_task.cancel.called
+
+
 @asyncio.coroutine
 def test_unknown_command(websocket_client):
     """Test get_panels command."""
@@ -1,8 +1,11 @@
 """Test cases for the API stream sensor."""
 
 from homeassistant.bootstrap import async_setup_component
+from homeassistant.components.websocket_api.const import DATA_MESSAGE_STATS
+from homeassistant.components.websocket_api.sensor import SCAN_INTERVAL
+import homeassistant.util.dt as dt_util
 
-from tests.common import assert_setup_component
+from tests.common import assert_setup_component, async_fire_time_changed
 from .test_auth import test_auth_active_with_token
 
 
@@ -17,6 +20,8 @@ async def test_websocket_api(
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+    assert state.attributes["coalesced_messages"] == 0
+    assert state.attributes["dropped_messages"] == 0
 
     await test_auth_active_with_token(hass, no_auth_websocket_client, hass_access_token)
 
@@ -28,3 +33,18 @@ async def test_websocket_api(
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+
+
+async def test_message_stats(hass):
+    """Test the coalesced and dropped messages are updated periodically."""
+    await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "websocket_api"}}
+    )
+    hass.data[DATA_MESSAGE_STATS] = {"coalesced": 3, "dropped": 1}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.connected_clients")
+    assert state.attributes["coalesced_messages"] == 3
+    assert state.attributes["dropped_messages"] == 1
@@ -13,7 +13,7 @@ from homeassistant.const import ATTR_HIDDEN, ATTR_DEVICE_CLASS, STATE_UNAVAILABL
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.helpers.entity_values import EntityValues
 
-from tests.common import get_test_home_assistant, mock_registry
+from tests.common import get_test_home_assistant, mock_registry, MockEntityPlatform
 
 
 def test_generate_entity_id_requires_hass_or_ids():
@@ -661,3 +661,73 @@ async def test_capability_attrs(hass):
     assert state is not None
     assert state.state == STATE_UNAVAILABLE
     assert state.attributes["always"] == "there"
+
+
+async def test_suppress_unchanged_writes(hass):
+    """Test writes that do not change the state are not passed on."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.platform = MockEntityPlatform(hass)
+    attrs = {"level": 1}
+
+    with patch.object(
+        entity.Entity, "state", PropertyMock(return_value="on")
+    ), patch.object(
+        entity.Entity, "device_state_attributes", PropertyMock(return_value=attrs)
+    ), patch.object(
+        hass.states, "async_set", wraps=hass.states.async_set
+    ) as mock_set:
+        ent.async_write_ha_state()
+        ent.async_write_ha_state()
+        assert mock_set.call_count == 1
+        assert ent.platform.suppressed_writes == 1
+
+        # Attributes changed in place are detected
+        attrs["level"] = 2
+        ent.async_write_ha_state()
+        assert mock_set.call_count == 2
+        assert hass.states.get("hello.world").attributes["level"] == 2
+
+        # The state machine was changed by someone else
+        hass.states.async_set("hello.world", "off")
+        ent.async_write_ha_state()
+        assert mock_set.call_count == 4
+        assert hass.states.get("hello.world").state == "on"
+        assert ent.platform.suppressed_writes == 1
+
+
+async def test_static_attributes(hass):
+    """Test static attributes are looked up once per registry entry."""
+    entry = entity_registry.RegistryEntry(
+        entity_id="hello.world", unique_id="test-unique-id", platform="test-platform"
+    )
+    registry = mock_registry(hass, {"hello.world": entry})
+
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.registry_entry = entry
+    ent.static_attributes = True
+    hass.data[DATA_CUSTOMIZE] = EntityValues({"hello.world": {"hidden": True}})
+
+    with patch.object(
+        entity.Entity, "icon", PropertyMock(return_value="mdi:test")
+    ) as mock_icon, patch.object(
+        entity.Entity, "state", PropertyMock(side_effect=["on", "off", "off"])
+    ):
+        await ent.async_internal_added_to_hass()
+        ent.async_write_ha_state()
+        ent.async_write_ha_state()
+
+        assert mock_icon.call_count == 1
+        state = hass.states.get("hello.world")
+        assert state.state == "off"
+        assert state.attributes["icon"] == "mdi:test"
+        assert state.attributes[ATTR_HIDDEN] is True
+
+        registry.async_update_entity("hello.world", name="Renamed")
+        await hass.async_block_till_done()
+
+    assert mock_icon.call_count == 2
+    assert hass.states.get("hello.world").attributes["friendly_name"] == "Renamed"
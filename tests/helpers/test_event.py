@@ -10,8 +10,10 @@ import pytest
 from homeassistant.core import callback
 from homeassistant.setup import async_setup_component
 import homeassistant.core as ha
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_STATE_DOMAIN_CALLBACKS,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -20,10 +22,12 @@ from homeassistant.helpers.event import (
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
+    async_track_template_result,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
 )
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
@@ -165,6 +169,57 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_dispatch_by_entity_id(hass):
+    """Test state changes only reach listeners of the changed entity."""
+    calls = []
+
+    @ha.callback
+    def bad_listener(entity_id, old_state, new_state):
+        raise ValueError("Listener failed")
+
+    @ha.callback
+    def listener(entity_id, old_state, new_state):
+        calls.append(entity_id)
+
+    unsub_bad = async_track_state_change(hass, "light.bowl", bad_listener)
+    unsub_bowl = async_track_state_change(hass, "light.Bowl", listener)
+    unsub_all = async_track_state_change(hass, MATCH_ALL, listener)
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+    assert sorted(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [MATCH_ALL, "light.bowl"]
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.ceiling", "on")
+    await hass.async_block_till_done()
+    assert calls == ["light.bowl", "light.bowl", "light.ceiling"]
+
+    unsub_bad()
+    unsub_bowl()
+    assert sorted(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [MATCH_ALL]
+
+    unsub_all()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_track_state_change_duplicate_entity_ids(hass):
+    """Test an entity listed twice calls the listener once."""
+    calls = []
+
+    @ha.callback
+    def listener(entity_id, old_state, new_state):
+        calls.append(entity_id)
+
+    unsub = async_track_state_change(hass, ["light.bowl", "light.Bowl"], listener)
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert calls == ["light.bowl"]
+
+    unsub()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -233,6 +288,156 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_result(hass):
+    """Test tracking the entities a template reads."""
+    runs = []
+    template = Template(
+        "{{ states.sensor.one.state if is_state('switch.test', 'on') "
+        "else states.sensor.two.state }}",
+        hass,
+    )
+
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append((event.data["entity_id"], last_result, result))
+
+    info = async_track_template_result(hass, template, result_callback)
+    assert info.result == "1"
+    assert info.listeners == {"entities": ("sensor.one", "switch.test"), "domains": ()}
+
+    hass.states.async_set("sensor.two", "22")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.one", "11")
+    await hass.async_block_till_done()
+    assert runs == [("sensor.one", "1", "11")]
+
+    hass.states.async_set("switch.test", "off")
+    await hass.async_block_till_done()
+    assert runs[-1] == ("switch.test", "11", "22")
+    assert info.listeners == {"entities": ("sensor.two", "switch.test"), "domains": ()}
+
+    hass.states.async_set("sensor.one", "111")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    # Same result does not call the action
+    hass.states.async_set("sensor.two", "22", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    info.async_remove()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+    hass.states.async_set("sensor.two", "222")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+
+async def test_track_template_result_domain(hass):
+    """Test templates iterating a domain only wake for that domain."""
+    runs = []
+    template = Template("{{ states.sensor | count }}", hass)
+
+    hass.states.async_set("sensor.one", "1")
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    info = async_track_template_result(hass, template, result_callback)
+    assert info.listeners == {"entities": (), "domains": ("sensor",)}
+
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("sensor.one", "11")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.two", "2")
+    await hass.async_block_till_done()
+    assert runs == ["2"]
+
+    hass.states.async_remove("sensor.one")
+    await hass.async_block_till_done()
+    assert runs == ["2", "1"]
+
+    info.async_remove()
+    assert hass.data[TRACK_STATE_DOMAIN_CALLBACKS] == {}
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_track_template_result_all_states_and_errors(hass):
+    """Test templates iterating all states and failing renders."""
+    runs = []
+    template_all = Template("{{ states | count }}", hass)
+    template_error = Template("{{ states.sensor.two.attributes.unit.upper() }}", hass)
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "0")
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    info_all = async_track_template_result(hass, template_all, result_callback)
+    info_error = async_track_template_result(hass, template_error, result_callback)
+    assert info_all.listeners == {"entities": (MATCH_ALL,), "domains": ()}
+    assert isinstance(info_error.result, TemplateError)
+
+    hass.states.async_set("switch.test", "on")
+    await hass.async_block_till_done()
+    assert runs == ["3"]
+
+    hass.states.async_set("sensor.two", "0", {"unit": "w"})
+    await hass.async_block_till_done()
+    assert runs == ["3", "W"]
+
+    info_all.async_remove()
+    info_error.async_remove()
+
+
+async def test_track_template_result_reads_nothing(hass):
+    """Test templates whose render read no state listen to all states."""
+    runs = []
+    template_error = Template("{{ undefined_var.attr }}", hass)
+    template_static = Template("{{ 1 + 1 }}", hass)
+    template_plain = Template("plain", hass)
+
+    @ha.callback
+    def result_callback(event, last_result, result):
+        runs.append(result)
+
+    info_error = async_track_template_result(hass, template_error, result_callback)
+    info_static = async_track_template_result(hass, template_static, result_callback)
+    info_plain = async_track_template_result(hass, template_plain, result_callback)
+    assert isinstance(info_error.result, TemplateError)
+    assert info_error.listeners == {"entities": (MATCH_ALL,), "domains": ()}
+    assert info_static.listeners == {"entities": (MATCH_ALL,), "domains": ()}
+    assert info_plain.listeners == {"entities": (), "domains": ()}
+
+    # The first render caused by a state change is always reported
+    hass.states.async_set("switch.test", "on")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+    assert isinstance(runs[0], TemplateError)
+    assert runs[1] == "2"
+
+    hass.states.async_set("switch.test", "off")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    info_error.async_remove()
+    info_static.async_remove()
+    info_plain.async_remove()
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
@@ -713,6 +918,47 @@ async def test_periodic_task_clock_rollback(hass):
     assert len(specific_runs) == 4
 
 
+async def test_periodic_task_only_due_patterns(hass):
+    """Test only the patterns that are due are looked at."""
+    runs = []
+    unsubs = [
+        async_track_utc_time_change(
+            hass, lambda x, minute=minute: runs.append(minute), minute=minute, second=0
+        )
+        for minute in range(60)
+    ]
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == 1
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 0, 30))
+    await hass.async_block_till_done()
+    assert runs == []
+
+    with patch(
+        "homeassistant.util.dt.find_next_time_expression_time",
+        wraps=dt_util.find_next_time_expression_time,
+    ) as mock_next:
+        for second in range(31, 60):
+            _send_time_changed(hass, datetime(2014, 5, 24, 22, 0, second))
+        await hass.async_block_till_done()
+        assert runs == []
+        assert mock_next.call_count == 0
+
+        _send_time_changed(hass, datetime(2014, 5, 24, 22, 1, 0))
+        await hass.async_block_till_done()
+        assert runs == [1]
+        assert mock_next.call_count == 1
+
+    for unsub in unsubs[:-1]:
+        unsub()
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 59, 0))
+    await hass.async_block_till_done()
+    assert runs == [1, 59]
+
+    unsubs[-1]()
+    assert EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_periodic_task_duplicate_time(hass):
     """Test periodic tasks not triggering on duplicate time."""
     specific_runs = []
@@ -1,8 +1,11 @@
 """Test Home Assistant remote methods and classes."""
+import json
+from unittest.mock import patch
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, cached_state_json
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +22,18 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_cached_state_json():
+    """Test states are encoded once."""
+    state = core.State("test.test", "hello", {"level": 1})
+
+    with patch("homeassistant.helpers.json.json.dumps", wraps=json.dumps) as mock_dumps:
+        state_json = cached_state_json(state)
+        assert cached_state_json(state) is state_json
+
+    assert mock_dumps.call_count == 1
+    assert core.State.from_dict(json.loads(state_json)) == state
+
+    with pytest.raises(ValueError):
+        cached_state_json(core.State("test.test", "hello", {"level": float("nan")}))
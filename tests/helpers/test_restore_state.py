@@ -1,5 +1,6 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 
 from asynctest import patch
 
@@ -12,6 +13,7 @@ from homeassistant.helpers.restore_state import (
     RestoreEntity,
     StoredState,
     DATA_RESTORE_STATE_TASK,
+    STATE_DUMP_MAX_AGE,
     STORAGE_KEY,
 )
 from homeassistant.util import dt as dt_util
@@ -41,7 +43,7 @@ async def test_caching_data(hass):
 
     # Mock that only b1 is present this run
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.Store.async_save_json"
     ) as mock_write_data:
         state = await entity.async_get_last_state()
 
@@ -76,7 +78,7 @@ async def test_hass_starting(hass):
     # Mock that only b1 is present this run
     states = [State("input_boolean.b1", "on")]
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.Store.async_save_json"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         state = await entity.async_get_last_state()
 
@@ -89,7 +91,7 @@ async def test_hass_starting(hass):
 
     # Finish hass startup
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.Store.async_save_json"
     ) as mock_write_data:
         hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
         await hass.async_block_till_done()
@@ -130,13 +132,13 @@ async def test_dump_data(hass):
     }
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.Store.async_save_json"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    written_states = json.loads(args[0])
 
     # b0 should not be written, since it didn't extend RestoreEntity
     # b1 should be written, since it is present in the current run
@@ -153,18 +155,57 @@ async def test_dump_data(hass):
     await entity.async_remove()
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.Store.async_save_json"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    written_states = json.loads(args[0])
     assert len(written_states) == 1
     assert written_states[0]["state"]["entity_id"] == "input_boolean.b3"
     assert written_states[0]["state"]["state"] == "off"
 
 
+async def test_dump_changed_data(hass):
+    """Test that only changed states are dumped and encoded."""
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b1", "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save_json"
+    ) as mock_write_data, patch(
+        "homeassistant.helpers.restore_state.json.dumps", wraps=json.dumps
+    ) as mock_dumps:
+        await data.async_dump_states()
+        assert not mock_write_data.called
+
+        hass.states.async_set("input_boolean.b1", "off")
+        await data.async_dump_states()
+        assert mock_write_data.call_count == 1
+        written_states = json.loads(mock_write_data.mock_calls[0][1][0])
+        assert written_states[0]["state"]["state"] == "off"
+
+        # Unchanged states are written again once a day
+        mock_dumps.reset_mock()
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.utcnow() + STATE_DUMP_MAX_AGE + timedelta(1),
+        ):
+            await data.async_dump_states()
+        assert mock_write_data.call_count == 2
+
+    # Only the time the state was last seen is encoded
+    assert mock_dumps.call_count == 1
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
@@ -186,7 +227,7 @@ async def test_dump_error(hass):
     data = await RestoreStateData.async_get_instance(hass)
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save",
+        "homeassistant.helpers.restore_state.Store.async_save_json",
         return_value=mock_coro(exception=HomeAssistantError),
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
@@ -188,3 +188,126 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+async def test_saving_items_to_journal(hass, hass_storage):
+    """Test changed items are journaled once the snapshot is written."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_keys={"items": "id"})
+    items = {"a": {"id": "a", "value": 1}, "b": {"id": "b", "value": 2}}
+
+    def data_func():
+        return {"items": list(items.values())}
+
+    # The generation of the snapshot is not known yet
+    store.async_delay_save_items(data_func, "items", {"a": items["a"]}, 1)
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert hass_storage[MOCK_KEY]["journal"] == 1
+
+    items["a"] = {"id": "a", "value": 3}
+    del items["b"]
+    items["c"] = {"id": "c", "value": 4}
+    with patch.object(store, "_write_data", wraps=store._write_data) as mock_write:
+        store.async_delay_save_items(
+            data_func, "items", {"a": items["a"], "b": None, "c": items["c"]}, 1
+        )
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+    assert not mock_write.called
+    assert hass_storage[MOCK_KEY]["journal"] == 1
+    assert hass_storage[MOCK_KEY]["data"] == data_func()
+
+    # A journal grown past its bound is compacted into a new snapshot
+    items["a"] = {"id": "a", "value": 5}
+    with patch.object(storage, "JOURNAL_MAX_SIZE", 0):
+        store.async_delay_save_items(data_func, "items", {"a": items["a"]}, 1)
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=3))
+        await hass.async_block_till_done()
+
+    assert hass_storage[MOCK_KEY]["journal"] == 2
+    assert hass_storage[MOCK_KEY]["data"] == data_func()
+
+
+
+async def test_journal_waits_for_snapshot(hass, hass_storage):
+    """Test journal lines get the generation of a snapshot written meanwhile."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_keys={"items": "id"})
+    await store.async_save({"items": []})
+    assert hass_storage[MOCK_KEY]["journal"] == 1
+
+    with patch.object(store, "_write_journal") as mock_write_journal:
+        await store._write_lock.acquire()
+        append = hass.async_create_task(
+            store._async_append_journal(
+                [{"collection": "items", "id": "a", "item": {"id": "a"}}]
+            )
+        )
+        await asyncio.sleep(0)
+        store._journal_generation = 2
+        store._write_lock.release()
+        assert await append
+
+    lines = mock_write_journal.call_args[0][1]
+    assert json.loads(lines)["journal"] == 2
+
+
+async def test_loading_journal(hass, tmp_path):
+    """Test the journal of the current generation is replayed on load."""
+    hass.config.config_dir = str(tmp_path)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_keys={"items": "id"})
+    (tmp_path / storage.STORAGE_DIR).mkdir()
+    with open(store.path, "w") as fdesc:
+        json.dump(
+            {
+                "version": MOCK_VERSION,
+                "key": MOCK_KEY,
+                "journal": 2,
+                "data": {"items": [{"id": "a", "value": 1}, {"id": "b", "value": 2}]},
+            },
+            fdesc,
+        )
+    with open(store.journal_path, "w") as fdesc:
+        for entry in (
+            {"journal": 1, "collection": "items", "id": "c", "item": {"id": "c"}},
+            {"journal": 2, "collection": "items", "id": "a", "item": None},
+            {"journal": 2, "collection": "items", "id": "d", "item": {"id": "d"}},
+        ):
+            fdesc.write(json.dumps(entry) + "\n")
+        fdesc.write('{"journal": 2, "coll')
+
+    data = await hass.async_add_executor_job(store._load_data)
+    assert data["data"] == {"items": [{"id": "b", "value": 2}, {"id": "d"}]}
+
+
+
+def test_writing_json_with_journal(loop, tmp_path):
+    """Test encoded data is written with its journal generation."""
+    hass = Mock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_keys={"items": "id"})
+    (tmp_path / storage.STORAGE_DIR).mkdir()
+    with open(store.journal_path, "w") as fdesc:
+        fdesc.write(
+            json.dumps({"journal": 1, "collection": "items", "id": "b", "item": None})
+            + "\n"
+        )
+
+    store._write_data(
+        store.path,
+        {
+            "version": MOCK_VERSION,
+            "key": MOCK_KEY,
+            "data_json": '{"items": [{"id": "a"}]}',
+            "journal": 2,
+        },
+    )
+
+    with open(store.path) as fdesc:
+        assert json.load(fdesc) == {
+            "version": MOCK_VERSION,
+            "key": MOCK_KEY,
+            "journal": 2,
+            "data": {"items": [{"id": "a"}]},
+        }
+    assert store._load_data()["data"] == {"items": [{"id": "a"}]}
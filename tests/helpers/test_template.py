@@ -1803,3 +1803,71 @@ def test_render_complex_handling_non_template_values(hass):
     assert template.render_complex(
         {True: 1, False: template.Template("{{ hello }}", hass)}, {"hello": 2}
     ) == {True: 1, False: "2"}
+
+
+def test_render_cache_entity(hass):
+    """Test renders are reused until a state they read changes."""
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_set("sensor.other", "1")
+    tmp = template.Template("{{ states('sensor.test') }}", hass)
+
+    assert tmp.async_render() == "1"
+    assert tmp.async_render() == "1"
+    assert template.async_render_cache_stats(hass) == {"hits": 1, "misses": 1}
+
+    hass.states.async_set("sensor.other", "2")
+    assert tmp.async_render() == "1"
+    assert template.async_render_cache_stats(hass) == {"hits": 2, "misses": 1}
+
+    hass.states.async_set("sensor.test", "2")
+    assert tmp.async_render() == "2"
+    assert template.async_render_cache_stats(hass) == {"hits": 2, "misses": 2}
+
+
+def test_render_cache_existence(hass):
+    """Test renders checking if a state exists are invalidated by it."""
+    hass.states.async_set("sensor.x", "1")
+    tmp = template.Template("{% if states.sensor.x %}yes{% else %}no{% endif %}", hass)
+
+    assert tmp.async_render() == "yes"
+    hass.states.async_remove("sensor.x")
+    assert tmp.async_render() == "no"
+    hass.states.async_set("sensor.x", "1")
+    assert tmp.async_render() == "yes"
+
+    tmp = template.Template("{{ states.sensor.x.entity_id }}", hass)
+    assert tmp.async_render() == "sensor.x"
+    hass.states.async_remove("sensor.x")
+    assert tmp.async_render() == ""
+    assert template.async_render_cache_stats(hass) == {"hits": 0, "misses": 5}
+
+
+def test_render_cache_domain(hass):
+    """Test renders iterating a domain are invalidated by its states."""
+    hass.states.async_set("sensor.test", "1")
+    tmp = template.Template("{{ states.sensor | map(attribute='state') | join }}", hass)
+
+    assert tmp.async_render() == "1"
+    hass.states.async_set("light.test", "on")
+    assert tmp.async_render() == "1"
+    assert template.async_render_cache_stats(hass) == {"hits": 1, "misses": 1}
+
+    hass.states.async_set("sensor.new", "2")
+    assert tmp.async_render() == "21"
+    hass.states.async_remove("sensor.new")
+    assert tmp.async_render() == "1"
+    assert template.async_render_cache_stats(hass) == {"hits": 1, "misses": 3}
+
+
+def test_render_cache_variables_and_volatile(hass):
+    """Test renders with other variables or using the time are not reused."""
+    tmp = template.Template("{{ value }}", hass)
+    assert tmp.async_render(value=1) == "1"
+    assert tmp.async_render(value=2) == "2"
+    assert tmp.async_render(value=2) == "2"
+    assert template.async_render_cache_stats(hass) == {"hits": 1, "misses": 2}
+
+    tmp = template.Template("{{ now().isoformat() }}", hass)
+    tmp.async_render()
+    tmp.async_render()
+    assert template.async_render_cache_stats(hass) == {"hits": 1, "misses": 4}
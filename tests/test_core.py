@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 import asyncio
 import functools
+import json
 import logging
 import os
 import unittest
@@ -32,6 +33,7 @@ from homeassistant.const import (
     EVENT_SERVICE_REMOVED,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
+    MATCH_ALL,
 )
 
 from tests.common import get_test_home_assistant, async_mock_service
@@ -469,6 +471,74 @@ class TestEventBus(unittest.TestCase):
         self.hass.block_till_done()
         assert len(coroutine_calls) == 1
 
+    def test_match_all_dispatch_updated(self):
+        """Test cached dispatch follows added and removed listeners."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            calls.append(("listener", event.event_type))
+
+        @ha.callback
+        def match_all_listener(event):
+            calls.append(("match_all", event.event_type))
+
+        unsub = self.bus.listen("test_event", listener)
+        self.bus.fire("test_event")
+        self.hass.block_till_done()
+        assert calls == [("listener", "test_event")]
+
+        unsub_all = self.bus.listen(MATCH_ALL, match_all_listener)
+        self.bus.fire("test_event")
+        self.hass.block_till_done()
+        assert calls[1:] == [("match_all", "test_event"), ("listener", "test_event")]
+
+        unsub()
+        unsub_all()
+        self.bus.fire("test_event")
+        self.hass.block_till_done()
+        assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "target,job_type",
+    [
+        (ha.callback(lambda: None), ha.HassJobType.Callback),
+        (functools.partial(ha.callback(lambda: None)), ha.HassJobType.Callback),
+        (asyncio.coroutine(lambda: None), ha.HassJobType.Coroutinefunction),
+        (lambda: None, ha.HassJobType.Executor),
+    ],
+)
+def test_hassjob_job_type(target, job_type):
+    """Test the job type is determined when the job is created."""
+    assert ha.HassJob(target).job_type == job_type
+
+
+def test_hassjob_forbid_coroutine():
+    """Test hassjob forbids coroutines."""
+
+    async def bla():
+        pass
+
+    coro = bla()
+
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+
+    # To avoid warning about unawaited coro
+    coro.close()
+
+
+def test_async_add_hass_job_schedule_callback():
+    """Test that we schedule callbacks without creating a task."""
+    hass = MagicMock()
+    job = MagicMock()
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(hass.loop.call_soon.mock_calls) == 1
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.loop.run_in_executor.mock_calls) == 0
+
 
 def test_state_init():
     """Test state.init."""
@@ -659,6 +729,38 @@ class TestStateMachine(unittest.TestCase):
         self.hass.block_till_done()
         assert 1 == len(events)
 
+    def test_compact_attributes(self):
+        """Test states share attributes and common attribute values."""
+        self.states.set("sensor.a", "1", json.loads('{"icon": "mdi:test", "x": "xyz"}'))
+        self.states.set("sensor.b", "1", json.loads('{"icon": "mdi:test", "x": "xyz"}'))
+        state_a = self.states.get("sensor.a")
+        state_b = self.states.get("sensor.b")
+        assert state_a.attributes["icon"] is state_b.attributes["icon"]
+        assert state_a.attributes["x"] is not state_b.attributes["x"]
+
+        self.states.set("sensor.a", "2", {"icon": "mdi:test", "x": "xyz"})
+        assert self.states.get("sensor.a").attributes is state_a.attributes
+
+        self.states.set("sensor.a", "2", {"icon": "mdi:test", "x": "z"})
+        assert self.states.get("sensor.a").attributes == {"icon": "mdi:test", "x": "z"}
+
+    def test_version(self):
+        """Test the versions of the states change on set and remove."""
+        version = self.states.async_version()
+        light_version = self.states.async_version("light")
+
+        self.states.set("sensor.a", "1")
+        assert self.states.async_version() > version
+        assert self.states.async_version("light") == light_version
+
+        version = self.states.async_version()
+        self.states.set("sensor.a", "1")
+        assert self.states.async_version() == version
+
+        self.states.remove("light.bowl")
+        assert self.states.async_version("light") > light_version
+        assert self.states.async_version() > version
+
 
 def test_service_call_repr():
     """Test ServiceCall repr."""
@@ -1181,3 +1283,24 @@ def test_context():
     assert c.user_id == 23
     assert c.parent_id == 100
     assert c.id is not None
+
+
+def test_context_lazy_id():
+    """Test the id of a context is generated once when first used."""
+    context = ha.Context()
+    assert context._id is ha._GENERATE_ID
+    assert context.id == context.id
+    assert context == ha.Context(id=context.id)
+    assert context != ha.Context()
+    assert ha.Context(id="abc").as_dict() == {
+        "id": "abc",
+        "parent_id": None,
+        "user_id": None,
+    }
+
+
+def test_context_none_id():
+    """Test an explicit empty id is kept, like for rows recorded without one."""
+    context = ha.Context(id=None, user_id="abc")
+    assert context.id is None
+    assert context == ha.Context(id=None, user_id="abc")